@@ -1,30 +1,87 @@
-import fitz 
+import multiprocessing as mp
 import os
 import time
-from typing import Tuple
+import argparse
+import contextlib
+from typing import Callable, Dict, List, Optional, Tuple
 import sys
-from itertools import cycle
-import threading
 from datetime import datetime
+from functools import partial
+
+from models import ENGINES, create_engine, public_engines
+from utils.pdf_extraction import ExtractionCache, extract_pdf_pages
+from utils.text_cleaning import strip_boilerplate
+from utils.audio_encoder import FORMATS, audio_duration
+from utils.eta_estimator import DEFAULT_SECONDS_PER_CHAR, ETAEstimator, LiveETA, RunHistory
+from utils.instrumentation import ProgressReporter, disable_tracing, enable_tracing, span
+from utils.staged_pipeline import PIPELINE_QUEUE_SIZE, prefetch
+from utils.text_fixes import apply_text_fixes, load_text_fix_rules
 
 # TTS Engine selection
-TTS_ENGINE = "kokoro"  # Options: "kokoro" or "coqui"
+TTS_ENGINE = "kokoro"  # Options: "kokoro", "coqui" or "router" (per-paragraph language detection)
 TTS_LANGUAGE = "en"   # Options: "en" (English) or "de" (German)
+TTS_VOICE = "bf_emma"  # Used when --voice is not given and the engine has it; Kokoro: "af_heart", "am_adam", "bf_emma", "bm_george"
+# Per-engine constructor options: "backend" is "torch", "int8" or "onnx"; Kokoro batch_size > 1 batches short segments
+ENGINE_OPTIONS = {"kokoro": {"batch_size": 1, "backend": "torch"}, "coqui": {"backend": "torch"}}
+# "router" keeps one warm engine per language and sends each paragraph to the engine for its language
+ENGINE_OPTIONS["router"] = {"routes": {"en": "kokoro", "de": "coqui"}, "voices": {"en": "af_heart", "de": "default"},
+                            "sample_rate": 24000}
+PARALLEL_WORKERS = 1  # >1 splits the text into chunks synthesized by that many processes
+THREADS_PER_WORKER = 1  # Torch intra-op threads per worker process
+AUDIO_CACHE_DIR = "./temp/audio_cache"  # Per-paragraph audio cache (None to disable)
+AUDIO_CACHE_MAX_MB = 2048  # Least recently used paragraphs are evicted beyond this size
+PHONEME_CACHE_FILE = "./temp/phoneme_cache.sqlite"  # Kokoro G2P results per sentence, kept across runs (None to disable)
+MODEL_CACHE_MAX_MB = 4096  # Loaded models, pipelines and voices kept resident; least recently used evicted beyond this
+RESUMABLE_JOBS = True  # Journal finished chunks next to the output so killed runs can resume
+POSTPROCESS = True  # Trim silence, cap pauses and normalize loudness of every chunk before it is written
+POSTPROCESS_OPTIONS = {"silence_db": -45.0, "max_pause_seconds": 0.6, "target_db": -20.0, "ceiling_db": -1.0}
+# PIPELINE_QUEUE_SIZE (utils/staged_pipeline.py): chunks buffered between synthesis, post-processing and writing threads (0 = one thread)
+PARAGRAPH_PAUSE_SECONDS = 0.0  # Silence between paragraphs (not between chunks of one paragraph); needs RESUMABLE_JOBS
+PAGE_CUES = True  # Embed a cue per PDF page in WAV output and write "<output>.cues.json"; needs RESUMABLE_JOBS
+EXTRACTION_WORKERS = os.cpu_count() or 1  # Processes for page-range-parallel PDF extraction
+EXTRACTION_CACHE_DIR = "./temp/extraction_cache"  # Extracted text keyed by PDF hash (None to disable)
+STRIP_BOILERPLATE = True  # Drop running headers/footers, page numbers and hyphenated breaks
+DROP_REFERENCES = True  # Also drop the references/bibliography section
+OUTPUT_FORMAT = "wav"  # "wav", "flac", "ogg" (Vorbis) or "opus"; compressed formats encode on a background thread
+TRACE_FILE = None  # e.g. "./temp/trace.json" to record per-stage timing spans as a Chrome trace
+TTS_SERVER_URL = None  # e.g. "http://127.0.0.1:8765" to use a running tts_server.py with warm models
 
-if TTS_ENGINE.lower() == "kokoro":
-    from models.kokoro_tts_offline import KokoroTTS
-    TTSClass = KokoroTTS
-elif TTS_ENGINE.lower() == "coqui":
-    from models.coqui_tts_offline import CoquiTTS
-    TTSClass = CoquiTTS
-else:
-    raise ValueError(f"Unknown TTS engine: {TTS_ENGINE}. Use 'kokoro' or 'coqui'")
 
+def extract_pages_from_pdf(pdf_path: str, workers: int = EXTRACTION_WORKERS,
+                           start_method: Optional[str] = None) -> List[str]:
+    """Extract the text of each PDF page (start_method: see iter_pdf_pages)"""
+    cache = ExtractionCache(EXTRACTION_CACHE_DIR) if EXTRACTION_CACHE_DIR else None
+    with span("extraction", pdf=os.path.basename(pdf_path)):
+        return extract_pdf_pages(pdf_path, workers=workers, cache=cache, start_method=start_method)
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract and combine text from all PDF pages"""
-    with fitz.open(pdf_path) as doc:
-        return "\n".join([page.get_text() for page in doc])
+    return "\n".join(extract_pages_from_pdf(pdf_path))
+
+def extract_document_text(pdf_path: str) -> str:
+    """Extract PDF text and, if enabled, strip boilerplate using a cross-page line index"""
+    return extract_document(pdf_path)[0]
+
+def extract_document(pdf_path: str, pages: Optional[List[str]] = None) -> Tuple[str, List[str]]:
+    """Extract PDF text (or use the given pages), strip boilerplate if enabled; return it with the text kept per page"""
+    if pages is None:
+        pages = extract_pages_from_pdf(pdf_path)
+    if not STRIP_BOILERPLATE:
+        return "\n".join(pages), pages
+    with span("cleaning", step="boilerplate"):
+        result = strip_boilerplate(pages, drop_references=DROP_REFERENCES)
+    report_boilerplate_savings("\n".join(pages), result)
+    return result["text"], result["pages"]
+
+def report_boilerplate_savings(original_text: str, result: Dict[str, object]):
+    """Print how much text (and estimated synthesis time) boilerplate stripping saved"""
+    original_chars = calculate_text_metrics(original_text)[0]
+    saved_chars = original_chars - calculate_text_metrics(result["text"])[0]
+    saved_share = saved_chars / original_chars * 100 if original_chars else 0.0
+    print(f"✂️  Boilerplate removed: {saved_chars:,} characters ({saved_share:.1f}%), "
+          f"~{format_processing_time(saved_chars * DEFAULT_SECONDS_PER_CHAR)} (MM:SS) of synthesis saved")
+    print(f"   {result['headers_footers']} header/footer lines, {result['page_numbers']} page numbers, "
+          f"{result['hyphenations']} hyphenated breaks, {result['reference_chars']:,} reference characters")
 
 def save_text_to_file(text: str, filename: str):
     """Save text content to a file with UTF-8 encoding"""
@@ -55,15 +112,124 @@ def clean_text_for_tts(text: str) -> str:
     return "\n\n".join(cleaned_paragraphs)
 
 def text_to_speech(text: str, output_path: str, tts_engine, 
-                   voice: str = "default", speed: float = 1.0):
+                   voice: str = "default", speed: float = 1.0, on_chunk: Optional[Callable] = None):
     """Convert text to audio using selected TTS engine"""
-    tts_engine.generate_audio(text, output_path, voice=voice, speed=speed)
+    if on_chunk is None:
+        tts_engine.generate_audio(text, output_path, voice=voice, speed=speed)
+    else:
+        tts_engine.generate_audio(text, output_path, voice=voice, speed=speed, on_chunk=on_chunk)
 
 def format_processing_time(seconds: float) -> str:
     """Convert seconds to MM:SS format"""
     minutes, seconds = divmod(seconds, 60)
     return f"{int(minutes):02d}:{int(seconds):02d}"
 
+def get_audio_duration(path: str) -> float:
+    """Return the duration of a WAV/FLAC/OGG/Opus file in seconds"""
+    return audio_duration(path)
+
+
+def engine_options(engine_name: str) -> dict:
+    """Constructor options for an engine from ENGINE_OPTIONS (the router gets those of its routed engines)"""
+    options = dict(ENGINE_OPTIONS.get(engine_name, {}))
+    if engine_name == "kokoro" and PHONEME_CACHE_FILE:
+        options["phoneme_cache"] = PHONEME_CACHE_FILE
+    if engine_name == "router":
+        routed = set(options.get("routes", {}).values())
+        options["engine_options"] = {name: engine_options(name) for name in routed}
+    return options
+
+class TTSSession:
+    """A warm TTS engine wrapped with the configured parallel, cache and journal layers"""
+
+    def __init__(self, engine_name: str = TTS_ENGINE, language: str = TTS_LANGUAGE):
+        """
+        Build the TTS engine once so it can be reused for many documents
+
+        Args:
+            engine_name: "kokoro" or "coqui"
+            language: Language code for Coqui ("en" or "de")
+        """
+        self.engine_name = engine_name
+        self.parallel = None
+        self.audio_cache = None
+        self.postprocessor = None
+        if TTS_SERVER_URL:
+            from tts_server import TTSClient
+            self.engine = self.synthesizer = TTSClient(TTS_SERVER_URL, engine_name, language)
+            print(f"✓ Using {engine_name.upper()} TTS server at {TTS_SERVER_URL}\n")
+            return
+
+        print(f"\n🔧 Initializing {engine_name.upper()} TTS...")
+        from models.model_registry import get_model_registry
+        get_model_registry().max_bytes = MODEL_CACHE_MAX_MB * 1024 * 1024
+        options = engine_options(engine_name)
+        self.engine = create_engine(engine_name, language, **options)
+        if PARALLEL_WORKERS > 1:
+            from models.parallel_tts import ParallelSynthesizer
+            self.parallel = ParallelSynthesizer(
+                self.engine,
+                engine_factory=partial(create_engine, engine_name, language, **options),
+                workers=PARALLEL_WORKERS,
+                threads_per_worker=THREADS_PER_WORKER,
+            )
+        synthesizer = self.parallel
+        if AUDIO_CACHE_DIR:
+            from utils.audio_cache import AudioCache, CachedSynthesizer
+            self.audio_cache = AudioCache(AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_MB * 1024 * 1024)
+            synthesizer = CachedSynthesizer(self.engine, self.audio_cache, parallel=self.parallel)
+        if POSTPROCESS:
+            from utils.audio_postprocess import AudioPostProcessor, PostProcessingSynthesizer
+            self.postprocessor = AudioPostProcessor(**POSTPROCESS_OPTIONS)
+            synthesizer = PostProcessingSynthesizer(self.engine, self.postprocessor, inner=synthesizer,
+                                                    queue_size=PIPELINE_QUEUE_SIZE)
+        if RESUMABLE_JOBS:
+            from utils.job_journal import ResumableSynthesizer
+            synthesizer = ResumableSynthesizer(self.engine, inner=synthesizer, pause_seconds=PARAGRAPH_PAUSE_SECONDS,
+                                               queue_size=PIPELINE_QUEUE_SIZE)
+        self.synthesizer = synthesizer or self.engine
+        print(f"✓ {engine_name.upper()} TTS ready\n")
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0,
+                       on_chunk: Optional[Callable] = None):
+        """Synthesize text to a WAV file through the configured layers (on_chunk needs a chunked layer)"""
+        if self.parallel is not None:
+            # Fork the workers from this thread, before the pipeline stages start theirs
+            self.parallel.start()
+        if on_chunk is not None and self.synthesizer is not self.engine:
+            self.synthesizer.generate_audio(text, output_path, voice=voice, speed=speed, on_chunk=on_chunk)
+        else:
+            self.synthesizer.generate_audio(text, output_path, voice=voice, speed=speed)
+
+    def write_page_cues(self, output_path: str, pages: List[str], text: str):
+        """Add a cue per PDF page to a WAV written by the last generate_audio call (journaled sessions only)"""
+        layout = getattr(self.synthesizer, "last_layout", None)
+        if layout is None or not output_path.lower().endswith(".wav"):
+            return
+        from utils.wav_assembler import page_cues, write_cue_index
+        cues = page_cues(pages, text, *layout)
+        index_path = write_cue_index(output_path, cues, self.engine.sr)
+        print(f"🔖 {len(cues)}/{len(pages)} pages indexed in {index_path}")
+
+    def reset_stats(self):
+        """Start the cache, routing and post-processing counters from zero, so each document reports its own"""
+        if self.audio_cache is not None:
+            from utils.audio_cache import CacheStats
+            self.audio_cache.stats = CacheStats()
+        if getattr(self.engine, "phoneme_cache", None) is not None:
+            from utils.phoneme_cache import PhonemeCacheStats
+            self.engine.phoneme_cache.stats = PhonemeCacheStats()
+        if hasattr(self.engine, "routed"):
+            self.engine.routed = dict.fromkeys(self.engine.routed, 0)
+        if self.postprocessor is not None:
+            from utils.audio_postprocess import PostProcessStats
+            self.postprocessor.stats = PostProcessStats()
+
+    def close(self):
+        """Stop worker processes held by the session"""
+        if self.parallel is not None:
+            self.parallel.close()
+
 def generate_conversion_report(raw_metrics: Tuple[int, int, int],
                             clean_metrics: Tuple[int, int, int],
                             output_path: str,
@@ -89,53 +255,57 @@ def generate_conversion_report(raw_metrics: Tuple[int, int, int],
     print(f"- Cleaned text: cleaned_text.txt")
     print("="*50 + "\n")
 
-def show_progress(message, stop_event):
-    frames = cycle(['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏'])
-    while not stop_event.is_set():
-        sys.stdout.write(f'\r{message} {next(frames)}')
-        sys.stdout.flush()
-        time.sleep(0.2)
-    sys.stdout.write('\r' + ' ' * (len(message) + 2) + '\r') 
-
-def pdf_to_audio(pdf_path: str, output_audio: str, voice: str = "default", speed: float = 1.0):
-    """Full PDF to audio conversion pipeline with selectable TTS and visual feedback"""
+def pdf_to_audio(pdf_path: str, output_audio: str, voice: str = "default", speed: float = 1.0,
+                 session: Optional[TTSSession] = None, interactive: bool = True,
+                 text_fixes: Optional[Dict[str, list]] = None, pages: Optional[List[str]] = None) -> Dict[str, float]:
+    """Full PDF to audio conversion pipeline with selectable TTS and visual feedback (pages: pre-extracted text)"""
     start_time = time.time()
-    os.makedirs(os.path.dirname(output_audio), exist_ok=True)
+    os.makedirs(os.path.dirname(output_audio) or ".", exist_ok=True)
+    os.makedirs("./temp", exist_ok=True)
     
-    # Initialize TTS Engine
-    print(f"\n🔧 Initializing {TTS_ENGINE.upper()} TTS...")
-    if TTS_ENGINE.lower() == "kokoro":
-        tts_engine = TTSClass()
-    else:  # coqui
-        tts_engine = TTSClass(language=TTS_LANGUAGE)
-    print(f"✓ {TTS_ENGINE.upper()} TTS ready\n")
+    # Initialize TTS Engine (batch runs pass in a warm session)
+    owns_session = session is None
+    if owns_session:
+        session = TTSSession()
+    session.reset_stats()
+    engine_name = session.engine_name
     
     # Stage 1: Extract and save raw text
     print("🔍 Extracting text from PDF...")
-    full_text = extract_text_from_pdf(pdf_path)
+    full_text, pages = extract_document(pdf_path, pages)
+    if text_fixes:
+        full_text = apply_text_fixes(full_text, text_fixes["raw"])
     save_text_to_file(full_text, "./temp/full_text.txt")
     
     # Manual intervention point for raw text
     print("\n📝 Raw text saved to './temp/full_text.txt'")
-    input("✏️  Make your edits, then press Enter to continue...")
-    full_text = load_text_from_file("./temp/full_text.txt")
-    print("✓ Raw text changes applied\n")
+    if interactive:
+        input("✏️  Make your edits, then press Enter to continue...")
+        full_text = load_text_from_file("./temp/full_text.txt")
+        print("✓ Raw text changes applied\n")
     
     # Stage 2: Clean and save normalized text
     print("🧹 Cleaning text for TTS...")
-    cleaned_text = clean_text_for_tts(full_text)
+    with span("cleaning", step="normalize"):
+        cleaned_text = clean_text_for_tts(full_text)
+        if text_fixes:
+            cleaned_text = apply_text_fixes(cleaned_text, text_fixes["cleaned"])
     save_text_to_file(cleaned_text, "./temp/cleaned_text.txt")
     
     # Manual intervention point for cleaned text
     print("\n📝 Cleaned text saved to './temp/cleaned_text.txt'")
-    input("✏️  Make your edits, then press Enter to continue...")
-    cleaned_text = load_text_from_file("./temp/cleaned_text.txt")
-    print("✓ Cleaned text changes applied\n")
+    if interactive:
+        input("✏️  Make your edits, then press Enter to continue...")
+        cleaned_text = load_text_from_file("./temp/cleaned_text.txt")
+        print("✓ Cleaned text changes applied\n")
     
     # Estimate time before actual TTS
     raw_metrics = calculate_text_metrics(full_text)
     clean_metrics = calculate_text_metrics(cleaned_text)
-    estimated_tts_seconds = int(clean_metrics[0] * 0.014)  # Based on character count
+    model = getattr(session.engine, "model_id", engine_name)
+    history = RunHistory()
+    estimator = ETAEstimator(history, engine_name, model, voice, workers=PARALLEL_WORKERS, speed=speed)
+    estimate = estimator.estimate(clean_metrics[0])
 
     print("Text Statistics:")
     print("-"*60)
@@ -144,43 +314,278 @@ def pdf_to_audio(pdf_path: str, output_audio: str, voice: str = "default", speed
     print(f"{'Characters':<15} | {raw_metrics[0]:>12,} | {clean_metrics[0]:>12,}")
     print(f"{'Words':<15} | {raw_metrics[1]:>12,} | {clean_metrics[1]:>12,}")
     print(f"{'Tokens (approx)':<15} | {raw_metrics[2]:>12,} | {clean_metrics[2]:>12,}")
-    print(f"\nApproximate processing time: {format_processing_time(estimated_tts_seconds)} (MM:SS)\n")
+    basis = f"{estimate.runs} earlier run(s) matching {estimate.basis}" if estimate.runs else "default rate, no run history yet"
+    print(f"\nApproximate processing time: {format_processing_time(estimate.seconds)} (MM:SS), "
+          f"90% range {format_processing_time(estimate.low)}-{format_processing_time(estimate.high)}")
+    print(f"   Based on {basis}\n")
 
     # Stage 3: Generate audio with visual feedback
     now = datetime.now()
     print(f"Current time: {now.strftime('%d.%m.%Y %H:%M')}")
-    print(f"🔊 Converting text to speech ({TTS_ENGINE.upper()}, voice: {voice}, speed: {speed}x):")
-    stop_event = threading.Event()
-    spinner_thread = threading.Thread(target=show_progress, args=("Generating audio", stop_event))
-    spinner_thread.start()
+    print(f"🔊 Converting text to speech ({engine_name.upper()}, voice: {voice}, speed: {speed}x):")
+    live = LiveETA(estimator, clean_metrics[0])
+    synthesis_start = time.time()
     try:
-        text_to_speech(cleaned_text, output_audio, tts_engine, voice=voice, speed=speed)
+        with ProgressReporter(live), span("synthesis", chars=clean_metrics[0]):
+            text_to_speech(cleaned_text, output_audio, session, voice=voice, speed=speed, on_chunk=live.update)
     finally:
-        stop_event.set()
-        spinner_thread.join()
+        if owns_session:
+            session.close()
+    synthesis_time = time.time() - synthesis_start
+    # Only synthesized chunks calibrate the rate: their own seconds, without model load, cache reads,
+    # journal replay or assembly. Workers overlap, so the chunk seconds are shared out over them.
+    if live.chunks_total:
+        synthesized, seconds = live.synthesized_characters, live.synthesis_seconds / PARALLEL_WORKERS
+    else:
+        synthesized, seconds = clean_metrics[0], synthesis_time
+    history.append(engine_name, model, voice, PARALLEL_WORKERS, synthesized, seconds, speed=speed)
     print("✓ Audio generation complete\n")
+    if PAGE_CUES:
+        session.write_page_cues(output_audio, pages, cleaned_text)
+    if session.audio_cache is not None:
+        session.audio_cache.stats.report()
+    if getattr(session.engine, "phoneme_cache", None) is not None:
+        session.engine.phoneme_cache.stats.report()
+    if hasattr(session.engine, "report"):
+        session.engine.report()
+    if session.postprocessor is not None:
+        session.postprocessor.stats.report()
     
     # Generate final report
     generate_conversion_report(
-        raw_metrics=calculate_text_metrics(full_text),
-        clean_metrics=calculate_text_metrics(cleaned_text),
+        raw_metrics=raw_metrics,
+        clean_metrics=clean_metrics,
         output_path=output_audio,
         processing_time=time.time() - start_time,
-        engine_name=TTS_ENGINE.upper()
+        engine_name=engine_name.upper()
     )
+    return {
+        "characters": clean_metrics[0],
+        "synthesis_seconds": synthesis_time,
+        "total_seconds": time.time() - start_time,
+        "audio_seconds": get_audio_duration(output_audio),
+    }
+
+def extract_only(pdf_path: str):
+    """Extract and clean text without loading any TTS engine"""
+    os.makedirs("./temp", exist_ok=True)
+    full_text = extract_document_text(pdf_path)
+    save_text_to_file(full_text, "./temp/full_text.txt")
+    cleaned_text = clean_text_for_tts(full_text)
+    save_text_to_file(cleaned_text, "./temp/cleaned_text.txt")
+
+    raw_metrics = calculate_text_metrics(full_text)
+    clean_metrics = calculate_text_metrics(cleaned_text)
+    print(f"{'Metric':<15} | {'Raw Text':>12} | {'Cleaned Text':>12}")
+    print("-"*45)
+    print(f"{'Characters':<15} | {raw_metrics[0]:>12,} | {clean_metrics[0]:>12,}")
+    print(f"{'Words':<15} | {raw_metrics[1]:>12,} | {clean_metrics[1]:>12,}")
+    print(f"{'Tokens (approx)':<15} | {raw_metrics[2]:>12,} | {clean_metrics[2]:>12,}")
+    print("\nText saved to './temp/full_text.txt' and './temp/cleaned_text.txt'")
+
+def list_engines():
+    """Print registered engines and their capabilities (no backend is imported)"""
+    for spec in (ENGINES[name] for name in public_engines()):
+        print(f"{spec.name} ({spec.sample_rate} Hz, {'offline' if spec.offline else 'online'})")
+        for language, voices in spec.voices.items():
+            print(f"  {language}: {', '.join(voices)}")
+
+def stream_pdf_to_audio(pdf_path: str, target: str, voice: str = "default", speed: float = 1.0,
+                        engine_name: str = TTS_ENGINE, language: str = TTS_LANGUAGE, fmt: str = "wav",
+                        text_fixes: Optional[Dict[str, list]] = None):
+    """Stream speech for a PDF to stdout, a named pipe, a socket or a file while it is generated"""
+    from utils.audio_sink import open_sink, stream_audio
+
+    # Audio may be going to stdout, so the sink is opened first and all messages go to stderr
+    sink = open_sink(target)
+    with contextlib.redirect_stdout(sys.stderr):
+        print("🔍 Extracting text from PDF...")
+        full_text = extract_document_text(pdf_path)
+        if text_fixes:
+            full_text = apply_text_fixes(full_text, text_fixes["raw"])
+        cleaned_text = clean_text_for_tts(full_text)
+        if text_fixes:
+            cleaned_text = apply_text_fixes(cleaned_text, text_fixes["cleaned"])
+
+        print(f"🔊 Streaming {calculate_text_metrics(cleaned_text)[0]:,} characters to {target} "
+              f"({engine_name.upper()}, voice: {voice}, speed: {speed}x)")
+        start_time = time.time()
+        engine = create_engine(engine_name, language, **engine_options(engine_name))
+        streamer = stream_audio(engine, cleaned_text, sink, voice=voice, speed=speed, fmt=fmt)
+        print(f"✓ Streamed {format_processing_time(streamer.duration)} of audio in "
+              f"{format_processing_time(time.time() - start_time)} (MM:SS)")
+        if streamer.time_to_first_audio is not None:
+            print(f"Time to first audio: {streamer.time_to_first_audio:.2f}s (including model load)")
+
+def collect_pdf_paths(source: str) -> List[str]:
+    """Return the PDFs in a directory, or the paths listed in a manifest file (one per line)"""
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(".pdf")
+        )
+    base_dir = os.path.dirname(source)
+    paths = []
+    for line in load_text_from_file(source).splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return paths
+
+def generate_batch_report(results: List[Tuple[str, Dict[str, float]]], failures: List[Tuple[str, str]]):
+    """Print per-document throughput: characters per second and real-time factor"""
+    print("\n" + "="*86)
+    print(f"Batch Conversion Complete ({len(results)} converted, {len(failures)} failed)")
+    print("="*86)
+    print(f"{'Document':<30} | {'Characters':>10} | {'Audio':>7} | {'Synth':>7} | {'Chars/s':>8} | {'RTF':>6}")
+    print("-"*86)
+    total_chars = total_audio = total_synth = 0.0
+    for name, stats in results:
+        chars_per_second = stats["characters"] / stats["synthesis_seconds"] if stats["synthesis_seconds"] else 0.0
+        rtf = stats["synthesis_seconds"] / stats["audio_seconds"] if stats["audio_seconds"] else 0.0
+        print(f"{name[:30]:<30} | {stats['characters']:>10,} | "
+              f"{format_processing_time(stats['audio_seconds']):>7} | "
+              f"{format_processing_time(stats['synthesis_seconds']):>7} | "
+              f"{chars_per_second:>8.1f} | {rtf:>6.3f}")
+        total_chars += stats["characters"]
+        total_audio += stats["audio_seconds"]
+        total_synth += stats["synthesis_seconds"]
+    if results:
+        print("-"*86)
+        print(f"{'Total':<30} | {int(total_chars):>10,} | {format_processing_time(total_audio):>7} | "
+              f"{format_processing_time(total_synth):>7} | "
+              f"{(total_chars / total_synth if total_synth else 0.0):>8.1f} | "
+              f"{(total_synth / total_audio if total_audio else 0.0):>6.3f}")
+    for name, error in failures:
+        print(f"❌ {name}: {error}")
+    print("="*86 + "\n")
+
+def batch_pdf_to_audio(pdf_paths: List[str], output_dir: str = "./audio", voice: str = "default",
+                       speed: float = 1.0, engine_name: str = TTS_ENGINE, language: str = TTS_LANGUAGE,
+                       text_fixes: Optional[Dict[str, list]] = None, output_format: str = OUTPUT_FORMAT):
+    """Convert many PDFs unattended with a single warm TTS engine"""
+    session = TTSSession(engine_name, language)
+    results, failures = [], []
+
+    # Extraction runs on a thread, where forking would copy the synthesis threads' locks mid-use
+    start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+    def extract(pdf_path: str):
+        try:
+            return pdf_path, extract_pages_from_pdf(pdf_path, start_method=start_method), None
+        except Exception as e:
+            return pdf_path, None, e
+
+    # The next PDF is extracted while the current one is synthesized
+    documents = prefetch(map(extract, pdf_paths), maxsize=1, name="extraction")
+    try:
+        for i, (pdf_path, pages, error) in enumerate(documents, 1):
+            name = os.path.splitext(os.path.basename(pdf_path))[0]
+            print(f"\n📄 [{i}/{len(pdf_paths)}] {name}")
+            try:
+                if error is not None:
+                    raise error
+                stats = pdf_to_audio(pdf_path, os.path.join(output_dir, f"{name}.{output_format}"), voice=voice,
+                                     speed=speed, session=session, interactive=False, text_fixes=text_fixes,
+                                     pages=pages)
+                results.append((name, stats))
+            except Exception as e:
+                print(f"❌ Failed to convert {pdf_path}: {e}")
+                failures.append((name, str(e)))
+    finally:
+        session.close()
+    generate_batch_report(results, failures)
+    return results
 
 FOLDER = "pdf"
 STUDY = "2024_Zheng+"
 
+def default_voice(engine_name: str, language: str) -> str:
+    """Voice used when --voice is not given: TTS_VOICE if the engine has it, else the engine's first voice"""
+    voices = ENGINES[engine_name].voices.get(language) or next(iter(ENGINES[engine_name].voices.values()))
+    return TTS_VOICE if TTS_VOICE in voices else voices[0]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert PDF documents to audio with offline TTS")
+    parser.add_argument("--extract-only", metavar="PDF",
+                        help="Only extract and clean the text of a PDF (no TTS engine is loaded)")
+    parser.add_argument("--list-engines", action="store_true", help="List engines, languages and voices")
+    parser.add_argument("--pdf", default=f"./{FOLDER}/{STUDY}.pdf", help="PDF to convert or stream")
+    parser.add_argument("--stream", metavar="TARGET",
+                        help="Stream audio while generating: '-' (stdout), a file or named pipe, "
+                             "tcp://host:port or unix:///path.sock")
+    parser.add_argument("--stream-format", default="wav", choices=["wav", "raw"],
+                        help="WAV with placeholder header, or raw 16-bit little-endian mono PCM")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Directory of PDFs or manifest file (one PDF path per line) to convert unattended")
+    parser.add_argument("--output-dir", default="./audio", help="Output directory for batch mode")
+    parser.add_argument("--format", default=OUTPUT_FORMAT, choices=[ext.lstrip(".") for ext in FORMATS],
+                        help="Output audio format (FLAC is lossless, OGG/Opus are lossy and smallest)")
+    parser.add_argument("--engine", default=TTS_ENGINE, choices=public_engines())
+    parser.add_argument("--language", default=TTS_LANGUAGE, choices=["en", "de"])
+    parser.add_argument("--voice", default=None, help="Voice name (Kokoro) or 'default' (Coqui); default: TTS_VOICE")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--fixes", metavar="RULES_JSON",
+                        help="Regex text fix rules applied instead of the manual edit pauses")
+    parser.add_argument("--trace", metavar="TRACE_JSON", default=TRACE_FILE,
+                        help="Record per-stage timing spans and save them as a Chrome trace")
+    return parser.parse_args(argv)
+
 # Usage
 if __name__ == "__main__":
     # Configuration
     # TTS_ENGINE = "coqui"  # Change to "kokoro" or "coqui"
     # TTS_LANGUAGE = "en"   # Options: "en" (English) or "de" (German)
+    args = parse_args()
     
-    pdf_to_audio(
-        f"./{FOLDER}/{STUDY}.pdf",
-        f"./audio/{STUDY}.wav",
-        voice="bf_emma",  # Coqui: "default", Kokoro: "af_heart", "am_adam", "bf_emma", "bm_george"
-        speed=1.0
-    )
\ No newline at end of file
+    if args.trace:
+        enable_tracing()
+    try:
+        if args.list_engines:
+            list_engines()
+        elif args.extract_only:
+            extract_only(args.extract_only)
+        elif args.stream:
+            stream_pdf_to_audio(
+                args.pdf,
+                args.stream,
+                voice=args.voice or default_voice(args.engine, args.language),
+                speed=args.speed,
+                engine_name=args.engine,
+                language=args.language,
+                fmt=args.stream_format,
+                text_fixes=load_text_fix_rules(args.fixes) if args.fixes else None,
+            )
+        elif args.batch:
+            text_fixes = load_text_fix_rules(args.fixes) if args.fixes else None
+            batch_pdf_to_audio(
+                collect_pdf_paths(args.batch),
+                output_dir=args.output_dir,
+                voice=args.voice or default_voice(args.engine, args.language),
+                speed=args.speed,
+                engine_name=args.engine,
+                language=args.language,
+                text_fixes=text_fixes,
+                output_format=args.format,
+            )
+        else:
+            text_fixes = load_text_fix_rules(args.fixes) if args.fixes else None
+            session = TTSSession(args.engine, args.language)
+            try:
+                pdf_to_audio(
+                    args.pdf,
+                    os.path.join("./audio", os.path.splitext(os.path.basename(args.pdf))[0] + f".{args.format}"),
+                    voice=args.voice or default_voice(args.engine, args.language),
+                    speed=args.speed,
+                    session=session,
+                    # Fix rules replace the manual edit pauses
+                    interactive=text_fixes is None,
+                    text_fixes=text_fixes,
+                )
+            finally:
+                session.close()
+    finally:
+        tracer = disable_tracing()
+        if tracer is not None:
+            tracer.report()
+            tracer.export_chrome_trace(args.trace)
@@ -0,0 +1,105 @@
+"""
+Lazy TTS engine registry
+
+Engines are registered by name together with their capabilities, so languages,
+voices and sample rates can be listed without importing torch or the TTS
+backends. The wrapper module is imported by get_tts_class(), and the model
+weights are loaded on the engine's first synthesis.
+"""
+import importlib
+from typing import Dict, List
+
+
+class EngineSpec:
+    """Name, import location and capabilities of a TTS engine"""
+
+    def __init__(self, name: str, module: str, class_name: str,
+                 voices: Dict[str, List[str]], sample_rate: int, offline: bool = True, internal: bool = False):
+        """
+        Args:
+            name: Engine name used in configuration ("kokoro", "coqui")
+            module: Module that defines the wrapper class
+            class_name: Name of the wrapper class in that module
+            voices: Language code -> available voices
+            sample_rate: Output sample rate in Hz
+            offline: Whether the engine runs without network access
+            internal: Benchmark/test engine, creatable by name but not offered by the CLI
+        """
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.voices = voices
+        self.sample_rate = sample_rate
+        self.offline = offline
+        self.internal = internal
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.voices)
+
+
+ENGINES: Dict[str, EngineSpec] = {}
+
+
+def register_engine(spec: EngineSpec):
+    """Register an engine under spec.name"""
+    ENGINES[spec.name] = spec
+
+
+def public_engines() -> List[str]:
+    """Names of the engines offered to users (internal benchmark engines excluded)"""
+    return [name for name, spec in ENGINES.items() if not spec.internal]
+
+
+def get_engine_spec(engine_name: str) -> EngineSpec:
+    """Return the registered spec for an engine name"""
+    try:
+        return ENGINES[engine_name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown TTS engine: {engine_name}. Use {' or '.join(repr(name) for name in ENGINES)}"
+        ) from None
+
+
+def get_tts_class(engine_name: str):
+    """Import and return the TTS wrapper class for an engine name"""
+    spec = get_engine_spec(engine_name)
+    return getattr(importlib.import_module(spec.module), spec.class_name)
+
+
+def create_engine(engine_name: str, language: str = "en", **options):
+    """Build an engine; its backend is loaded on first synthesis (options go to its constructor)"""
+    spec = get_engine_spec(engine_name)
+    tts_class = get_tts_class(spec.name)
+    return tts_class(**options) if spec.name == "kokoro" else tts_class(language=language, **options)
+
+
+register_engine(EngineSpec(
+    name="kokoro",
+    module="models.kokoro_tts_offline",
+    class_name="KokoroTTS",
+    voices={"en": ["af_heart", "am_adam", "bf_emma", "bm_george"]},
+    sample_rate=24000,
+))
+register_engine(EngineSpec(
+    name="coqui",
+    module="models.coqui_tts_offline",
+    class_name="CoquiTTS",
+    voices={"en": ["default"], "de": ["default"]},
+    sample_rate=22050,
+))
+register_engine(EngineSpec(
+    name="stub",
+    module="models.stub_tts",
+    class_name="StubTTS",
+    voices={"en": ["default"], "de": ["default"]},
+    sample_rate=24000,
+    internal=True,  # synthetic tones for benchmarks and tests, never a real conversion
+))
+register_engine(EngineSpec(
+    name="router",
+    module="models.language_router",
+    class_name="LanguageRouter",
+    voices={"en": ["af_heart", "am_adam", "bf_emma", "bm_george"], "de": ["default"]},
+    sample_rate=24000,
+))
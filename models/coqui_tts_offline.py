@@ -1,18 +1,48 @@
 # -*- coding: utf-8 -*-
 # Coqui TTS Offline Usage
-import os
 import sys
+import numpy as np
+from models.cpu_backends import check_backend, load_coqui_onnx, quantize_int8
+from models.model_registry import get_model_registry
+from utils.audio_encoder import open_audio_writer
+from utils.instrumentation import span
+from utils.text_chunking import split_into_sentences
 
-try:
-    from TTS.api import TTS
-except ImportError:
-    print("❌ Coqui TTS not installed. Install with: pip install TTS")
-    sys.exit(1)
+
+def load_coqui_model(model_name: str, gpu: bool = False, backend: str = "torch"):
+    """
+    Return a TTS.api.TTS for a model, loading it only if it is not resident in the model registry
+
+    Args:
+        model_name: Coqui model path, e.g. "tts_models/de/thorsten/vits"
+        gpu: Use GPU if available
+        backend: "torch" (fp32), "int8" (dynamically quantized) or "onnx" (onnxruntime, CPU)
+    """
+    def load():
+        from TTS.api import TTS
+        print(f"🔧 Loading Coqui TTS model {model_name}...")
+        tts = TTS(model_name=model_name, gpu=gpu)
+        if backend == "int8":
+            quantize_int8(tts.synthesizer.tts_model)
+        elif backend == "onnx":
+            load_coqui_onnx(tts.synthesizer.tts_model, model_name)
+        print(f"✓ Coqui TTS model loaded ({backend} backend)")
+        return tts
+
+    check_backend(backend)
+    return get_model_registry().get(("coqui", model_name, backend, gpu), load)
 
 
 class CoquiTTS:
     """Wrapper class for Coqui TTS with offline support"""
     
+    name = "coqui"
+    # VITS alignment cost grows faster than the input, so chunks stay around a few sentences (see segment_options).
+    # Provisional: not yet measured on the real model (scripts/benchmark_chunk_size.py)
+    segment_unit = "characters"
+    segment_target = 250
+    segment_limit = 400
+    
     # Available models: language code -> model path
     MODELS = {
         "de": "tts_models/de/thorsten/vits",      # German
@@ -25,14 +55,16 @@ class CoquiTTS:
         "en": ["default"],  # English model (Glow-TTS has one default voice)
     }
     
-    def __init__(self, language: str = "en", gpu: bool = False):
+    def __init__(self, language: str = "en", gpu: bool = False, backend: str = "torch"):
         """
-        Initialize Coqui TTS
+        Initialize Coqui TTS (the model is loaded on first synthesis)
         
         Args:
             language: Language code ("en" for English, "de" for German)
             gpu: Use GPU if available (default: False for CPU)
+            backend: "torch" (fp32), "int8" (dynamically quantized) or "onnx" (onnxruntime, CPU)
         """
+        check_backend(backend)
         if language not in self.MODELS:
             raise ValueError(
                 f"Unsupported language: {language}. "
@@ -42,18 +74,28 @@ class CoquiTTS:
         self.language = language
         self.gpu = gpu
         self.model_path = self.MODELS[language]
+        self.backend = backend
+        # Identifies the weights and backend that produce the audio (cache keys, run history)
+        self.model_id = self.model_path if backend == "torch" else f"{self.model_path}+{backend}"
         self.tts = None
-        self._initialize_pipeline()
+        self.sr = 22050
+    
+    def load(self):
+        """Load the Coqui model if it is not loaded yet"""
+        if self.tts is None:
+            self._initialize_pipeline()
     
     def _initialize_pipeline(self):
         """Initialize Coqui TTS pipeline"""
         try:
-            print(f"🔧 Loading Coqui TTS model for {self.language.upper()}...")
-            self.tts = TTS(
-                model_name=self.model_path,
-                gpu=self.gpu
-            )
-            print(f"✓ Coqui TTS model loaded")
+            import TTS.api  # noqa: F401
+        except ImportError:
+            print("❌ Coqui TTS not installed. Install with: pip install TTS")
+            sys.exit(1)
+        
+        try:
+            self.tts = load_coqui_model(self.model_path, gpu=self.gpu, backend=self.backend)
+            self.sr = self.tts.synthesizer.output_sample_rate
         except Exception as e:
             print(f"❌ Failed to initialize Coqui TTS: {e}")
             import traceback
@@ -66,19 +108,16 @@ class CoquiTTS:
         
         Args:
             text: Text to convert to speech
-            output_path: Path to save the output audio file (WAV format)
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
             voice: Voice to use (currently only "default" supported per language)
             speed: Speech speed multiplier (not directly supported by Coqui, used for compatibility)
         """
+        self.load()
         try:
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-            
-            # Generate and save audio
-            self.tts.tts_to_file(
-                text=text,
-                file_path=output_path
-            )
+            # Encode each sentence as soon as it is synthesized
+            with open_audio_writer(output_path, self.sr) as writer:
+                for audio in self.iter_audio(text, voice=voice, speed=speed):
+                    writer.write(audio)
             
             print(f"✓ Audio saved to {output_path}")
             
@@ -88,6 +127,37 @@ class CoquiTTS:
             traceback.print_exc()
             raise
     
+    def iter_audio(self, text: str, voice: str = "default", speed: float = 1.0):
+        """
+        Yield float audio at self.sr one sentence at a time
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use (currently only "default" supported per language)
+            speed: Speech speed multiplier (not directly supported by Coqui, used for compatibility)
+        """
+        for sentence in split_into_sentences(text, self.language):
+            yield self.synthesize(sentence, voice=voice, speed=speed)
+    
+    def synthesize(self, text: str, voice: str = "default", speed: float = 1.0) -> np.ndarray:
+        """
+        Generate audio from text and return it as float samples at self.sr
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use (currently only "default" supported per language)
+            speed: Speech speed multiplier (not directly supported by Coqui, used for compatibility)
+        """
+        self.load()
+        with span("inference", chars=len(text)):
+            if self.backend == "onnx":
+                model = self.tts.synthesizer.tts_model
+                ids = model.tokenizer.text_to_ids(text)
+                wav = model.inference_onnx(np.asarray([ids], dtype=np.int64)).reshape(-1)
+            else:
+                wav = self.tts.tts(text=text)
+        return np.asarray(wav, dtype=np.float32)
+    
     @staticmethod
     def list_available_models():
         """Return dictionary of available models"""
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Optional CPU inference backends: dynamic int8 quantization or an exported ONNX graph
+import inspect
+import os
+
+import numpy as np
+
+BACKENDS = ("torch", "int8", "onnx")
+ONNX_OPSET = 17
+KOKORO_CACHE_DIR = "~/.cache/huggingface/hub/models--hexgrad--Kokoro-82M"
+COQUI_CACHE_DIR = "~/.local/share/tts"
+
+
+def check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend: {backend}. Available: {', '.join(BACKENDS)}")
+
+
+def quantize_int8(module):
+    """
+    Replace the Linear layers of a model with dynamically quantized int8 versions, in place
+
+    LSTMs stay fp32: Kokoro calls flatten_parameters() on them, which quantized LSTMs lack.
+    """
+    import torch
+    return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def onnx_session(path: str):
+    """Open an ONNX graph with onnxruntime's CPU provider and full graph optimizations"""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise ImportError("The onnx backend needs onnxruntime. Install with: pip install onnxruntime")
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def kokoro_onnx_path() -> str:
+    """Exported Kokoro graph, kept next to the Hugging Face model cache"""
+    return os.path.join(os.path.expanduser(KOKORO_CACHE_DIR), "onnx", f"kokoro-opset{ONNX_OPSET}.onnx")
+
+
+def export_kokoro_onnx(repo_id: str, path: str):
+    """Export Kokoro (real-valued STFT variant) with a dynamic token axis"""
+    import torch
+    from kokoro.model import KModel, KModelForONNX
+
+    print("🔧 Exporting Kokoro to ONNX (one-time)...")
+    model = KModelForONNX(KModel(repo_id=repo_id, disable_complex=True)).eval()
+    input_ids = torch.LongTensor([[0, *range(1, 33), 0]])
+    ref_s = torch.zeros((1, 256))
+    kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    torch.onnx.export(
+        model, (input_ids, ref_s, torch.tensor(1.0)), tmp_path,
+        input_names=["input_ids", "ref_s", "speed"], output_names=["waveform", "duration"],
+        dynamic_axes={"input_ids": {1: "tokens"}, "waveform": {0: "samples"}, "duration": {0: "tokens"}},
+        opset_version=ONNX_OPSET, **kwargs,
+    )
+    os.replace(tmp_path, path)
+    print(f"✓ Saved {path}")
+
+
+class KokoroONNXModel:
+    """Stand-in for KModel inside KPipeline that runs the exported graph with onnxruntime"""
+
+    def __init__(self, path: str, vocab: dict, context_length: int = 512):
+        """
+        Args:
+            path: Exported graph (see export_kokoro_onnx)
+            vocab: Phoneme to token id mapping from the model's config.json
+            context_length: Maximum tokens per call, including the two boundary tokens
+        """
+        import torch
+        self.session = onnx_session(path)
+        self.vocab = vocab
+        self.context_length = context_length
+        self.device = torch.device("cpu")
+
+    def __call__(self, phonemes: str, ref_s, speed: float = 1, return_output: bool = False):
+        import torch
+        from kokoro.model import KModel
+
+        input_ids = [0, *[self.vocab[p] for p in phonemes if p in self.vocab], 0]
+        assert len(input_ids) <= self.context_length, (len(input_ids), self.context_length)
+        waveform, duration = self.session.run(None, {
+            "input_ids": np.array([input_ids], dtype=np.int64),
+            "ref_s": ref_s.cpu().numpy().reshape(1, -1).astype(np.float32),
+            "speed": np.array(speed, dtype=np.float32),
+        })
+        audio = torch.from_numpy(waveform)
+        return KModel.Output(audio=audio, pred_dur=torch.from_numpy(duration)) if return_output else audio
+
+
+def load_kokoro_onnx(repo_id: str) -> KokoroONNXModel:
+    """Load the cached Kokoro graph, exporting it first if needed"""
+    import json
+    from huggingface_hub import hf_hub_download
+
+    path = kokoro_onnx_path()
+    if not os.path.exists(path):
+        export_kokoro_onnx(repo_id, path)
+    with open(hf_hub_download(repo_id=repo_id, filename="config.json"), "r", encoding="utf-8") as f:
+        config = json.load(f)
+    return KokoroONNXModel(path, config["vocab"], config["plbert"]["max_position_embeddings"])
+
+
+def coqui_onnx_path(model_name: str) -> str:
+    """Exported Coqui graph, kept in the model's directory of the Coqui cache"""
+    model_dir = os.path.join(os.path.expanduser(COQUI_CACHE_DIR), model_name.replace("/", "--"))
+    return os.path.join(model_dir, "model.onnx")
+
+
+def load_coqui_onnx(tts_model, model_name: str):
+    """Attach an onnxruntime session to a Coqui VITS model, exporting the graph first if needed"""
+    if not hasattr(tts_model, "export_onnx"):
+        raise ValueError(f"{model_name} has no ONNX export (only VITS models do)")
+    path = coqui_onnx_path(model_name)
+    if not os.path.exists(path):
+        print(f"🔧 Exporting {model_name} to ONNX (one-time)...")
+        tmp_path = f"{path}.tmp"
+        tts_model.export_onnx(output_path=tmp_path, verbose=False)
+        os.replace(tmp_path, path)
+        print(f"✓ Saved {path}")
+    tts_model.onnx_sess = onnx_session(path)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Length-bucketed batched inference for Kokoro (one forward pass per bucket of segments)
+from typing import List
+
+import torch
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
+
+# A bucket is closed once its longest segment would exceed its shortest by this share
+MAX_PADDING = 0.25
+
+
+def bucket_by_length(lengths: List[int], batch_size: int, max_padding: float = MAX_PADDING) -> List[List[int]]:
+    """
+    Group segment indices into batches of similar length
+
+    Args:
+        lengths: Phoneme length of each segment
+        batch_size: Maximum segments per batch
+        max_padding: Allowed relative length difference inside a batch
+    """
+    buckets, current = [], []
+    for index in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        if current and (len(current) == batch_size
+                        or lengths[index] > lengths[current[0]] * (1 + max_padding)):
+            buckets.append(current)
+            current = []
+        current.append(index)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def _packed_lstm(lstm, x: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+    """Run a batch-first LSTM over padded sequences without the padding leaking into them"""
+    packed = pack_padded_sequence(x, lengths.cpu(), batch_first=True, enforce_sorted=False)
+    lstm.flatten_parameters()
+    output, _ = lstm(packed)
+    output, _ = pad_packed_sequence(output, batch_first=True, total_length=x.shape[1])
+    return output
+
+
+@torch.no_grad()
+def forward_batch(model, phonemes: List[str], ref_s: torch.Tensor, speed: float = 1.0) -> List[torch.Tensor]:
+    """
+    Synthesize several phoneme strings in one padded forward pass of a KModel
+
+    Mirrors KModel.forward_with_tokens for a batch. Text-side layers honour the padding
+    mask, so durations match the one-at-a-time path exactly; the decoder's instance
+    norms see the padded frames, which is why callers bucket segments by length.
+
+    Args:
+        model: kokoro.KModel
+        phonemes: Phoneme strings (at most model.context_length - 2 symbols each)
+        ref_s: Voice style vectors, one row per segment ([batch, 256])
+        speed: Speech speed multiplier
+
+    Returns:
+        Audio tensor for each segment, in input order
+    """
+    device = model.device
+    ids = [[0, *[model.vocab[p] for p in ps if p in model.vocab], 0] for ps in phonemes]
+    input_lengths = torch.tensor([len(i) for i in ids], dtype=torch.long, device=device)
+    input_ids = torch.zeros((len(ids), int(input_lengths.max())), dtype=torch.long, device=device)
+    for row, tokens in enumerate(ids):
+        input_ids[row, :len(tokens)] = torch.tensor(tokens, dtype=torch.long)
+    text_mask = torch.arange(input_ids.shape[1], device=device).unsqueeze(0) + 1 > input_lengths.unsqueeze(1)
+    ref_s = ref_s.to(device)
+    s = ref_s[:, 128:]
+
+    bert_dur = model.bert(input_ids, attention_mask=(~text_mask).int())
+    d_en = model.bert_encoder(bert_dur).transpose(-1, -2)
+    d = model.predictor.text_encoder(d_en, s, input_lengths, text_mask)
+    x = _packed_lstm(model.predictor.lstm, d, input_lengths)
+    duration = torch.sigmoid(model.predictor.duration_proj(x)).sum(axis=-1) / speed
+    pred_dur = torch.round(duration).clamp(min=1).long().masked_fill(text_mask, 0)
+
+    # Per-segment alignment from tokens to frames, zero-padded to the longest segment
+    frames = pred_dur.sum(axis=1)
+    alignment = torch.zeros((len(ids), input_ids.shape[1], int(frames.max())), device=device)
+    for row in range(len(ids)):
+        indices = torch.repeat_interleave(torch.arange(input_ids.shape[1], device=device), pred_dur[row])
+        alignment[row, indices, torch.arange(indices.shape[0], device=device)] = 1
+
+    en = d.transpose(-1, -2) @ alignment
+    shared = _packed_lstm(model.predictor.shared, en.transpose(-1, -2), frames).transpose(-1, -2)
+    F0, N = shared, shared
+    for block in model.predictor.F0:
+        F0 = block(F0, s)
+    for block in model.predictor.N:
+        N = block(N, s)
+    F0_pred = model.predictor.F0_proj(F0).squeeze(1)
+    N_pred = model.predictor.N_proj(N).squeeze(1)
+
+    t_en = model.text_encoder(input_ids, input_lengths, text_mask)
+    asr = t_en @ alignment
+    audio = model.decoder(asr, F0_pred, N_pred, ref_s[:, :128])
+    audio = audio.reshape(len(ids), -1)
+    samples_per_frame = audio.shape[-1] // alignment.shape[-1]
+    return [audio[row, :int(frames[row]) * samples_per_frame].cpu() for row in range(len(ids))]
@@ -1,27 +1,131 @@
 # -*- coding: utf-8 -*-
 # Kokoro TTS Offline Usage
+import itertools
 import os
+import re
 import sys
+import time
+from typing import Optional
 import numpy as np
-from scipy.io.wavfile import write
+from utils.instrumentation import span, traced
+from models.cpu_backends import check_backend, load_kokoro_onnx, quantize_int8
+from models.model_registry import get_model_registry
+from utils.audio_encoder import open_audio_writer
+from utils.phoneme_cache import open_phoneme_cache
+from utils.text_chunking import split_into_sentences
 
-# Set offline mode BEFORE any imports
+# Set offline mode BEFORE any imports (kokoro itself is imported on first load)
 os.environ['HF_HUB_OFFLINE'] = '1'
 os.environ['TRANSFORMERS_OFFLINE'] = '1'
 os.environ['HF_DATASETS_OFFLINE'] = '1'
 
-from kokoro import KPipeline
+
+def load_kokoro_model(repo_id: str = "hexgrad/Kokoro-82M", backend: str = "torch"):
+    """Return the Kokoro model (a KModel, or its ONNX stand-in), shared by every pipeline in the process"""
+    def load():
+        if backend == "onnx":
+            return load_kokoro_onnx(repo_id)
+        import torch
+        from kokoro import KModel
+        model = KModel(repo_id=repo_id).to("cuda" if torch.cuda.is_available() else "cpu").eval()
+        if backend == "int8":
+            quantize_int8(model)
+        return model
+
+    check_backend(backend)
+    return get_model_registry().get(("kokoro", repo_id, backend), load)
+
+
+def load_kokoro_pipeline(lang_code: str = "a", repo_id: str = "hexgrad/Kokoro-82M", backend: str = "torch"):
+    """
+    Return a KPipeline for a language, reusing resident weights and G2P
+
+    Args:
+        lang_code: Kokoro language code ("a" American English, "b" British English, ...)
+        repo_id: Hugging Face repository of the weights
+        backend: "torch" (fp32), "int8" (dynamically quantized) or "onnx" (onnxruntime)
+    """
+    model = load_kokoro_model(repo_id, backend)
+
+    def load():
+        from kokoro import KModel, KPipeline
+        if isinstance(model, KModel):
+            pipeline = KPipeline(lang_code=lang_code, repo_id=repo_id, model=model)
+        else:
+            # G2P-only pipeline; the exported graph stands in for the torch model
+            pipeline = KPipeline(lang_code=lang_code, repo_id=repo_id, model=False)
+            pipeline.model = model
+        if hasattr(pipeline, "g2p"):
+            pipeline.g2p = traced("phonemization", pipeline.g2p)
+        return pipeline
+
+    return get_model_registry().get(("kokoro-pipeline", repo_id, backend, lang_code), load)
+
+
+def load_kokoro_voice(voice: str, repo_id: str = "hexgrad/Kokoro-82M"):
+    """
+    Return a voice pack tensor, shared by every pipeline (comma-separated voices are averaged)
+
+    Args:
+        voice: Voice name such as "af_heart", a path to a .pt file, or "af_heart,af_bella"
+        repo_id: Hugging Face repository of the voices
+    """
+    def load():
+        import torch
+        from huggingface_hub import hf_hub_download
+        packs = []
+        for name in voice.split(","):
+            path = name if name.endswith(".pt") else hf_hub_download(repo_id=repo_id, filename=f"voices/{name}.pt")
+            packs.append(torch.load(path, weights_only=True))
+        return packs[0] if len(packs) == 1 else torch.mean(torch.stack(packs), dim=0)
+
+    return get_model_registry().get(("kokoro-voice", repo_id, voice), load)
 
 
 class KokoroTTS:
     """Wrapper class for Kokoro TTS with offline support"""
     
-    def __init__(self):
-        """Initialize Kokoro TTS"""
+    name = "kokoro"
+    model_path = "hexgrad/Kokoro-82M"
+    # Segments phonemized ahead of synthesis when batching (buckets are formed within a window)
+    BATCH_WINDOW = 64
+    # Chunks of about this many phonemes, below the 510 at which KPipeline re-splits (see segment_options).
+    # Provisional: not yet measured on the real model (scripts/benchmark_chunk_size.py)
+    segment_unit = "phonemes"
+    segment_target = 300
+    segment_limit = 480
+    
+    def __init__(self, batch_size: int = 1, backend: str = "torch", lang_code: str = "a",
+                 phoneme_cache: Optional[str] = None):
+        """
+        Initialize Kokoro TTS (the model is loaded on first synthesis)
+        
+        Args:
+            batch_size: Segments of similar phoneme length synthesized per forward pass (1 = unbatched)
+            backend: "torch" (fp32), "int8" (dynamically quantized) or "onnx" (onnxruntime)
+            lang_code: Kokoro language code of the G2P ("a" American English, "b" British English)
+            phoneme_cache: SQLite file of the persistent per-sentence G2P cache (None to phonemize every line)
+        """
+        check_backend(backend)
+        if backend == "onnx" and batch_size > 1:
+            raise ValueError("Batched inference needs the torch or int8 backend")
         self.sr = 24000
+        self.batch_size = batch_size
+        self.backend = backend
+        self.lang_code = lang_code
+        # Identifies the weights and backend that produce the audio (cache keys, run history)
+        self.model_id = self.model_path if backend == "torch" else f"{self.model_path}+{backend}"
+        if lang_code != "a":
+            self.model_id += f"@{lang_code}"
+        # Only the English G2P yields tokens that can be cached and re-chunked
+        self.phoneme_cache = open_phoneme_cache(phoneme_cache) if phoneme_cache and lang_code in "ab" else None
         self.pipeline = None
-        self._verify_cache()
-        self._initialize_pipeline()
+    
+    def load(self):
+        """Load the Kokoro pipeline if it is not loaded yet"""
+        if self.pipeline is None:
+            self._verify_cache()
+            self._initialize_pipeline()
     
     def _verify_cache(self):
         """Verify that required model files are cached locally"""
@@ -50,8 +154,8 @@ class KokoroTTS:
         """Initialize Kokoro pipeline in offline mode"""
         try:
             print("Initializing Kokoro TTS (offline mode)...")
-            self.pipeline = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
-            print("Kokoro TTS ready (running fully offline)")
+            self.pipeline = load_kokoro_pipeline(self.lang_code, self.model_path, self.backend)
+            print(f"Kokoro TTS ready (running fully offline, {self.backend} backend)")
         except Exception as e:
             print(f"Failed to initialize Kokoro pipeline: {e}")
             import traceback
@@ -64,32 +168,21 @@ class KokoroTTS:
         
         Args:
             text: Text to convert to speech
-            output_path: Path to save the output audio file (WAV format)
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
             voice: Voice to use (default: "af_heart")
             speed: Speech speed multiplier (default: 1.0)
         """
+        writer = None
         try:
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            # Append each chunk to the output file as soon as it is produced
+            for audio in self.iter_audio(text, voice=voice, speed=speed):
+                if writer is None:
+                    writer = open_audio_writer(output_path, self.sr)
+                writer.write(audio)
             
-            # Generate audio
-            results = self.pipeline(text, voice=voice, speed=speed)
-            
-            # Collect and concatenate audio chunks
-            audio_chunks = []
-            for i, result in enumerate(results):
-                audio_chunks.append(result.audio)
-                if i == 0:
-                    self.sr = result.sr if hasattr(result, 'sr') else 24000
-            
-            # Concatenate all chunks
-            audio = np.concatenate(audio_chunks)
-            
-            # Convert to int16 for WAV file
-            audio_int16 = np.int16(audio * 32767)
-            
-            # Save to file
-            write(output_path, self.sr, audio_int16)
+            if writer is None:
+                writer = open_audio_writer(output_path, self.sr)
+            writer.close()
             print(f"Audio saved to {output_path}")
             
         except Exception as e:
@@ -97,6 +190,120 @@ class KokoroTTS:
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    def iter_audio(self, text: str, voice: str = "af_heart", speed: float = 1.0):
+        """
+        Yield float audio segments at self.sr as the pipeline produces them
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use (default: "af_heart")
+            speed: Speech speed multiplier (default: 1.0)
+        """
+        self.load()
+        if self.batch_size > 1:
+            yield from self._iter_audio_batched(text, voice, speed)
+            return
+        if self.phoneme_cache is not None:
+            yield from self._iter_audio_from_phonemes(text, voice, speed)
+            return
+        results = self.pipeline(text, voice=load_kokoro_voice(voice, self.model_path), speed=speed)
+        for i in itertools.count():
+            # G2P runs inside the generator, so phonemization spans nest in inference
+            with span("inference"):
+                result = next(results, None)
+            if result is None:
+                break
+            if i == 0:
+                self.sr = result.sr if hasattr(result, 'sr') else 24000
+            if result.audio is not None:
+                yield np.asarray(result.audio, dtype=np.float32)
+    
+    def iter_phonemes(self, text: str):
+        """Yield the phoneme string of each segment, split the way KPipeline splits English text"""
+        self.load()
+        for graphemes in re.split(r"\n+", text.strip()):
+            if not graphemes.strip():
+                continue
+            if self.phoneme_cache is None:
+                _, tokens = self.pipeline.g2p(graphemes)
+            else:
+                tokens = self._cached_tokens(graphemes)
+            for _, phonemes, _ in self.pipeline.en_tokenize(tokens):
+                if phonemes:
+                    yield phonemes[:510]
+        if self.phoneme_cache is not None:
+            self.phoneme_cache.flush()
+    
+    def _cached_tokens(self, line: str) -> list:
+        """G2P tokens of a line, phonemized sentence by sentence through the phoneme cache"""
+        from misaki.en import MToken
+        
+        tokens = []
+        for sentence in split_into_sentences(line):
+            if tokens:
+                # Sentences were phonemized apart; restore the space between them
+                tokens[-1].whitespace = " "
+            cached = self.phoneme_cache.get(sentence, self.lang_code)
+            if cached is None:
+                start = time.perf_counter()
+                _, sentence_tokens = self.pipeline.g2p(sentence)
+                cached = [(t.phonemes or "", bool(t.whitespace)) for t in sentence_tokens]
+                self.phoneme_cache.put(sentence, self.lang_code, cached, time.perf_counter() - start)
+            # en_tokenize only needs each token's phonemes and whitespace
+            tokens.extend(MToken(text="", tag="", whitespace=" " if space else "", phonemes=phonemes)
+                          for phonemes, space in cached)
+        return tokens
+    
+    def _iter_audio_from_phonemes(self, text: str, voice: str, speed: float):
+        """Synthesize segment by segment from (cached) phonemes, skipping KPipeline's own G2P"""
+        from kokoro import KPipeline
+        
+        model = self.pipeline.model
+        pack = load_kokoro_voice(voice, self.model_path).to(model.device)
+        for phonemes in self.iter_phonemes(text):
+            with span("inference"):
+                output = KPipeline.infer(model, phonemes, pack, speed)
+            yield np.asarray(output.audio, dtype=np.float32)
+    
+    def _iter_audio_batched(self, text: str, voice: str, speed: float):
+        """Synthesize windows of segments in length-bucketed batches, yielding audio in order"""
+        import torch
+        from models.kokoro_batch import bucket_by_length, forward_batch
+        
+        model = self.pipeline.model
+        pack = load_kokoro_voice(voice, self.model_path).to(model.device)
+        segments = self.iter_phonemes(text)
+        while True:
+            window = list(itertools.islice(segments, self.BATCH_WINDOW))
+            if not window:
+                break
+            audio = [None] * len(window)
+            for bucket in bucket_by_length([len(ps) for ps in window], self.batch_size):
+                with span("inference", segments=len(bucket)):
+                    # Kokoro picks the style vector by phoneme count
+                    ref_s = torch.cat([pack[len(window[i]) - 1] for i in bucket])
+                    outputs = forward_batch(model, [window[i] for i in bucket], ref_s, speed)
+                for i, output in zip(bucket, outputs):
+                    audio[i] = output.numpy().astype(np.float32)
+            yield from audio
+    
+    def synthesize(self, text: str, voice: str = "af_heart", speed: float = 1.0) -> np.ndarray:
+        """
+        Generate audio from text and return it as float samples at self.sr
+        
+        Args:
+            text: Text to convert to speech (best kept to a paragraph or two)
+            voice: Voice to use (default: "af_heart")
+            speed: Speech speed multiplier (default: 1.0)
+        """
+        chunks = list(self.iter_audio(text, voice=voice, speed=speed))
+        if not chunks:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(chunks)
     
     @staticmethod
     def list_available_voices():
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Route each paragraph of a mixed-language document to a warm engine for its language
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.audio_encoder import open_audio_writer
+from utils.instrumentation import span
+from utils.language_detection import detect_language, detect_languages
+from utils.resampler import resample
+from utils.staged_pipeline import prefetch
+from utils.text_chunking import segment_options
+from utils.wav_writer import float_to_int16
+
+# Language -> engine name; German goes to Coqui since Kokoro has no German voice
+DEFAULT_ROUTES = {"en": "kokoro", "de": "coqui"}
+# Chunks a language's engine may synthesize ahead of the one being written
+ROUTER_LOOKAHEAD = 4
+
+
+class LanguageRouter:
+    """Engine that detects the language of each chunk and hands it to a resident engine for that language"""
+
+    name = "router"
+
+    def __init__(self, language: str = "en", routes: Optional[Dict[str, str]] = None,
+                 engine_options: Optional[Dict[str, dict]] = None, voices: Optional[Dict[str, str]] = None,
+                 sample_rate: int = 24000, lookahead: int = ROUTER_LOOKAHEAD):
+        """
+        Build one engine per routed language (models are loaded on first synthesis)
+
+        Args:
+            language: Language of chunks whose language cannot be detected
+            routes: Language code -> engine name, e.g. {"en": "kokoro", "de": "coqui"}
+            engine_options: Engine name -> constructor options (as ENGINE_OPTIONS in main.py)
+            voices: Language code -> voice; other languages use the voice passed to synthesis if their engine has it
+            sample_rate: Common output rate every engine's audio is resampled to
+            lookahead: Chunks each language's engine may synthesize ahead of the output (0 = one thread)
+        """
+        from models import create_engine
+
+        routes = routes or DEFAULT_ROUTES
+        engine_options = engine_options or {}
+        if language not in routes:
+            raise ValueError(f"Fallback language {language!r} has no route ({', '.join(routes)})")
+        self.language = language
+        self.voices = voices or {}
+        self.sr = sample_rate
+        self.lookahead = lookahead
+        self.engines = {lang: create_engine(engine_name, lang, **engine_options.get(engine_name, {}))
+                        for lang, engine_name in routes.items()}
+        self.routed = {lang: 0 for lang in self.engines}
+        # Identifies every routed model and the output rate (cache keys, run history)
+        self.model_id = "router[" + ",".join(
+            f"{lang}={engine.name}:{engine.model_id}" for lang, engine in self.engines.items()) + f"]@{self.sr}"
+
+    def load(self):
+        """Load every routed engine, so switching languages never waits for a model"""
+        for engine in self.engines.values():
+            engine.load()
+
+    def segment_paragraphs(self, paragraphs: List[str]) -> List[dict]:
+        """Segmentation options per paragraph: the sentence rules, unit and target of its language's engine"""
+        languages = detect_languages(paragraphs, self.engines, self.language)
+        return [segment_options(self.engines[language]) for language in languages]
+
+    def route(self, text: str) -> str:
+        """Language of a chunk (the fallback language when it cannot be told)"""
+        return detect_language(text, self.engines) or self.language
+
+    def _voice(self, language: str, voice: str) -> str:
+        """Configured voice for a language, else the caller's voice if that engine has it, else its first voice"""
+        from models import get_engine_spec
+
+        if language in self.voices:
+            return self.voices[language]
+        available = get_engine_spec(self.engines[language].name).voices.get(language, [])
+        return voice if voice in available or not available else available[0]
+
+    def synthesize(self, text: str, voice: str = "default", speed: float = 1.0) -> np.ndarray:
+        """
+        Generate audio for one chunk with the engine for its language, at self.sr
+
+        Args:
+            text: Text to convert to speech (one language)
+            voice: Voice for languages without a configured voice
+            speed: Speech speed multiplier
+        """
+        language = self.route(text)
+        engine = self.engines[language]
+        self.routed[language] += 1
+        audio = engine.synthesize(text, voice=self._voice(language, voice), speed=speed)
+        with span("resample", language=language):
+            return resample(audio, engine.sr, self.sr)
+
+    def iter_pcm(self, chunks: List[str], voice: str, speed: float) -> Iterator[Tuple[int, bytes, float]]:
+        """
+        Yield (sample rate, PCM bytes, seconds) per chunk in order, each language's engine on its own thread
+
+        Engines run concurrently: while one language's chunk is written, the other
+        engines work up to lookahead chunks ahead on theirs.
+        """
+        languages = detect_languages(chunks, self.engines, self.language)
+
+        def synthesize_all(language: str, indices: List[int]):
+            engine = self.engines[language]
+            for i in indices:
+                start = time.perf_counter()
+                with span("chunk", chars=len(chunks[i]), language=language):
+                    audio = engine.synthesize(chunks[i], voice=self._voice(language, voice), speed=speed)
+                    audio = resample(audio, engine.sr, self.sr)
+                    pcm = float_to_int16(audio).tobytes()
+                self.routed[language] += 1
+                yield self.sr, pcm, time.perf_counter() - start
+
+        streams = {}
+        try:
+            for language in dict.fromkeys(languages):
+                indices = [i for i, lang in enumerate(languages) if lang == language]
+                streams[language] = prefetch(synthesize_all(language, indices), self.lookahead,
+                                             name=f"synthesis-{language}")
+            for language in languages:
+                yield next(streams[language])
+        finally:
+            for stream in streams.values():
+                stream.close()
+
+    def iter_audio(self, text: str, voice: str = "default", speed: float = 1.0):
+        """Yield float audio at self.sr paragraph by paragraph, each from the engine for its language"""
+        paragraphs = [p for p in text.split("\n\n") if p.strip()]
+        for paragraph, language in zip(paragraphs, detect_languages(paragraphs, self.engines, self.language)):
+            engine = self.engines[language]
+            self.routed[language] += 1
+            for audio in engine.iter_audio(paragraph, voice=self._voice(language, voice), speed=speed):
+                yield resample(audio, engine.sr, self.sr)
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0):
+        """
+        Generate audio from text and save to file
+
+        Args:
+            text: Text to convert to speech; paragraphs may be in any routed language
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice for languages without a configured voice
+            speed: Speech speed multiplier
+        """
+        with open_audio_writer(output_path, self.sr) as writer:
+            for audio in self.iter_audio(text, voice=voice, speed=speed):
+                writer.write(audio)
+        print(f"✓ Audio saved to {output_path}")
+
+    def report(self):
+        """Print how many chunks went to each language's engine"""
+        print("🌐 Routed chunks: " + ", ".join(
+            f"{lang} {count} ({self.engines[lang].name})" for lang, count in self.routed.items()))
+
+    def list_available_voices(self):
+        """Return the voices of every routed engine"""
+        return {lang: engine.list_available_voices() for lang, engine in self.engines.items()}
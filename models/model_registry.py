@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Process-wide registry of loaded models, pipelines and voice tensors with memory-budgeted LRU eviction
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+DEFAULT_MAX_BYTES = 4 * 1024**3
+
+
+def _resident_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def tensor_bytes(value) -> int:
+    """Bytes held by a torch tensor or by the parameters and buffers of a module (0 for anything else)"""
+    try:
+        import torch
+    except ImportError:
+        return 0
+    if isinstance(value, torch.Tensor):
+        return value.numel() * value.element_size()
+    if isinstance(value, torch.nn.Module):
+        tensors = list(value.parameters()) + list(value.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    return 0
+
+
+class _Entry:
+    def __init__(self, value, size: int, load_seconds: float):
+        self.value = value
+        self.size = size
+        self.load_seconds = load_seconds
+
+
+class ModelRegistry:
+    """
+    Keep loaded weights resident across engines, voices and languages
+
+    Entries are evicted least recently used first once their total size exceeds
+    max_bytes. Eviction only drops the registry's reference: an object still held
+    by an engine stays alive and is picked up again instead of being reloaded.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Memory budget for resident entries
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+        self._entries = OrderedDict()
+        self._evicted = weakref.WeakValueDictionary()
+        self._sizes = {}  # last measured size per key, reused when an evicted object is revived
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def keys(self):
+        return list(self._entries)
+
+    def get(self, key: Hashable, loader: Callable[[], object]):
+        """
+        Return the object registered under key, loading it on a miss
+
+        Args:
+            key: Hashable identity of the weights, e.g. ("coqui", model_name, backend)
+            loader: Called without arguments to load the object on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.seconds_saved += entry.load_seconds
+                return entry.value
+            value = self._evicted.pop(key, None)
+            if value is not None:
+                # Evicted but still referenced elsewhere: re-register without reloading
+                self.hits += 1
+                self._add(key, _Entry(value, self._sizes.get(key, 0), 0.0))
+                return value
+
+            rss_before = _resident_bytes()
+            start = time.perf_counter()
+            value = loader()
+            load_seconds = time.perf_counter() - start
+            # Tensors are measured exactly; RSS growth covers TTS objects, ONNX sessions and G2P lexicons
+            size = tensor_bytes(value) or max(_resident_bytes() - rss_before, 0)
+            self.loads += 1
+            self._add(key, _Entry(value, size, load_seconds))
+            return value
+
+    def _add(self, key: Hashable, entry: _Entry):
+        self._entries[key] = entry
+        self._sizes[key] = entry.size
+        self._total_bytes += entry.size
+        self._evict(keep=key)
+
+    def evict(self, key: Hashable):
+        """Drop an entry from the registry"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return
+            self._total_bytes -= entry.size
+            self.evictions += 1
+            try:
+                self._evicted[key] = entry.value
+            except TypeError:
+                pass  # not weak-referenceable
+
+    def _evict(self, keep: Hashable):
+        """Evict least recently used entries until the budget is met (never the one just used)"""
+        for key in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key != keep:
+                self.evict(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            for key in list(self._entries):
+                self.evict(key)
+
+    def report(self):
+        """Print resident entries and reuse counters"""
+        print("\nModel Registry:")
+        print("-"*60)
+        for key, entry in self._entries.items():
+            print(f"{' / '.join(str(part) for part in key):<44} | {entry.size / 1024**2:>9.1f} MB")
+        print("-"*60)
+        print(f"{'Resident':<44} | {self._total_bytes / 1024**2:>9.1f} MB")
+        print(f"{'Budget':<44} | {self.max_bytes / 1024**2:>9.1f} MB")
+        print(f"{'Loads / reuses / evictions':<44} | {self.loads} / {self.hits} / {self.evictions}")
+        print(f"{'Load time saved (s)':<44} | {self.seconds_saved:>12.1f}")
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the registry shared by every engine in this process"""
+    return _REGISTRY
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# Parallel chunked synthesis across worker processes
+import gc
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from utils.instrumentation import disable_tracing, span
+from utils.text_chunking import segment_options, split_into_chunks
+from utils.audio_encoder import open_audio_writer
+from utils.wav_writer import float_to_int16
+
+# Engine used by the current worker process. The parent sets it before forking
+# so children inherit the loaded weights copy-on-write instead of reloading them.
+_worker_engine = None
+# Chunks submitted per worker ahead of the one being written; keeps pending text and PCM bounded
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _init_worker(engine_factory: Optional[Callable], threads: int):
+    """Cap intra-op threads and make sure this worker holds a warm engine"""
+    global _worker_engine
+    # A forked worker inherits the parent's tracer, but its spans would never be exported
+    disable_tracing()
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    if _worker_engine is None:
+        _worker_engine = engine_factory()
+
+
+def _synthesize_chunk(args: Tuple[str, str, float]) -> Tuple[int, bytes, float]:
+    """Synthesize one chunk in a worker and return (sample rate, int16 PCM bytes, seconds)"""
+    text, voice, speed = args
+    start = time.perf_counter()
+    audio = _worker_engine.synthesize(text, voice=voice, speed=speed)
+    pcm = float_to_int16(audio).tobytes()
+    return _worker_engine.sr, pcm, time.perf_counter() - start
+
+
+def iter_pcm(engine, chunks: Iterable[str], voice: str, speed: float) -> Iterator[Tuple[int, bytes, float]]:
+    """Synthesize chunks one by one in-process, yielding (sample rate, PCM bytes, seconds)"""
+    if hasattr(engine, "iter_pcm"):
+        # Engines that schedule their own chunks (the language router runs one thread per language)
+        yield from engine.iter_pcm(list(chunks), voice, speed)
+        return
+    for chunk in chunks:
+        start = time.perf_counter()
+        with span("chunk", chars=len(chunk)):
+            audio = engine.synthesize(chunk, voice=voice, speed=speed)
+            with span("encoding"):
+                pcm = float_to_int16(audio).tobytes()
+        yield engine.sr, pcm, time.perf_counter() - start
+
+
+class ParallelSynthesizer:
+    """Fan chunks of a document out to a pool of warm TTS engines"""
+
+    def __init__(self, engine=None, engine_factory: Optional[Callable] = None,
+                 workers: Optional[int] = None, threads_per_worker: int = 1,
+                 max_chunk_chars: int = 1000):
+        """
+        Initialize the parallel synthesizer
+
+        Args:
+            engine: Loaded CoquiTTS/KokoroTTS instance shared with workers via fork
+            engine_factory: Picklable callable that builds an engine (needed without fork)
+            workers: Number of worker processes (default: CPU count / threads_per_worker)
+            threads_per_worker: Torch intra-op threads per worker
+            max_chunk_chars: Upper bound on characters per chunk (the engine may prefer shorter ones, see segment_options)
+        """
+        if engine is None and engine_factory is None:
+            raise ValueError("Either engine or engine_factory is required")
+
+        self.engine = engine
+        self.engine_factory = engine_factory
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.max_chunk_chars = max_chunk_chars
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use and keep it warm afterwards"""
+        global _worker_engine
+        if self._executor is not None:
+            return self._executor
+
+        if self.engine is not None and "fork" in mp.get_all_start_methods():
+            ctx = mp.get_context("fork")
+            # Load weights in the parent so every forked worker shares them
+            self.engine.load()
+            _worker_engine = self.engine
+            # Move loaded objects out of the GC's reach so refcount/GC passes
+            # in the children don't touch (and copy) the shared model pages
+            gc.freeze()
+        elif self.engine_factory is not None:
+            ctx = mp.get_context("spawn")
+        else:
+            raise RuntimeError("Platform cannot fork; pass engine_factory to use workers")
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.engine_factory, self.threads_per_worker),
+        )
+        return self._executor
+
+    def start(self):
+        """Start the worker pool now rather than on the first chunk"""
+        self._get_executor()
+
+    def iter_pcm(self, chunks: List[str], voice: str, speed: float) -> Iterator[Tuple[int, bytes, float]]:
+        """Synthesize chunks across the pool, yielding (sample rate, PCM bytes, seconds) in order"""
+        # Start the pool on the calling thread, not on whichever thread first pulls a chunk
+        return self._iter_window(self._get_executor(), chunks, voice, speed)
+
+    def _iter_window(self, executor: ProcessPoolExecutor, chunks: List[str], voice: str,
+                     speed: float) -> Iterator[Tuple[int, bytes, float]]:
+        """Keep at most workers * IN_FLIGHT_PER_WORKER chunks submitted, collecting results in submission order"""
+        window = self.workers * IN_FLIGHT_PER_WORKER
+        pending = deque()
+        try:
+            for chunk in chunks:
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(_synthesize_chunk, (chunk, voice, speed)))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0,
+                       on_chunk: Optional[Callable] = None):
+        """
+        Synthesize text in parallel chunks and write them to the output file in order
+
+        Args:
+            text: Text to convert to speech
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice to use
+            speed: Speech speed multiplier
+            on_chunk: Optional callback(chunks_done, chunks_total, characters, seconds) per finished chunk
+        """
+        chunks = split_into_chunks(text, self.max_chunk_chars, **segment_options(self.engine))
+
+        writer = None
+        try:
+            for i, (sr, pcm, seconds) in enumerate(self.iter_pcm(chunks, voice, speed)):
+                if writer is None:
+                    writer = open_audio_writer(output_path, sr)
+                writer.write_pcm(pcm)
+                if on_chunk is not None:
+                    on_chunk(i + 1, len(chunks), len(chunks[i]), seconds)
+            if writer is None:
+                writer = open_audio_writer(output_path, getattr(self.engine, "sr", 24000))
+        finally:
+            if writer is not None:
+                writer.close()
+        print(f"✓ Audio saved to {output_path} ({len(chunks)} chunks, {self.workers} workers)")
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            gc.unfreeze()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
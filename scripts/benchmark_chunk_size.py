@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Real-time factor and worker load balance against the segmenter's chunk target, per engine
+#
+#   python scripts/benchmark_chunk_size.py --engines stub kokoro coqui:de --workers 4
+#   python scripts/benchmark_chunk_size.py --engines kokoro --targets 100 200 300 400 --output chunks.json
+import argparse
+import heapq
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark_pipeline import DEFAULT_PDF, engine_is_cached, scratch_dir  # noqa: E402
+
+# Targets tried per unit when --targets is not given
+DEFAULT_TARGETS = {"phonemes": [100, 200, 300, 400, 480], "characters": [100, 250, 400, 600, 1000]}
+
+
+def makespan(seconds: list, workers: int) -> float:
+    """Finish time when chunks are handed, in order, to whichever worker is free first (like a process pool)"""
+    finish = [0.0] * workers
+    for duration in seconds:
+        heapq.heapreplace(finish, finish[0] + duration)
+    return max(finish)
+
+
+def run_engine(pdf_path: str, engine_name: str, language: str, voice: str, targets: list,
+               max_chars: int, workers: int) -> list:
+    """Synthesize the same text at every chunk target with one warm engine"""
+    import main
+    from models import create_engine
+    from utils.text_chunking import segment_options, split_into_chunks
+
+    # main writes its extraction cache under ./temp
+    with scratch_dir():
+        text = main.clean_text_for_tts(main.extract_document(pdf_path)[0])[:max_chars]
+    engine = create_engine(engine_name, language)
+    engine.load()
+    engine.synthesize("Warm-up sentence.", voice=voice)
+    options = segment_options(engine)
+    options.setdefault("unit", "characters")
+    # The engine's limit would cap the larger targets
+    options["limit"] = None
+
+    results = []
+    for target in targets:
+        chunks = split_into_chunks(text, max_chars=100_000, **{**options, "target": target})
+        seconds, audio_seconds = [], 0.0
+        for chunk in chunks:
+            start = time.perf_counter()
+            audio = engine.synthesize(chunk, voice=voice)
+            seconds.append(time.perf_counter() - start)
+            audio_seconds += len(audio) / engine.sr
+        total = sum(seconds)
+        results.append({
+            "engine": engine_name, "language": language, "unit": options["unit"], "target": target,
+            "chunks": len(chunks), "mean_chars": len(text) / max(len(chunks), 1),
+            "max_chars": max((len(chunk) for chunk in chunks), default=0),
+            "synth_seconds": total, "audio_seconds": audio_seconds,
+            "real_time_factor": total / audio_seconds if audio_seconds else 0.0,
+            # Parallel finish time over the ideal total / workers; 1.0 is a perfect split
+            "imbalance": makespan(seconds, workers) / (total / workers) if total else 0.0,
+        })
+        print(f"   {engine_name}:{language} target {target} {options['unit']}: {len(chunks)} chunks, "
+              f"RTF {results[-1]['real_time_factor']:.3f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor against chunk size")
+    parser.add_argument("--pdf", default=DEFAULT_PDF)
+    parser.add_argument("--engines", nargs="+", default=["stub", "kokoro", "coqui"],
+                        help="engine[:language[:voice]] cases; real engines run only if their weights are cached")
+    parser.add_argument("--targets", type=int, nargs="+", help="Chunk targets in the engine's unit")
+    parser.add_argument("--max-chars", type=int, default=6000, help="Characters of the document synthesized per target")
+    parser.add_argument("--workers", type=int, default=4, help="Worker count for the load-balance column")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    from models import get_tts_class
+
+    results = []
+    for spec in args.engines:
+        engine_name, language, voice = (spec.split(":") + ["en", ""])[:3]
+        voice = voice or ("af_heart" if engine_name == "kokoro" else "default")
+        if not engine_is_cached(engine_name, language):
+            print(f"⏭  Skipping {engine_name}:{language} (model weights not cached)")
+            continue
+        unit = getattr(get_tts_class(engine_name), "segment_unit", "characters")
+        targets = args.targets or DEFAULT_TARGETS[unit]
+        print(f"⏱  Benchmarking {engine_name}:{language}:{voice} at {len(targets)} chunk targets...")
+        # A fresh process per engine keeps earlier engines' threads and memory out of the timings
+        with mp.get_context("spawn").Pool(1) as pool:
+            results += pool.apply(run_engine, (os.path.abspath(args.pdf), engine_name, language, voice, targets,
+                                               args.max_chars, args.workers))
+
+    print(f"\n{'Engine':<10} | {'Target':>16} | {'Chunks':>6} | {'Chars/chunk':>11} | {'Max chars':>9} | "
+          f"{'Synth s':>8} | {'RTF':>6} | {f'Imbalance x{args.workers}':>13}")
+    print("-"*102)
+    for case in results:
+        target = f"{case['target']} {case['unit']}"
+        print(f"{case['engine'] + ':' + case['language']:<10} | {target:>16} | {case['chunks']:>6} | "
+              f"{case['mean_chars']:>11.0f} | {case['max_chars']:>9} | {case['synth_seconds']:>8.2f} | "
+              f"{case['real_time_factor']:>6.3f} | {case['imbalance']:>13.2f}")
+    print(f"\nImbalance is the finish time of {args.workers} workers taking chunks in order, over a perfect split.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"pdf": os.path.basename(args.pdf), "max_chars": args.max_chars, "cases": results}, f, indent=2)
+        print(f"\n✓ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Startup-time benchmark: light commands must not pay for torch/kokoro/TTS
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["torch", "kokoro", "TTS", "transformers"]
+THRESHOLD_SECONDS = 1.0
+RUNS = 5
+
+
+def main_probe(*args: str) -> str:
+    """Probe code that runs main.py as the CLI would, so the heavy-module check sees its imports"""
+    argv = ["main.py", *args]
+    return f"import runpy, sys; sys.argv = {argv!r}; runpy.run_path('main.py', run_name='__main__')"
+
+
+# Each probe runs in a fresh interpreter, as a real CLI invocation would
+PROBES = {
+    "import main": "import main",
+    "engine capabilities": (
+        "import models; "
+        "[(s.languages, s.voices, s.sample_rate) for s in models.ENGINES.values()]"
+    ),
+    "create engine (no synthesis)": (
+        "import models; models.create_engine('kokoro'); models.create_engine('coqui', 'de')"
+    ),
+    "main.py --list-engines": main_probe("--list-engines"),
+    "main.py --extract-only": main_probe("--extract-only", os.path.join(ROOT, "pdf", "2005_Buchanan.pdf")),
+}
+
+
+def run_probe(name, code):
+    """Run a probe RUNS times and return (best seconds, heavy modules imported)"""
+    # The check runs even if the probe exits through sys.exit()
+    check = f"print('HEAVY:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    command = [sys.executable, "-c", f"import sys\ntry:\n    {code}\nfinally:\n    {check}"]
+
+    timings = []
+    output = ""
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{result.stderr}")
+        output = result.stdout
+    heavy = ""
+    for line in output.splitlines():
+        if line.startswith("HEAVY:"):
+            heavy = line[len("HEAVY:"):]
+    return min(timings), heavy
+
+
+if __name__ == "__main__":
+    print(f"{'Command':<30} | {'Best of ' + str(RUNS):>10} | Heavy modules loaded")
+    print("-"*70)
+    failed = False
+    for name, code in PROBES.items():
+        seconds, heavy = run_probe(name, code)
+        ok = seconds < THRESHOLD_SECONDS and not heavy
+        failed |= not ok
+        print(f"{name:<30} | {seconds:>9.3f}s | {heavy or '-'} {'✓' if ok else '✘'}")
+    print(f"\nThreshold: {THRESHOLD_SECONDS:.1f}s, no {'/'.join(HEAVY_MODULES)} imports")
+    sys.exit(1 if failed else 0)
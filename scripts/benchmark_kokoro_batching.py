@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# CPU throughput of length-bucketed batched Kokoro inference on short segments
+#
+#   python scripts/benchmark_kokoro_batching.py --batch-sizes 1 4 8 16
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_PDF = os.path.join(ROOT, "pdf", "2005_Buchanan.pdf")
+KOKORO_CACHE = os.path.expanduser("~/.cache/huggingface/hub/models--hexgrad--Kokoro-82M")
+
+
+def short_lines(pdf_path: str, count: int, max_chars: int):
+    """Short lines of a PDF (captions, headings, list items) as a worst case for per-call overhead"""
+    from utils.pdf_extraction import extract_pdf_pages
+
+    lines = []
+    for page in extract_pdf_pages(pdf_path):
+        for line in page.split("\n"):
+            line = line.strip()
+            if 10 <= len(line) <= max_chars and any(c.isalpha() for c in line):
+                lines.append(line)
+                if len(lines) == count:
+                    return lines
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched vs one-at-a-time Kokoro inference")
+    parser.add_argument("--pdf", default=DEFAULT_PDF)
+    parser.add_argument("--segments", type=int, default=64, help="Number of short lines to synthesize")
+    parser.add_argument("--max-chars", type=int, default=80, help="Longest line counted as short")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--voice", default="af_heart")
+    args = parser.parse_args()
+
+    if not os.path.exists(KOKORO_CACHE):
+        print(f"⏭  Kokoro weights not cached at {KOKORO_CACHE}; nothing to benchmark")
+        return
+
+    import torch
+    from models.kokoro_batch import bucket_by_length, forward_batch
+    from models.kokoro_tts_offline import KokoroTTS, load_kokoro_voice
+    from utils.audio_metrics import spectral_distance
+
+    engine = KokoroTTS()
+    engine.load()
+    model = engine.pipeline.model
+    pack = load_kokoro_voice(args.voice).to(model.device)
+    phonemes = list(engine.iter_phonemes("\n".join(short_lines(args.pdf, args.segments, args.max_chars))))
+    print(f"🔤 {len(phonemes)} segments, {np.mean([len(ps) for ps in phonemes]):.0f} phonemes on average, "
+          f"{torch.get_num_threads()} torch threads\n")
+
+    def run(batch_size: int):
+        start = time.perf_counter()
+        if batch_size == 1:
+            audio = [model(ps, pack[len(ps) - 1], 1.0).numpy() for ps in phonemes]
+        else:
+            audio = [None] * len(phonemes)
+            for bucket in bucket_by_length([len(ps) for ps in phonemes], batch_size):
+                ref_s = torch.cat([pack[len(phonemes[i]) - 1] for i in bucket])
+                for i, output in zip(bucket, forward_batch(model, [phonemes[i] for i in bucket], ref_s)):
+                    audio[i] = output.numpy()
+        return time.perf_counter() - start, audio
+
+    run(1)  # warm-up
+    baseline_seconds, baseline = run(1)
+    _, repeat = run(1)
+    noise_floor = np.mean([spectral_distance(a, b) for a, b in zip(baseline, repeat)])
+    audio_seconds = sum(len(a) for a in baseline) / engine.sr
+
+    print(f"{'Batch':>5} | {'Seconds':>8} | {'Segments/s':>10} | {'RTF':>6} | {'Speedup':>7} | "
+          f"{'Same length':>11} | {'Spectral dist':>13}")
+    print("-"*80)
+    for batch_size in args.batch_sizes:
+        seconds, audio = (baseline_seconds, baseline) if batch_size == 1 else run(batch_size)
+        same_length = all(len(a) == len(b) for a, b in zip(audio, baseline))
+        distance = np.mean([spectral_distance(a, b) for a, b in zip(audio, baseline)])
+        print(f"{batch_size:>5} | {seconds:>8.2f} | {len(phonemes) / seconds:>10.2f} | "
+              f"{seconds / audio_seconds:>6.3f} | {baseline_seconds / seconds:>6.2f}x | "
+              f"{str(same_length):>11} | {distance:>13.3f}")
+    # Kokoro's noise source makes two unbatched runs differ too
+    print(f"\nRun-to-run spectral distance of the unbatched path (noise floor): {noise_floor:.3f}")
+
+
+if __name__ == "__main__":
+    main()
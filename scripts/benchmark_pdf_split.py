@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Time the PyPDF2 page splitter against the parallel PyMuPDF splitter on the bundled PDFs
+#
+#   python scripts/benchmark_pdf_split.py
+#   python scripts/benchmark_pdf_split.py --workers 4 --chunk 5
+import argparse
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.pdf_to_pages import split_pdf, split_pdf_to_pages  # noqa: E402
+
+
+def folder_bytes(folder: str) -> int:
+    return sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+
+
+def run(split, pdf_path: str) -> tuple:
+    """(seconds, output bytes, files) of one split into a fresh folder"""
+    folder = tempfile.mkdtemp(prefix="split_")
+    try:
+        # Both splitters print per file or per document; only the timings are reported
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            split(pdf_path, folder)
+            seconds = time.perf_counter() - start
+        return seconds, folder_bytes(folder), len(os.listdir(folder))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyPDF2 vs PyMuPDF page splitting")
+    parser.add_argument("pdfs", nargs="*", default=sorted(glob.glob(os.path.join(ROOT, "pdf", "*.pdf"))))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=1, help="Pages per file for the PyMuPDF runs")
+    args = parser.parse_args()
+    import fitz  # noqa: F401 (imported up front so the first PyMuPDF run is not charged for it)
+
+    variants = [
+        ("PyPDF2", split_pdf_to_pages),
+        ("PyMuPDF", lambda pdf, out: split_pdf(pdf, out, args.chunk)),
+        ("PyMuPDF+subset", lambda pdf, out: split_pdf(pdf, out, args.chunk, subset_fonts=True)),
+        (f"PyMuPDF x{args.workers}", lambda pdf, out: split_pdf(pdf, out, args.chunk, workers=args.workers)),
+    ]
+    print(f"{'PDF':<22} | {'Splitter':<20} | {'Files':>5} | {'Seconds':>8} | {'Output MB':>9} | {'Input MB':>8} | Speedup")
+    print("-"*96)
+    for pdf_path in args.pdfs:
+        input_mb = os.path.getsize(pdf_path) / 1024**2
+        baseline = None
+        for name, split in variants:
+            seconds, size, files = run(split, pdf_path)
+            baseline = baseline or seconds
+            print(f"{os.path.basename(pdf_path)[:22]:<22} | {name:<20} | {files:>5} | {seconds:>8.2f} | "
+                  f"{size / 1024**2:>9.2f} | {input_mb:>8.2f} | {baseline / seconds:>6.1f}x")
+    print("\nOutput MB is the total size of the split files; shared fonts and images are copied into each file.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Reproducible per-stage benchmark of the PDF to audio pipeline
+#
+#   python scripts/benchmark_pipeline.py --output bench.json
+#   python scripts/benchmark_pipeline.py --baseline bench.json   # compare against a saved run
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import sys
+import tempfile
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_PDF = os.path.join(ROOT, "pdf", "2005_Buchanan.pdf")
+# Relative slowdown beyond which a metric is flagged against the baseline
+TOLERANCE = 0.10
+# Stage timings that move by less than this are noise, not regressions
+MIN_SECONDS_DELTA = 0.05
+# Spans reported per case: whole stages, and where synthesis time goes inside them
+STAGES = ["extraction", "cleaning", "model_load", "synthesis", "inference", "postprocess", "encoding", "assembly"]
+
+
+def engine_is_cached(engine_name: str, language: str) -> bool:
+    """Whether a real engine's weights are available locally (the stub always is)"""
+    if engine_name == "stub":
+        return True
+    if engine_name == "kokoro":
+        return os.path.exists(os.path.expanduser("~/.cache/huggingface/hub/models--hexgrad--Kokoro-82M"))
+    if engine_name == "coqui":
+        from models.coqui_tts_offline import CoquiTTS
+        model_dir = CoquiTTS.MODELS.get(language, "").replace("/", "--")
+        return os.path.exists(os.path.expanduser(f"~/.local/share/tts/{model_dir}"))
+    return False
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def scratch_dir():
+    """Work in a temporary directory, so the ./temp caches, run history and texts main.py writes stay out of the repo"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            yield tmp_dir
+        finally:
+            os.chdir(previous)
+
+
+def first_characters(pages: list, max_chars: int) -> list:
+    """The pages cut down to their first max_chars characters (0 = all)"""
+    if not max_chars:
+        return pages
+    kept = []
+    for page in pages:
+        if max_chars <= 0:
+            break
+        kept.append(page[:max_chars])
+        max_chars -= len(page)
+    return kept
+
+
+def run_case(pdf_path: str, engine_name: str, language: str, voice: str, max_chars: int) -> dict:
+    """Convert the PDF with main.pdf_to_audio and read stage times from its spans (runs in a fresh process)"""
+    import main
+    from utils.instrumentation import enable_tracing, span
+
+    tracer = enable_tracing()
+    with scratch_dir() as tmp_dir:
+        session = main.TTSSession(engine_name, language)
+        try:
+            with span("model_load"):
+                session.engine.load()
+            pages = first_characters(main.extract_pages_from_pdf(pdf_path), max_chars)
+            output_path = os.path.join(tmp_dir, "bench.wav")
+            result = main.pdf_to_audio(pdf_path, output_path, voice=voice, session=session,
+                                       interactive=False, pages=pages)
+        finally:
+            session.close()
+        output_bytes = os.path.getsize(output_path)
+
+    stages = {name: seconds for name, seconds in tracer.totals().items() if name in STAGES}
+    synthesis = stages.get("synthesis", 0.0)
+    return {
+        "engine": engine_name,
+        "language": language,
+        "voice": voice,
+        "characters": result["characters"],
+        "audio_seconds": result["audio_seconds"],
+        "output_bytes": output_bytes,
+        "stages": stages,
+        "chars_per_second": result["characters"] / synthesis if synthesis else 0.0,
+        "real_time_factor": synthesis / result["audio_seconds"] if result["audio_seconds"] else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(*args) -> dict:
+    """Run a case in a spawned process so its peak RSS is not inflated by earlier cases"""
+    with mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_case, args)
+
+
+def compare(results: list, baseline: dict):
+    """Print each metric relative to the baseline and flag regressions"""
+    base_cases = {(c["engine"], c["language"], c["voice"]): c for c in baseline["cases"]}
+    regressions = 0
+    print("\nComparison against baseline:")
+    print(f"{'Case':<22} | {'Metric':<18} | {'Baseline':>10} | {'Current':>10} | {'Change':>8}")
+    print("-"*80)
+    for case in results:
+        key = (case["engine"], case["language"], case["voice"])
+        base = base_cases.get(key)
+        if base is None:
+            continue
+        # (metric, value getter, True if higher is better, minimum absolute change that counts)
+        metrics = [(f"{stage} (s)", lambda c, s=stage: c["stages"].get(s, 0.0), False, MIN_SECONDS_DELTA)
+                   for stage in case["stages"]]
+        metrics += [
+            ("chars/s", lambda c: c["chars_per_second"], True, 0.0),
+            ("RTF", lambda c: c["real_time_factor"], False, 0.0),
+            ("peak RSS (MB)", lambda c: c["peak_rss_mb"], False, 0.0),
+        ]
+        for name, get, higher_is_better, min_delta in metrics:
+            old, new = get(base), get(case)
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            flag = " ✘" if worse > TOLERANCE and abs(new - old) >= min_delta else ""
+            regressions += bool(flag)
+            print(f"{'/'.join(key):<22} | {name:<18} | {old:>10.3f} | {new:>10.3f} | {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark")
+    parser.add_argument("--pdf", default=DEFAULT_PDF)
+    parser.add_argument("--engines", nargs="+", default=["stub"],
+                        help="engine[:language[:voice]] cases; real engines run only if their weights are cached")
+    parser.add_argument("--max-chars", type=int, default=0, help="Limit synthesized characters (0 = all)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a JSON file from an earlier run")
+    args = parser.parse_args()
+
+    results = []
+    for spec in args.engines:
+        engine_name, language, voice = (spec.split(":") + ["en", ""])[:3]
+        voice = voice or ("af_heart" if engine_name == "kokoro" else "default")
+        if not engine_is_cached(engine_name, language):
+            print(f"⏭  Skipping {engine_name}:{language} (model weights not cached)")
+            continue
+        print(f"⏱  Benchmarking {engine_name}:{language}:{voice}...")
+        results.append(run_isolated(os.path.abspath(args.pdf), engine_name, language, voice, args.max_chars))
+
+    print(f"\n{'Case':<22} | {'Extract':>8} | {'Clean':>7} | {'Load':>7} | {'Synth':>8} | {'Infer':>8} | "
+          f"{'Encode':>7} | {'Chars/s':>8} | {'RTF':>6} | {'RSS MB':>7}")
+    print("-"*114)
+    for case in results:
+        stages = case["stages"]
+        columns = [(stages.get(name, 0.0), width) for name, width in
+                   [("extraction", 8), ("cleaning", 7), ("model_load", 7), ("synthesis", 8), ("inference", 8),
+                    ("encoding", 7)]]
+        print(f"{case['engine'] + '/' + case['language'] + '/' + case['voice']:<22} | "
+              + " | ".join(f"{seconds:>{width}.3f}" for seconds, width in columns)
+              + f" | {case['chars_per_second']:>8.1f} | {case['real_time_factor']:>6.3f} | {case['peak_rss_mb']:>7.1f}")
+
+    report = {
+        "pdf": os.path.basename(args.pdf),
+        "max_chars": args.max_chars,
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpus": os.cpu_count()},
+        "cases": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f))
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Compare the int8/ONNX CPU backends against the fp32 torch path: output similarity and speedup
+#
+#   python scripts/check_cpu_backends.py --engines kokoro coqui:en coqui:de --backends int8 onnx
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark_pipeline import engine_is_cached  # noqa: E402
+
+SENTENCES = [
+    "The results suggest that the effect is robust across all three samples.",
+    "Figure two shows the distribution of response times by condition.",
+    "However, further work is needed before these findings can be generalized.",
+    "Participants were recruited online and completed the survey in about ten minutes.",
+]
+# A backend fails if its audio length differs by more than this share...
+LENGTH_TOLERANCE = 0.05
+# ...or its spectral distance to fp32 exceeds the fp32 run-to-run distance by this factor
+DISTANCE_TOLERANCE = 1.5
+
+
+def synthesize_all(engine, voice: str):
+    start = time.perf_counter()
+    audio = [engine.synthesize(sentence, voice=voice) for sentence in SENTENCES]
+    return time.perf_counter() - start, audio
+
+
+def check_engine(engine_name: str, language: str, voice: str, backends: list) -> bool:
+    """Print one row per backend and return whether all of them pass"""
+    from models import create_engine
+    from utils.audio_metrics import spectral_distance
+
+    engine = create_engine(engine_name, language)
+    engine.load()
+    synthesize_all(engine, voice)  # warm-up
+    base_seconds, base = synthesize_all(engine, voice)
+    _, repeat = synthesize_all(engine, voice)
+    noise_floor = np.mean([spectral_distance(a, b) for a, b in zip(base, repeat)])
+    base_samples = sum(len(a) for a in base)
+    print(f"{engine_name + '/' + language:<10} | {'torch':<6} | {'':>7} | {base_seconds:>7.2f} | "
+          f"{base_seconds / (base_samples / engine.sr):>6.3f} | {1.0:>6.2f}x | {1.0:>6.3f} | {noise_floor:>6.3f} |")
+
+    passed = True
+    for backend in backends:
+        start = time.perf_counter()
+        candidate = create_engine(engine_name, language, backend=backend)
+        candidate.load()
+        load_seconds = time.perf_counter() - start
+        synthesize_all(candidate, voice)  # warm-up
+        seconds, audio = synthesize_all(candidate, voice)
+
+        length_ratio = sum(len(a) for a in audio) / base_samples
+        distance = np.mean([spectral_distance(a, b) for a, b in zip(audio, base)])
+        ok = abs(length_ratio - 1) <= LENGTH_TOLERANCE and distance <= noise_floor * DISTANCE_TOLERANCE
+        passed &= ok
+        print(f"{engine_name + '/' + language:<10} | {backend:<6} | {load_seconds:>7.2f} | {seconds:>7.2f} | "
+              f"{seconds / (sum(len(a) for a in audio) / candidate.sr):>6.3f} | {base_seconds / seconds:>6.2f}x | "
+              f"{length_ratio:>6.3f} | {distance:>6.3f} | {'✓' if ok else '✘'}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the int8/ONNX CPU backends against fp32")
+    parser.add_argument("--engines", nargs="+", default=["kokoro", "coqui:en"],
+                        help="engine[:language[:voice]] cases; only engines with cached weights run")
+    parser.add_argument("--backends", nargs="+", default=["int8", "onnx"], choices=["int8", "onnx"])
+    args = parser.parse_args()
+
+    print(f"{'Engine':<10} | {'Backend':<6} | {'Load s':>7} | {'Synth s':>7} | {'RTF':>6} | {'Speedup':>7} | "
+          f"{'Length':>6} | {'Dist':>6} | OK")
+    print("-"*86)
+    passed = True
+    for spec in args.engines:
+        engine_name, language, voice = (spec.split(":") + ["en", ""])[:3]
+        voice = voice or ("af_heart" if engine_name == "kokoro" else "default")
+        if not engine_is_cached(engine_name, language):
+            print(f"⏭  Skipping {engine_name}:{language} (model weights not cached)")
+            continue
+        passed &= check_engine(engine_name, language, voice, args.backends)
+    print("\nDist is the spectral distance to the fp32 output; the torch row shows fp32's own run-to-run distance.")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
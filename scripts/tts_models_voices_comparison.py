@@ -1,5 +1,21 @@
+# -*- coding: utf-8 -*-
+# Voice comparison matrix: every configured engine x voice x text, synthesized incrementally across worker processes
+#
+#   python scripts/tts_models_voices_comparison.py                       # default matrix below
+#   python scripts/tts_models_voices_comparison.py --config matrix.json --workers 2 --offline
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
 import os
-import numpy as np
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark_pipeline import peak_rss_mb  # noqa: E402
 
 text_input_de = """Künstliche Intelligenz hat sich seit ihrer Entstehung in den 1950er Jahren rasant entwickelt, angefangen mit frühen symbolischen Denksystemen und regelbasierten Systemen.
 Im Laufe der Jahrzehnte hat sich KI in Bereiche wie Computervision, Verarbeitung natürlicher Sprache und Audioverständnis erweitert und transformiert Industrien und die Gesellschaft."""
@@ -7,149 +23,222 @@ Im Laufe der Jahrzehnte hat sich KI in Bereiche wie Computervision, Verarbeitung
 text_input_en = """Artificial Intelligence has evolved rapidly since its inception in the 1950s, starting with early symbolic reasoning and rule-based systems.
 Over the decades, AI has expanded into areas like computer vision, natural language processing, and audio understanding, transforming industries and society."""
 
-output_folder = "voice_samples"
-os.makedirs(output_folder, exist_ok=True)
-
-# ----------------------
-# 1. gTTS
-# ----------------------
-try:
-    from gtts import gTTS
-    print("[gTTS] Generating audio...")
-    
-    # gTTS supports multiple accents for English and German
-    # English accents
-    en_accents = ['com.au', 'co.uk', 'us', 'co.in', 'ie', 'com.ng']
-    for accent in en_accents:
-        try:
-            tts_gtts = gTTS(text_input_en, lang='en', tld=accent)
-            voice_name = accent.replace('.', '_')
-            path = os.path.join(output_folder, f"gtts_en_{voice_name}.mp3")
-            tts_gtts.save(path)
-            print(f"[gTTS] Done -> {path}")
-        except Exception as e:
-            print(f"[gTTS] Error with English accent {accent}: {e}")
-    
-    # German accents
-    de_accents = ['de']  # Germany, Austria, Switzerland
-    for accent in de_accents:
-        try:
-            tts_gtts = gTTS(text_input_de, lang='de', tld=accent if accent != 'de' else 'de')
-            path = os.path.join(output_folder, f"gtts_de_{accent}.mp3")
-            tts_gtts.save(path)
-            print(f"[gTTS] Done -> {path}")
-        except Exception as e:
-            print(f"[gTTS] Error with German accent {accent}: {e}")
-            
-except Exception as e:
-    print(f"[gTTS] Error: {e}")
-
-# ----------------------
-# 2. Coqui TTS
-# ----------------------
-try:
-    from TTS.api import TTS
-    print("[Coqui TTS] Generating audio...")
-    
-    # Define minimal set of models: one male and one female for each language
-    models_to_use = {
-        'en_female': 'tts_models/en/ljspeech/vits',  # Female English voice
-        'en_male': 'tts_models/en/vctk/vits',  # Multi-speaker (we'll use a male voice)
-        'de_female': 'tts_models/de/thorsten/vits',  # Male voice (Thorsten is male, but it's the main German model)
-        'de_male': 'tts_models/de/thorsten/vits',  # Same model, will use different speaker if available
-    }
-    
-    # English Female
-    try:
-        print(f"[Coqui TTS] Loading English female voice...")
-        tts_en_female = TTS('tts_models/en/ljspeech/vits')
-        path = os.path.join(output_folder, "coqui_en_female.wav")
-        tts_en_female.tts_to_file(text=text_input_en, file_path=path)
-        print(f"[Coqui TTS] Done -> {path}")
-    except Exception as e:
-        print(f"[Coqui TTS] Error with English female: {e}")
-    
-    # English Male (using VCTK multi-speaker model)
-    try:
-        print(f"[Coqui TTS] Loading English male voice...")
-        tts_en_male = TTS('tts_models/en/vctk/vits')
-        # Use a male speaker from VCTK (p226 is male)
-        path = os.path.join(output_folder, "coqui_en_male.wav")
-        if hasattr(tts_en_male, 'speakers') and tts_en_male.speakers:
-            # Pick a male speaker (p226, p227, p232, p243, etc. are male)
-            male_speaker = 'p226'  # Male speaker
-            tts_en_male.tts_to_file(text=text_input_en, speaker=male_speaker, file_path=path)
-        else:
-            tts_en_male.tts_to_file(text=text_input_en, file_path=path)
-        print(f"[Coqui TTS] Done -> {path}")
-    except Exception as e:
-        print(f"[Coqui TTS] Error with English male: {e}")
-    
-    # German - Thorsten (male voice)
-    try:
-        print(f"[Coqui TTS] Loading German male voice...")
-        tts_de_male = TTS('tts_models/de/thorsten/vits')
-        path = os.path.join(output_folder, "coqui_de_male.wav")
-        tts_de_male.tts_to_file(text=text_input_de, file_path=path)
-        print(f"[Coqui TTS] Done -> {path}")
-    except Exception as e:
-        print(f"[Coqui TTS] Error with German male: {e}")
-    
-    # German Female (using CSS10 if available, otherwise note it's not available)
+# Texts by language, and one cell per engine/voice. A cell may name a "model" (Coqui model path)
+# and a "label" (output file name); "voice" is the gTTS accent (tld), Coqui speaker or Kokoro voice.
+MATRIX = {
+    "texts": {"en": text_input_en, "de": text_input_de},
+    "cells": [
+        *[{"engine": "gtts", "lang": "en", "voice": accent} for accent in ['com.au', 'co.uk', 'us', 'co.in', 'ie', 'com.ng']],
+        {"engine": "gtts", "lang": "de", "voice": "de"},
+        {"engine": "coqui", "lang": "en", "model": "tts_models/en/ljspeech/vits", "voice": "default", "label": "coqui_en_female"},
+        # VCTK is multi-speaker; p226 is male
+        {"engine": "coqui", "lang": "en", "model": "tts_models/en/vctk/vits", "voice": "p226", "label": "coqui_en_male"},
+        {"engine": "coqui", "lang": "de", "model": "tts_models/de/thorsten/vits", "voice": "default", "label": "coqui_de_male"},
+        # Coqui has few German female voices
+        {"engine": "coqui", "lang": "de", "model": "tts_models/de/css10/vits-neon", "voice": "default", "label": "coqui_de_female"},
+        *[{"engine": "kokoro", "lang": "en", "voice": voice} for voice in [
+            'af_heart', 'af_bella', 'af_sarah', 'af_nicole',
+            'am_adam', 'am_michael',
+            'bf_emma', 'bf_isabella',
+            'bm_george', 'bm_lewis',
+        ]],
+    ],
+}
+OUTPUT_FOLDER = os.path.join(ROOT, "voice_samples")
+MANIFEST_FILE = "matrix.json"
+
+
+def cell_filename(cell: dict) -> str:
+    """Output file of a cell (gTTS writes MP3, the local engines WAV)"""
+    name = cell.get("label") or f"{cell['engine']}_{cell['lang']}_{cell['voice'].replace('.', '_')}"
+    return f"{name}.mp3" if cell["engine"] == "gtts" else f"{name}.wav"
+
+
+def cell_fingerprint(cell: dict, text: str) -> str:
+    """Hash of everything that determines a cell's audio"""
+    payload = json.dumps([cell["engine"], cell.get("model"), cell["voice"], cell["lang"], text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(output_folder: str) -> dict:
+    path = os.path.join(output_folder, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
     try:
-        print(f"[Coqui TTS] Loading German female voice...")
-        tts_de_female = TTS('tts_models/de/css10/vits-neon')
-        path = os.path.join(output_folder, "coqui_de_female.wav")
-        tts_de_female.tts_to_file(text=text_input_de, file_path=path)
-        print(f"[Coqui TTS] Done -> {path}")
-    except Exception as e:
-        print(f"[Coqui TTS] German female voice not available or error: {e}")
-        print(f"[Coqui TTS] Note: Coqui TTS has limited German female voices")
-            
-except Exception as e:
-    print(f"[Coqui TTS] Error: {e}")
-
-# ----------------------
-# 3. Kokoro TTS
-# ----------------------
-try:
-    from kokoro import KPipeline
-    from scipy.io.wavfile import write
-    print("[Kokoro TTS] Generating audio...")
-    
-    # Kokoro voices according to documentation
-    # English voices
-    en_voices = [
-        'af_heart', 'af_bella', 'af_sarah', 'af_nicole',
-        'am_adam', 'am_michael',
-        'bf_emma', 'bf_isabella',
-        'bm_george', 'bm_lewis'
-    ]
-    
-    # Process English voices
-    pipeline_en = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
-    for voice in en_voices:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_folder: str, manifest: dict):
+    path = os.path.join(output_folder, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(f"{path}.tmp", path)
+
+
+def _init_worker(threads: int):
+    # Read by torch when an engine first imports it, so gTTS-only workers never load torch
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+
+def _load_synthesizer(engine_name: str, lang: str, model: str, voice: str):
+    """Return (synthesize(text) -> float audio, sample rate) for a local engine, reusing resident weights"""
+    if engine_name == "coqui" and model:
+        from models.coqui_tts_offline import load_coqui_model
+        tts = load_coqui_model(model)
+        speaker = voice if voice != "default" and getattr(tts, "speakers", None) else None
+        return (lambda text: tts.tts(text=text, speaker=speaker)), tts.synthesizer.output_sample_rate
+
+    from models import create_engine
+    options = {"lang_code": voice[0]} if engine_name == "kokoro" else {}
+    engine = create_engine(engine_name, lang, **options)
+    engine.load()
+    return (lambda text: engine.synthesize(text, voice=voice)), engine.sr
+
+
+def run_group(cells: list, texts: dict, output_folder: str) -> list:
+    """
+    Synthesize cells that share an engine and model in one worker process
+
+    Returns:
+        (file name, metrics or None, error or None) per cell
+    """
+    import numpy as np
+    from utils.audio_encoder import audio_duration, open_audio_writer
+
+    results = []
+    synthesizers = {}
+    for cell in cells:
+        filename = cell_filename(cell)
+        path = os.path.join(output_folder, filename)
+        text = texts[cell["lang"]]
         try:
-            results = pipeline_en(text_input_en, voice=voice, speed=1.0)
-            
-            audio_chunks = []
-            sr = 24000
-            for i, result in enumerate(results):
-                audio_chunks.append(result.audio)
-                if i == 0:
-                    sr = result.sr if hasattr(result, 'sr') else 24000
-            
-            audio = np.concatenate(audio_chunks)
-            audio_int16 = np.int16(audio * 32767)
-            
-            path = os.path.join(output_folder, f"kokoro_en_{voice}.wav")
-            write(path, sr, audio_int16)
-            print(f"[Kokoro TTS] Done -> {path}")
-        except Exception as e:
-            print(f"[Kokoro TTS] Error with English voice {voice}: {e}")
-    
-            
-except Exception as e:
-    print(f"[Kokoro TTS] Error: {e}")
-
-print(f"\n[Complete] All voice samples saved to: {output_folder}")
\ No newline at end of file
+            load_seconds = 0.0
+            if cell["engine"] == "gtts":
+                from gtts import gTTS
+                start = time.perf_counter()
+                gTTS(text, lang=cell["lang"], tld=cell["voice"]).save(path)
+                seconds = time.perf_counter() - start
+                try:
+                    audio_seconds = audio_duration(path)
+                except Exception:
+                    audio_seconds = 0.0  # libsndfile without MP3 support
+            else:
+                # Kokoro pipelines differ per lang_code (first letter of the voice)
+                key = (cell["engine"], cell["lang"], cell.get("model"),
+                       cell["voice"][0] if cell["engine"] == "kokoro" else None)
+                if key not in synthesizers:
+                    start = time.perf_counter()
+                    synthesizers[key] = _load_synthesizer(cell["engine"], cell["lang"], cell.get("model"), cell["voice"])
+                    load_seconds = time.perf_counter() - start
+                synthesize, sr = synthesizers[key]
+                start = time.perf_counter()
+                audio = np.asarray(synthesize(text), dtype=np.float32)
+                seconds = time.perf_counter() - start
+                with open_audio_writer(path, sr) as writer:
+                    writer.write(audio)
+                audio_seconds = len(audio) / sr
+            results.append((filename, {
+                "synth_seconds": seconds,
+                "load_seconds": load_seconds,
+                "audio_seconds": audio_seconds,
+                "real_time_factor": seconds / audio_seconds if audio_seconds else 0.0,
+                "output_bytes": os.path.getsize(path),
+                "peak_rss_mb": peak_rss_mb(),
+            }, None))
+        except (Exception, SystemExit) as e:
+            # The engine wrappers exit when their weights are missing
+            results.append((filename, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def group_cells(cells: list) -> list:
+    """Group cells by engine, model and language so each worker loads one set of weights"""
+    groups = {}
+    for cell in cells:
+        groups.setdefault((cell["engine"], cell.get("model"), cell["lang"]), []).append(cell)
+    return list(groups.values())
+
+
+def print_table(cells: list, manifest: dict, status: dict):
+    print(f"\n{'Cell':<26} | {'Engine':<7} | {'Synth s':>8} | {'Load s':>7} | {'RTF':>6} | "
+          f"{'Size KB':>8} | {'Peak MB':>8} | Status")
+    print("-"*100)
+    for cell in cells:
+        filename = cell_filename(cell)
+        name = os.path.splitext(filename)[0]
+        entry = manifest.get(filename)
+        if status.get(filename, "").startswith("✘") or entry is None:
+            print(f"{name:<26} | {cell['engine']:<7} | {'-':>8} | {'-':>7} | {'-':>6} | {'-':>8} | {'-':>8} | "
+                  f"{status.get(filename, '✘ missing')}")
+            continue
+        m = entry["metrics"]
+        rtf = f"{m['real_time_factor']:>6.3f}" if m["audio_seconds"] else f"{'-':>6}"
+        print(f"{name:<26} | {cell['engine']:<7} | {m['synth_seconds']:>8.2f} | {m['load_seconds']:>7.2f} | {rtf} | "
+              f"{m['output_bytes'] / 1024:>8.1f} | {m['peak_rss_mb']:>8.1f} | {status.get(filename, '')}")
+    print("\nRTF is synthesis time / audio duration; Peak MB is the worker's peak RSS up to that cell, "
+          "including model load.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize the engine x voice x text comparison matrix")
+    parser.add_argument("--config", help="JSON file with \"texts\" (language -> text) and \"cells\" (see MATRIX)")
+    parser.add_argument("--output", default=OUTPUT_FOLDER, help="Folder for samples and the matrix manifest")
+    parser.add_argument("--engines", nargs="+", help="Only run cells of these engines")
+    parser.add_argument("--offline", action="store_true", help="Skip gTTS (needs network access)")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="Torch threads per worker")
+    parser.add_argument("--force", action="store_true", help="Regenerate cells that are up to date")
+    args = parser.parse_args()
+
+    matrix = MATRIX
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            matrix = json.load(f)
+    texts = matrix["texts"]
+    cells = [cell for cell in matrix["cells"]
+             if (not args.engines or cell["engine"] in args.engines)
+             and not (args.offline and cell["engine"] == "gtts")]
+    os.makedirs(args.output, exist_ok=True)
+
+    manifest = load_manifest(args.output)
+    status, pending = {}, []
+    for cell in cells:
+        filename = cell_filename(cell)
+        entry = manifest.get(filename)
+        up_to_date = (entry is not None and entry["fingerprint"] == cell_fingerprint(cell, texts[cell["lang"]])
+                      and os.path.exists(os.path.join(args.output, filename)))
+        if up_to_date and not args.force:
+            status[filename] = "up to date"
+        else:
+            pending.append(cell)
+    print(f"🎛  {len(cells)} cells, {len(cells) - len(pending)} up to date, {len(pending)} to synthesize")
+
+    if pending:
+        groups = group_cells(pending)
+        workers = args.workers or max(1, (os.cpu_count() or 1) // max(1, args.threads))
+        fingerprints = {cell_filename(cell): cell_fingerprint(cell, texts[cell["lang"]]) for cell in pending}
+        # A fresh process per group keeps each group's peak memory separate
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups)), mp_context=mp.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(max(1, args.threads),),
+                                 max_tasks_per_child=1) as executor:
+            futures = [executor.submit(run_group, group, texts, args.output) for group in groups]
+            for future in futures:
+                for filename, metrics, error in future.result():
+                    if error:
+                        status[filename] = f"✘ {error}"[:80]
+                        print(f"✘ {filename}: {error}")
+                        continue
+                    manifest[filename] = {"fingerprint": fingerprints[filename], "metrics": metrics}
+                    status[filename] = "✓ new"
+                    print(f"✓ {filename} ({metrics['synth_seconds']:.2f}s)")
+                save_manifest(args.output, manifest)
+
+    print_table(cells, manifest, status)
+    print(f"\n[Complete] Voice samples in: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import struct
+import subprocess
+import sys
+
+from models.stub_tts import StubTTS
+from utils.audio_sink import stream_audio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEXT = "A short sentence. And another one."
+
+
+def parse_header(data: bytes):
+    riff, _, wave, data_id, data_size = struct.unpack("<4sI4s24x4sI", data[:44])
+    assert (riff, wave, data_id) == (b"RIFF", b"WAVE", b"data")
+    return data_size
+
+
+def test_stream_to_file_patches_sizes(tmp_path):
+    path = tmp_path / "out.wav"
+    streamer = stream_audio(StubTTS(), TEXT, str(path))
+    data = path.read_bytes()
+    assert streamer.bytes_written > 0
+    assert parse_header(data) == streamer.bytes_written == len(data) - 44
+
+
+def test_stream_to_stdout_while_messages_go_to_stderr():
+    # As in main.stream_pdf_to_audio: log output is redirected to stderr, audio must still reach stdout
+    script = (
+        "import contextlib, sys\n"
+        "from models.stub_tts import StubTTS\n"
+        "from utils.audio_sink import stream_audio\n"
+        "with contextlib.redirect_stdout(sys.stderr):\n"
+        f"    streamer = stream_audio(StubTTS(), {TEXT!r}, '-')\n"
+        "    print('bytes', streamer.bytes_written)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, check=True)
+    bytes_written = int(result.stderr.decode().split("bytes")[-1])
+    assert result.stdout[:4] == b"RIFF"
+    assert len(result.stdout) - 44 == bytes_written
+    # A pipe cannot be patched, so the header keeps the streaming placeholder size
+    assert parse_header(result.stdout) >= bytes_written
+    assert b"RIFF" not in result.stderr
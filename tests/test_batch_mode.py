@@ -0,0 +1,29 @@
+import threading
+
+import main
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+def test_next_document_is_extracted_while_current_one_is_synthesized(monkeypatch, tmp_path):
+    extracted = {name: threading.Event() for name in ("a.pdf", "b.pdf")}
+    overlapped = []
+
+    def extract(pdf_path, workers=None, start_method=None):
+        extracted[pdf_path].set()
+        return [f"text of {pdf_path}"]
+
+    def convert(pdf_path, output_path, **options):
+        if pdf_path == "a.pdf":
+            # Synthesis of the first document lasts until the second one has been extracted (or times out)
+            overlapped.append(extracted["b.pdf"].wait(timeout=10))
+        return {"characters": 1, "synthesis_seconds": 0.0, "total_seconds": 0.0, "audio_seconds": 0.0}
+
+    monkeypatch.setattr(main, "TTSSession", lambda *args: _Session())
+    monkeypatch.setattr(main, "extract_pages_from_pdf", extract)
+    monkeypatch.setattr(main, "pdf_to_audio", convert)
+    main.batch_pdf_to_audio(["a.pdf", "b.pdf"], output_dir=str(tmp_path))
+    assert overlapped == [True]
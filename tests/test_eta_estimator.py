@@ -0,0 +1,18 @@
+from utils.eta_estimator import ETAEstimator, LiveETA, RunHistory
+
+
+def test_runs_at_other_speeds_are_not_pooled(tmp_path):
+    history = RunHistory(str(tmp_path / "history.jsonl"))
+    history.append("kokoro", "m", "af_heart", 1, 1000, 10.0, speed=1.0)
+    history.append("kokoro", "m", "af_heart", 1, 1000, 40.0, speed=2.0)
+    rate, _, runs, basis = ETAEstimator(history, "kokoro", "m", "af_heart", speed=2.0).fit()
+    assert (rate, runs) == (0.04, 1)
+    assert "speed" in basis
+
+
+def test_live_eta_counts_only_synthesized_chunk_seconds(tmp_path):
+    live = LiveETA(ETAEstimator(RunHistory(str(tmp_path / "history.jsonl")), "stub", "m", "v"), 300)
+    live.update(1, 3, 100, 0.0)  # from the cache
+    live.update(2, 3, 100, 2.0)
+    live.update(3, 3, 100, 3.0)
+    assert (live.synthesized_characters, live.synthesis_seconds) == (200, 5.0)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from models.language_router import LanguageRouter
+from models.parallel_tts import iter_pcm
+from utils.text_chunking import segment_options, segment_text
+
+ENGLISH = "The model is trained on the data and it works well."
+GERMAN = "Die Ergebnisse kamen am 3. Oktober an und sind in der Tabelle."
+
+
+def stub_router() -> LanguageRouter:
+    router = LanguageRouter("en", routes={"en": "stub", "de": "stub"}, sample_rate=24000)
+    router.engines["de"].sr = 22050
+    return router
+
+
+def test_paragraphs_use_the_segmentation_of_their_language():
+    router = stub_router()
+    router.engines["en"].segment_target, router.engines["en"].segment_unit = 20, "characters"
+    paragraphs = segment_text(f"{ENGLISH} {ENGLISH}\n\n{GERMAN}", **segment_options(router))
+    # English is cut to its engine's short target; the German ordinal does not end a sentence
+    assert len(paragraphs[0]) == 2
+    assert paragraphs[1] == [GERMAN]
+
+
+def test_chunks_are_routed_in_order_at_one_rate():
+    router = stub_router()
+    results = list(iter_pcm(router, [ENGLISH, GERMAN, "Figure 3", ENGLISH], "default", 1.0))
+    assert [sr for sr, _, _ in results] == [24000] * 4
+    assert router.routed == {"en": 2, "de": 2}
+    # The 22,050 Hz German chunk is resampled to the router's rate
+    german = np.frombuffer(results[1][1], dtype=np.int16)
+    expected = len(router.engines["de"].synthesize(GERMAN)) * 24000 / 22050
+    assert abs(len(german) - expected) <= 1
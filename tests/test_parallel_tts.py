@@ -0,0 +1,44 @@
+from models.parallel_tts import IN_FLIGHT_PER_WORKER, ParallelSynthesizer, iter_pcm
+from models.stub_tts import StubTTS
+
+CHUNKS = [f"Sentence number {i} of the test." for i in range(12)]
+
+
+class RecordingExecutor:
+    """Hands back the chunk text as the result and records how many chunks were submitted but not collected"""
+
+    def __init__(self):
+        self.pending = 0
+        self.max_pending = 0
+
+    def submit(self, fn, args):
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        return RecordingFuture(self, args[0])
+
+
+class RecordingFuture:
+    def __init__(self, executor, value):
+        self.executor = executor
+        self.value = value
+
+    def result(self):
+        self.executor.pending -= 1
+        return self.value
+
+    def cancel(self):
+        self.executor.pending -= 1
+
+
+def test_submits_through_a_bounded_window():
+    synth = ParallelSynthesizer(StubTTS(), workers=2)
+    executor = RecordingExecutor()
+    assert list(synth._iter_window(executor, CHUNKS, "default", 1.0)) == CHUNKS
+    assert executor.max_pending == 2 * IN_FLIGHT_PER_WORKER
+
+
+def test_pool_yields_chunks_in_order():
+    engine = StubTTS()
+    expected = [pcm for _, pcm, _ in iter_pcm(engine, CHUNKS, "default", 1.0)]
+    with ParallelSynthesizer(engine, workers=2) as synth:
+        assert [pcm for _, pcm, _ in synth.iter_pcm(CHUNKS, "default", 1.0)] == expected
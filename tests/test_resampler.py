@@ -0,0 +1,30 @@
+import numpy as np
+
+from utils.resampler import StreamingResampler, resample
+
+
+def sine(rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def test_blockwise_matches_whole_signal():
+    audio = sine(22050)
+    whole = resample(audio, 22050, 48000)
+    resampler = StreamingResampler(22050, 48000)
+    blocks = [resampler.process(audio[i:i + 1000]) for i in range(0, len(audio), 1000)]
+    blockwise = np.concatenate(blocks + [resampler.flush()])
+    assert len(blockwise) == len(whole) == 48000
+    assert np.abs(blockwise - whole).max() < 1e-5
+
+
+def test_preserves_amplitude_and_length():
+    out = resample(sine(24000), 24000, 22050)
+    assert len(out) == 22050
+    assert abs(np.abs(out[1000:-1000]).max() - 0.5) < 0.01
+
+
+def test_same_rate_is_passthrough():
+    audio = sine(24000, 0.1)
+    assert np.array_equal(resample(audio, 24000, 24000), audio)
+    assert np.array_equal(StreamingResampler(24000, 24000).process(audio), audio)
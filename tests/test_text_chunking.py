@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from utils.text_chunking import segment_text, split_into_chunks, split_into_sentences
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Dr. Smith et al. showed it. It worked.", ["Dr. Smith et al. showed it.", "It worked."]),
+    ("See Fig. 3 for details. Results follow.", ["See Fig. 3 for details.", "Results follow."]),
+    ("Written by J. R. Smith. Next one.", ["Written by J. R. Smith.", "Next one."]),
+    ("It rose, e.g. in 2020. Then it fell.", ["It rose, e.g. in 2020.", "Then it fell."]),
+    ("Is it? Yes! Done.", ["Is it?", "Yes!", "Done."]),
+])
+def test_english_sentences(text, expected):
+    assert split_into_sentences(text, "en") == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Er kam am 3. Oktober an. Dann ging er.", ["Er kam am 3. Oktober an.", "Dann ging er."]),
+    ("Das ist z. B. gut. Vgl. Abb. 2. Danach mehr.", ["Das ist z. B. gut.", "Vgl. Abb. 2.", "Danach mehr."]),
+    ("Das war im Jahr 2020. Heute nicht.", ["Das war im Jahr 2020.", "Heute nicht."]),
+    ("Siehe S. 12 bzw. Kap. 4 dazu. Ende.", ["Siehe S. 12 bzw. Kap. 4 dazu.", "Ende."]),
+])
+def test_german_sentences(text, expected):
+    assert split_into_sentences(text, "de") == expected
+
+
+def test_sentences_never_span_paragraphs():
+    assert split_into_sentences("First line\n\nSecond line") == ["First line", "Second line"]
+
+
+def test_chunks_stay_within_limit_for_uneven_sentences():
+    rng = random.Random(1)
+    for _ in range(2000):
+        limit = rng.randint(40, 400)
+        lengths = [rng.randint(5, limit - 1) for _ in range(rng.randint(2, 12))]
+        text = " ".join("W" + "w" * (n - 3) + "." for n in lengths)
+        for chunk in split_into_chunks(text, max_chars=100_000, target=rng.randint(20, limit), limit=limit):
+            assert len(chunk) <= limit
+
+
+def test_chunks_are_balanced_whole_sentences():
+    sentence = "This sentence is exactly forty chars ok."
+    paragraphs = segment_text(" ".join([sentence] * 10), target=130)
+    assert all(chunk.endswith(".") for chunk in paragraphs[0])
+    sizes = [len(chunk) for chunk in paragraphs[0]]
+    # Equal shares rather than full chunks followed by a short remainder
+    assert max(sizes) - min(sizes) <= len(sentence) + 1
+
+
+def test_long_sentence_is_split_at_clauses():
+    text = "First clause here, second clause here, third clause here."
+    chunks = split_into_chunks(text, max_chars=25)
+    assert all(len(chunk) <= 25 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_target_below_sentence_length_gives_one_sentence_per_chunk():
+    text = "First sentence here. Second sentence here. Third one."
+    assert split_into_chunks(text, target=5) == ["First sentence here.", "Second sentence here.", "Third one."]
@@ -0,0 +1,40 @@
+from utils.text_cleaning import join_hyphenated_breaks
+
+
+def test_joins_words_seen_unbroken_elsewhere():
+    text, joined = join_hyphenated_breaks("The experi-\nment worked. A second experiment followed.")
+    assert text.startswith("The experiment worked.")
+    assert joined == 1
+
+
+def test_keeps_hyphen_of_compounds():
+    text, joined = join_hyphenated_breaks("A well-\nknown self-\nattention layer, state-of-the-\nart results.")
+    assert text == "A well-known self-attention layer, state-of-the-art results."
+    assert joined == 0
+
+
+def test_joins_words_broken_once_and_never_repeated():
+    text, joined = join_hyphenated_breaks("Further charac-\nteristics and the con-\nclusion of the newspa-\nper.")
+    assert text == "Further characteristics and the conclusion of the newspaper."
+    assert joined == 3
+
+
+def test_keeps_hyphen_when_both_parts_stand_alone():
+    text, _ = join_hyphenated_breaks("A task-\nspecific head. Each task is specific.")
+    assert text.startswith("A task-specific head.")
+
+
+def test_keeps_hyphen_when_hyphenated_form_occurs():
+    text, _ = join_hyphenated_breaks("Pre-training helps. We pre-\ntraining and pretraining.")
+    assert "pre-training and" in text
+
+
+def test_lexicon_and_soft_hyphen():
+    text, joined = join_hyphenated_breaks("Sprach-\nmodell und Daten\u00ad\nsatz", lexicon={"sprachmodell"})
+    assert text == "Sprachmodell und Datensatz"
+    assert joined == 2
+
+
+def test_never_joins_across_a_blank_line():
+    text = "Ends with a dash -\n\nnext paragraph"
+    assert join_hyphenated_breaks(text)[0] == text
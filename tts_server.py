@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# Resident local TTS server that keeps Kokoro/Coqui models warm between jobs
+import argparse
+import http.client
+import json
+import os
+import queue
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from models import create_engine, public_engines
+from utils.text_chunking import segment_options, split_into_chunks
+from utils.audio_encoder import open_audio_writer
+from utils.wav_writer import float_to_int16, parse_wav_header, wav_header
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Seconds a request waits for the next chunk of a started job before giving up
+CHUNK_TIMEOUT = 600
+
+
+class SynthesisJob:
+    """One queued request; audio flows back to the HTTP handler through a bounded queue"""
+
+    def __init__(self, text: str, engine: str, language: str, voice: str, speed: float):
+        self.text = text
+        self.engine = engine
+        self.language = language
+        self.voice = voice
+        self.speed = speed
+        self.output = queue.Queue(maxsize=8)
+        self.cancelled = threading.Event()
+
+
+class TTSService:
+    """Holds loaded engines and synthesizes queued jobs one at a time on a worker thread"""
+
+    def __init__(self, preload=()):
+        """
+        Initialize the service
+
+        Args:
+            preload: (engine, language) pairs to load before accepting requests
+        """
+        self.engines = {}
+        self.jobs = queue.Queue()
+        for engine_name, language in preload:
+            self.get_engine(engine_name, language)
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def get_engine(self, engine_name: str, language: str = "en"):
+        """Return a warm engine, loading it on first use"""
+        engine_name = engine_name.lower()
+        # Kokoro's wrapper has no language switch, so one instance serves every request
+        key = (engine_name, None if engine_name == "kokoro" else language)
+        if key not in self.engines:
+            engine = create_engine(engine_name, language)
+            engine.load()
+            self.engines[key] = engine
+        return self.engines[key]
+
+    def submit(self, job: SynthesisJob):
+        self.jobs.put(job)
+
+    def _emit(self, job: SynthesisJob, item) -> bool:
+        """Hand an item to the request handler; False once the client has gone away"""
+        while not job.cancelled.is_set():
+            try:
+                job.output.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                engine = self.get_engine(job.engine, job.language)
+                if not self._emit(job, ("start", engine.sr)):
+                    continue
+                for chunk in split_into_chunks(job.text, **segment_options(engine)):
+                    audio = engine.synthesize(chunk, voice=job.voice, speed=job.speed)
+                    if not self._emit(job, ("pcm", float_to_int16(audio).tobytes())):
+                        break
+                else:
+                    self._emit(job, ("end", None))
+            except (Exception, SystemExit) as e:
+                # Engines call sys.exit() when a backend or weights are missing; that must not end the worker
+                message = f"{job.engine} exited (code {e.code})" if isinstance(e, SystemExit) else str(e)
+                self._emit(job, ("error", message))
+
+    def next_item(self, job: SynthesisJob, timeout: float = None):
+        """Wait for the job's next item; an error item if the worker died or nothing came within timeout"""
+        waited = 0.0
+        while True:
+            try:
+                return job.output.get(timeout=1)
+            except queue.Empty:
+                waited += 1
+            if not self._worker.is_alive():
+                return "error", "Synthesis worker stopped"
+            if timeout is not None and waited >= timeout:
+                job.cancelled.set()
+                return "error", f"No audio within {timeout}s"
+
+
+class TTSRequestHandler(BaseHTTPRequestHandler):
+    """POST /synthesize streams back a WAV; GET /health reports loaded engines"""
+
+    service = None  # set by serve()
+    # HTTP/1.1 for chunked transfer: a stream that ends without its final chunk is visibly incomplete
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {
+            "engines": [f"{name}:{language or '*'}" for name, language in self.service.engines],
+            "queued": self.service.jobs.qsize(),
+        })
+
+    def do_POST(self):
+        if self.path != "/synthesize":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            engine = request.get("engine", "kokoro")
+            if engine not in public_engines():
+                raise ValueError(f"unknown engine {engine!r}")
+            job = SynthesisJob(
+                text=request["text"],
+                engine=engine,
+                language=request.get("language", "en"),
+                voice=request.get("voice", "af_heart" if engine == "kokoro" else "default"),
+                speed=float(request.get("speed", 1.0)),
+            )
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+            return
+
+        self.service.submit(job)
+        # Queued jobs ahead of this one may take long, so only a dead worker ends this wait
+        kind, value = self.service.next_item(job)
+        if kind == "error":
+            self._send_json(500, {"error": value})
+            return
+
+        # Length is unknown until synthesis ends, so stream chunked with a placeholder WAV header
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self._write_chunk(wav_header(value))
+            while True:
+                kind, value = self.service.next_item(job, timeout=CHUNK_TIMEOUT)
+                if kind != "pcm":
+                    break
+                self._write_chunk(value)
+            # Only a finished job gets the terminating chunk; after an error the client sees a truncated stream
+            if kind == "end":
+                self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            job.cancelled.set()
+
+    def _write_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TTSClient:
+    """Thin client for a running tts_server.py, usable wherever an engine's generate_audio is"""
+
+    def __init__(self, url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}",
+                 engine: str = "kokoro", language: str = "en"):
+        self.url = url.rstrip("/")
+        self.name = engine
+        self.language = language
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0):
+        """
+        Synthesize text on the server and save the streamed audio to output_path
+
+        Args:
+            text: Text to convert to speech
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice to use
+            speed: Speech speed multiplier
+        """
+        payload = json.dumps({
+            "text": text, "engine": self.name, "language": self.language,
+            "voice": voice, "speed": speed,
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.url}/synthesize", data=payload, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            sample_rate, channels = parse_wav_header(response.read(44))
+            try:
+                with open_audio_writer(output_path, sample_rate, channels) as writer:
+                    while True:
+                        block = response.read(64 * 1024)
+                        if not block:
+                            break
+                        writer.write_pcm(block)
+            except (http.client.IncompleteRead, ConnectionError) as e:
+                # The server ends the chunked stream without its final chunk when synthesis fails
+                os.remove(output_path)
+                raise RuntimeError(f"TTS server stopped before the audio was complete ({e!r})") from None
+        print(f"✓ Audio saved to {output_path}")
+
+    def health(self) -> dict:
+        with urllib.request.urlopen(f"{self.url}/health") as response:
+            return json.loads(response.read())
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, preload=()):
+    """Run the TTS server until interrupted"""
+    print("🔧 Loading engines...")
+    TTSRequestHandler.service = TTSService(preload)
+    server = ThreadingHTTPServer((host, port), TTSRequestHandler)
+    print(f"✓ TTS server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident local TTS server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--preload", nargs="*", default=["kokoro"],
+                        help="Engines to load at startup, e.g. kokoro coqui:en coqui:de")
+    args = parser.parse_args()
+
+    preload = []
+    for spec in args.preload:
+        engine_name, _, language = spec.partition(":")
+        preload.append((engine_name, language or "en"))
+    serve(args.host, args.port, preload)
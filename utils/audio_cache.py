@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Content-addressed per-paragraph audio cache
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from utils.audio_encoder import open_audio_writer
+from utils.text_chunking import segment_options, split_into_chunks
+
+
+def normalize_paragraph(text: str) -> str:
+    """Collapse whitespace so reflowed but otherwise identical text hits the cache"""
+    return " ".join(text.split())
+
+
+class CacheStats:
+    """Hit/miss counters for one conversion"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.seconds_synthesized = 0.0
+
+    def report(self):
+        """Print a short summary of cache effectiveness"""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0.0
+        print("\nAudio Cache:")
+        print("-"*40)
+        print(f"{'Hits':<20} | {self.hits:>12,}")
+        print(f"{'Misses':<20} | {self.misses:>12,}")
+        print(f"{'Hit rate':<20} | {hit_rate:>11.1f}%")
+        print(f"{'Synthesis time (s)':<20} | {self.seconds_synthesized:>12.1f}")
+        print(f"{'Time saved (s)':<20} | {self.seconds_saved:>12.1f}")
+
+
+class AudioCache:
+    """On-disk PCM cache keyed by paragraph text and synthesis settings, with LRU eviction"""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str = "./temp/audio_cache", max_bytes: int = 2 * 1024**3):
+        """
+        Open (or create) an audio cache
+
+        Args:
+            cache_dir: Directory holding the PCM entries and their index
+            max_bytes: Size limit; least recently used entries are evicted beyond it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        # key -> {"bytes": int, "seconds": synthesis time, "used": last access}
+        self._index = self._load_index()
+        self._total_bytes = sum(entry["bytes"] for entry in self._index.values())
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose PCM file went missing
+        return {key: entry for key, entry in index.items() if os.path.exists(self._entry_path(key))}
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pcm")
+
+    @staticmethod
+    def make_key(text: str, engine_name: str, model_id: str, voice: str,
+                 speed: float, sample_rate: int) -> str:
+        """Build the content hash for a paragraph and its synthesis settings"""
+        payload = json.dumps(
+            [normalize_paragraph(text), engine_name, model_id, voice, float(speed), int(sample_rate)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for(self, engine, text: str, voice: str, speed: float) -> str:
+        """Build the cache key for a paragraph synthesized by a CoquiTTS/KokoroTTS engine"""
+        return self.make_key(text, engine.name, engine.model_id, voice, speed, engine.sr)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def touch(self, key: str):
+        """Mark an entry as recently used without reading it"""
+        if key in self._index:
+            self._index[key]["used"] = time.time()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PCM bytes for a key, or None on a miss"""
+        entry = self._index.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                pcm = f.read()
+        except OSError:
+            self._forget(key)
+            self.stats.misses += 1
+            return None
+        entry["used"] = time.time()
+        self.stats.hits += 1
+        self.stats.seconds_saved += entry["seconds"]
+        return pcm
+
+    def put(self, key: str, pcm: bytes, seconds: float = 0.0):
+        """Store PCM bytes for a key along with the time it took to synthesize"""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pcm)
+        os.replace(tmp_path, path)
+
+        if key in self._index:
+            self._total_bytes -= self._index[key]["bytes"]
+        self._index[key] = {"bytes": len(pcm), "seconds": seconds, "used": time.time()}
+        self._total_bytes += len(pcm)
+        self.stats.seconds_synthesized += seconds
+        self._evict()
+
+    def _forget(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry["bytes"]
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]["used"]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._forget(key)
+
+    def flush(self):
+        """Persist the index to disk"""
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+
+class CachedSynthesizer:
+    """Synthesize only new or changed paragraphs and splice cached PCM in for the rest"""
+
+    def __init__(self, engine, cache: AudioCache, parallel=None, max_chunk_chars: int = 1000):
+        """
+        Initialize the cached synthesizer
+
+        Args:
+            engine: Loaded CoquiTTS/KokoroTTS instance (identifies model, voice and sample rate)
+            cache: AudioCache to read from and write to
+            parallel: Optional ParallelSynthesizer used to synthesize the misses
+            max_chunk_chars: Upper bound on characters per chunk (the engine may prefer shorter ones, see segment_options)
+        """
+        self.engine = engine
+        self.cache = cache
+        self.parallel = parallel
+        self.max_chunk_chars = max_chunk_chars
+
+    def iter_pcm(self, chunks: List[str], voice: str, speed: float) -> Iterator[Tuple[int, bytes, float]]:
+        """Yield (sample rate, PCM bytes, seconds) per chunk in order, synthesizing only cache misses"""
+        from models.parallel_tts import iter_pcm
+
+        keys = [self.cache.key_for(self.engine, chunk, voice, speed) for chunk in chunks]
+        # Touch hits first so writing new entries doesn't evict audio we are about to reuse
+        for key in keys:
+            self.cache.touch(key)
+        # Synthesize each missing paragraph once, even if it repeats in the document
+        miss_indices, seen = set(), set()
+        for i, key in enumerate(keys):
+            if key not in self.cache and key not in seen:
+                miss_indices.add(i)
+                seen.add(key)
+        missing = [chunks[i] for i in sorted(miss_indices)]
+
+        if self.parallel is not None and missing:
+            synthesized = self.parallel.iter_pcm(missing, voice, speed)
+        else:
+            synthesized = iter_pcm(self.engine, missing, voice, speed)
+
+        try:
+            for i, (chunk, key) in enumerate(zip(chunks, keys)):
+                seconds = 0.0
+                if i in miss_indices:
+                    self.cache.stats.misses += 1
+                    _, pcm, seconds = next(synthesized)
+                    self.cache.put(key, pcm, seconds)
+                else:
+                    pcm = self.cache.get(key)
+                    if pcm is None:  # evicted since the lookup
+                        _, pcm, seconds = next(iter_pcm(self.engine, [chunk], voice, speed))
+                        self.cache.put(key, pcm, seconds)
+                yield self.engine.sr, pcm, seconds
+        finally:
+            self.cache.flush()
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0,
+                       on_chunk: Optional[Callable] = None):
+        """
+        Generate audio for text, reusing cached paragraphs, and save it to output_path
+
+        Args:
+            text: Text to convert to speech
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice to use
+            speed: Speech speed multiplier
+            on_chunk: Optional callback(chunks_done, chunks_total, characters, seconds) per finished chunk
+        """
+        chunks = split_into_chunks(text, self.max_chunk_chars, **segment_options(self.engine))
+        hits_before = self.cache.stats.hits
+        with open_audio_writer(output_path, self.engine.sr) as writer:
+            for i, (_, pcm, seconds) in enumerate(self.iter_pcm(chunks, voice, speed)):
+                writer.write_pcm(pcm)
+                if on_chunk is not None:
+                    on_chunk(i + 1, len(chunks), len(chunks[i]), seconds)
+        reused = self.cache.stats.hits - hits_before
+        print(f"✓ Audio saved to {output_path} ({reused}/{len(chunks)} chunks reused)")
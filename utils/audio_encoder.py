@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# Output encoders chosen by file extension; compressed formats encode on a background thread
+import os
+import queue
+import threading
+import wave
+import numpy as np
+
+from utils.instrumentation import span
+from utils.wav_writer import WavWriter
+
+# Extension -> (libsndfile format, subtype); WAV is written by WavWriter
+FORMATS = {
+    ".wav": ("WAV", "PCM_16"),
+    ".flac": ("FLAC", "PCM_16"),
+    ".ogg": ("OGG", "VORBIS"),
+    ".opus": ("OGG", "OPUS"),
+}
+# Sample rates Opus accepts; other rates are resampled to OPUS_SAMPLE_RATE
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+OPUS_SAMPLE_RATE = 48000
+# Chunks queued for the encoder thread before write() blocks (bounds memory)
+MAX_PENDING_CHUNKS = 16
+
+
+def output_format(output_path: str) -> str:
+    """Return the output extension (e.g. ".flac"), raising for unsupported ones"""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported output format '{extension}' "
+                         f"(supported: {', '.join(sorted(FORMATS))})")
+    return extension
+
+
+class SoundFileWriter:
+    """Incremental FLAC/OGG writer via soundfile, with the WavWriter interface"""
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int = 1):
+        """
+        Open a compressed audio file for incremental writing
+
+        Args:
+            output_path: Path of the file to create; the extension selects the format
+            sample_rate: Sample rate of the audio passed to write()/write_pcm()
+            channels: Number of interleaved channels (default: 1)
+        """
+        import soundfile as sf
+
+        fmt, subtype = FORMATS[output_format(output_path)]
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_written = 0
+        self.file_rate = sample_rate
+        self._resampler = None
+        if subtype == "OPUS" and sample_rate not in OPUS_RATES:
+            from utils.resampler import StreamingResampler
+            self.file_rate = OPUS_SAMPLE_RATE
+            # One resampler for the whole file, so chunk boundaries do not become filter edges
+            self._resampler = StreamingResampler(sample_rate, self.file_rate, channels)
+        self._file = sf.SoundFile(output_path, "w", samplerate=self.file_rate,
+                                  channels=channels, format=fmt, subtype=subtype)
+
+    def write(self, audio):
+        """Encode a float audio chunk and append it to the file"""
+        audio = np.asarray(audio, dtype=np.float32)
+        self.frames_written += audio.size // self.channels
+        with span("encoding", format=self._file.format):
+            if self._resampler is not None:
+                audio = self._resampler.process(audio)
+            self._file.write(audio.reshape(-1, self.channels) if self.channels > 1 else audio)
+
+    def write_pcm(self, pcm: bytes):
+        """Encode raw 16-bit little-endian PCM bytes and append them to the file"""
+        samples = np.frombuffer(pcm, dtype="<i2")
+        if self._resampler is not None:
+            self.write(samples.astype(np.float32) / 32767)
+            return
+        self.frames_written += samples.size // self.channels
+        with span("encoding", format=self._file.format):
+            self._file.write(samples.reshape(-1, self.channels) if self.channels > 1 else samples)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio written so far in seconds"""
+        return self.frames_written / self.sample_rate
+
+    def close(self):
+        """Flush the encoder and close the file"""
+        if self._file is not None:
+            if self._resampler is not None:
+                tail = self._resampler.flush()
+                self._file.write(tail.reshape(-1, self.channels) if self.channels > 1 else tail)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BackgroundEncoder:
+    """Run a writer on its own thread so encoding overlaps inference"""
+
+    def __init__(self, writer, max_pending: int = MAX_PENDING_CHUNKS):
+        """
+        Args:
+            writer: SoundFileWriter (or any writer with write/write_pcm/close)
+            max_pending: Chunks queued before write() blocks
+        """
+        self.writer = writer
+        self.output_path = writer.output_path
+        self.sample_rate = writer.sample_rate
+        self.channels = writer.channels
+        self.frames_written = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="encoder", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if self._error is not None:
+                continue  # drain so producers never block on a dead encoder
+            method, data = item
+            try:
+                getattr(self.writer, method)(data)
+            except Exception as e:
+                self._error = e
+
+    def _put(self, method: str, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((method, data))
+
+    def write(self, audio):
+        """Queue a float audio chunk for encoding"""
+        audio = np.asarray(audio, dtype=np.float32)
+        self.frames_written += audio.size // self.channels
+        self._put("write", audio)
+
+    def write_pcm(self, pcm: bytes):
+        """Queue raw 16-bit PCM bytes for encoding"""
+        self.frames_written += len(pcm) // (2 * self.channels)
+        self._put("write_pcm", pcm)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio queued so far in seconds"""
+        return self.frames_written / self.sample_rate
+
+    def close(self):
+        """Wait for queued chunks to be encoded and close the file"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.writer.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_audio_writer(output_path: str, sample_rate: int, channels: int = 1):
+    """
+    Open an incremental writer for output_path, choosing the format from its extension
+
+    Args:
+        output_path: ".wav", ".flac", ".ogg" (Vorbis) or ".opus" (Opus in OGG)
+        sample_rate: Sample rate of the audio in Hz
+        channels: Number of interleaved channels (default: 1)
+    """
+    if output_format(output_path) == ".wav":
+        return WavWriter(output_path, sample_rate, channels)
+    return BackgroundEncoder(SoundFileWriter(output_path, sample_rate, channels))
+
+
+def audio_duration(path: str) -> float:
+    """Return the duration of an audio file written by open_audio_writer in seconds"""
+    if output_format(path) == ".wav":
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    import soundfile as sf
+    return sf.info(path).duration
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# Comparisons between renditions of the same text (TTS output is stochastic, so not sample-exact)
+import numpy as np
+
+
+def log_spectrum(audio: np.ndarray, n_fft: int = 1024, hop: int = 256) -> np.ndarray:
+    """Log-magnitude STFT frames of a mono float signal"""
+    frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft)[::hop] * np.hanning(n_fft)
+    return np.log(np.abs(np.fft.rfft(frames, axis=-1)) + 1e-5)
+
+
+def spectral_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean absolute log-magnitude difference over the common length of two signals"""
+    n = min(len(a), len(b))
+    if n < 1024:
+        return 0.0
+    return float(np.mean(np.abs(log_spectrum(a[:n]) - log_spectrum(b[:n]))))
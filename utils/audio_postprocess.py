@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Per-chunk silence trimming, pause capping and loudness normalization with a peak limiter
+import time
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.audio_encoder import open_audio_writer
+from utils.instrumentation import span
+from utils.staged_pipeline import PIPELINE_QUEUE_SIZE, prefetch, stage
+from utils.text_chunking import segment_options, split_into_chunks
+from utils.wav_writer import float_to_int16
+
+FRAME_SECONDS = 0.01  # Resolution of the silence detector
+LIMITER_BLOCK_SECONDS = 0.001  # Resolution of the limiter's gain envelope
+LIMITER_HOLD_BLOCKS = 8  # Gain reductions start this many blocks before a peak and are held as long after it
+
+
+def _db(value: np.ndarray) -> np.ndarray:
+    return 20 * np.log10(np.maximum(value, 1e-10))
+
+
+class PostProcessStats:
+    """Audio removed or changed by the post-processor during one conversion"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.samples_in = 0
+        self.samples_out = 0
+        self.limited_samples = 0
+        self.sample_rate = 0
+        self.seconds = 0.0
+
+    def report(self):
+        """Print how much dead air was removed"""
+        if not self.chunks:
+            return
+        removed = self.samples_in - self.samples_out
+        share = removed / self.samples_in * 100 if self.samples_in else 0.0
+        print("\nAudio Post-Processing:")
+        print("-"*40)
+        print(f"{'Chunks':<20} | {self.chunks:>12,}")
+        print(f"{'Removed (s)':<20} | {removed / self.sample_rate:>12.1f}")
+        print(f"{'Removed (share)':<20} | {share:>11.1f}%")
+        print(f"{'Removed (bytes)':<20} | {removed * 2:>12,}")
+        print(f"{'Limited samples':<20} | {self.limited_samples:>12,}")
+        print(f"{'Processing time (s)':<20} | {self.seconds:>12.2f}")
+
+
+class AudioPostProcessor:
+    """Trim silence, cap pauses and normalize loudness of one chunk at a time (memory grows with the chunk only)"""
+
+    def __init__(self, silence_db: float = -45.0, edge_seconds: float = 0.1, max_pause_seconds: float = 0.6,
+                 target_db: Optional[float] = -20.0, max_gain_db: float = 12.0, ceiling_db: float = -1.0):
+        """
+        Args:
+            silence_db: Frames quieter than this (dBFS RMS) count as silence
+            edge_seconds: Silence kept at the start and end of each chunk
+            max_pause_seconds: Longer pauses inside a chunk are shortened to this
+            target_db: RMS level of the non-silent frames after normalization (None to skip normalization)
+            max_gain_db: Largest boost or cut applied by normalization
+            ceiling_db: Peak level the limiter holds the output to (dBFS)
+        """
+        self.silence_db = silence_db
+        self.edge_seconds = edge_seconds
+        self.max_pause_seconds = max_pause_seconds
+        self.target_db = target_db
+        self.max_gain_db = max_gain_db
+        self.ceiling = 10 ** (ceiling_db / 20)
+        self.stats = PostProcessStats()
+
+    @property
+    def settings_id(self) -> str:
+        """Identifies the settings, so audio processed differently is never mixed"""
+        return (f"post:{self.silence_db}:{self.edge_seconds}:{self.max_pause_seconds}:"
+                f"{self.target_db}:{self.max_gain_db}:{self.ceiling:.6f}")
+
+    def _keep_mask(self, frame_db: np.ndarray) -> np.ndarray:
+        """Frames to keep: speech, the edge margins and the first/last half of every capped pause"""
+        silent = frame_db < self.silence_db
+        keep = np.ones(len(silent), dtype=bool)
+        if silent.all():
+            keep[:] = False
+            return keep
+        edge = int(round(self.edge_seconds / FRAME_SECONDS))
+        voiced = np.flatnonzero(~silent)
+        keep[:max(voiced[0] - edge, 0)] = False
+        keep[voiced[-1] + 1 + edge:] = False
+
+        # Runs of silence between the first and last voiced frame
+        inner = silent[voiced[0]:voiced[-1] + 1].astype(np.int8)
+        edges = np.diff(np.concatenate(([0], inner, [0])))
+        starts = np.flatnonzero(edges == 1) + voiced[0]
+        ends = np.flatnonzero(edges == -1) + voiced[0]
+        half = max(int(round(self.max_pause_seconds / FRAME_SECONDS)) // 2, 1)
+        for start, end in zip(starts, ends):
+            if end - start > 2 * half:
+                keep[start + half:end - half] = False
+        return keep
+
+    def _limit(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Look-ahead peak limiter: a smoothed gain envelope that never lets a sample exceed the ceiling"""
+        peaks = np.abs(audio)
+        if peaks.max(initial=0.0) <= self.ceiling:
+            return audio
+        block = max(int(sample_rate * LIMITER_BLOCK_SECONDS), 1)
+        padded = np.pad(peaks, (0, -len(peaks) % block))
+        gain = np.minimum(1.0, self.ceiling / np.maximum(padded.reshape(-1, block).max(axis=1), 1e-10))
+        # Hold every reduction for LIMITER_HOLD_BLOCKS blocks on both sides...
+        windows = np.lib.stride_tricks.sliding_window_view(
+            np.pad(gain, LIMITER_HOLD_BLOCKS, constant_values=1.0), 2 * LIMITER_HOLD_BLOCKS + 1)
+        envelope = np.repeat(windows.min(axis=1), block)[:len(audio)]
+        # ...then smooth it with a moving average short enough to stay below every sample's required gain
+        width = max((LIMITER_HOLD_BLOCKS - 1) * block, 1)
+        cumsum = np.cumsum(np.pad(envelope, (width + 1, width), mode="edge"), dtype=np.float64)
+        smoothed = (cumsum[2 * width + 1:] - cumsum[:-2 * width - 1]) / (2 * width + 1)
+        self.stats.limited_samples += int(np.count_nonzero(smoothed < 0.999))
+        return audio * smoothed.astype(np.float32)
+
+    def process(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Return the processed chunk
+
+        Args:
+            audio: Float samples in [-1, 1] (mono)
+            sample_rate: Sample rate in Hz
+        """
+        start = time.perf_counter()
+        audio = np.asarray(audio, dtype=np.float32)
+        frame = max(int(sample_rate * FRAME_SECONDS), 1)
+        padded = np.pad(audio, (0, -len(audio) % frame))
+        frame_db = _db(np.sqrt(np.mean(np.square(padded.reshape(-1, frame)), axis=1)))
+
+        keep = self._keep_mask(frame_db)
+        output = padded.reshape(-1, frame)[keep].reshape(-1)
+        # The padded tail of the last frame is not part of the audio
+        if len(keep) and keep[-1] and len(padded) > len(audio):
+            output = output[:len(output) - (len(padded) - len(audio))]
+
+        if self.target_db is not None and keep.any():
+            voiced = frame_db[keep] >= self.silence_db
+            if voiced.any():
+                level = 10 * np.log10(np.mean(10 ** (frame_db[keep][voiced] / 10)))
+                gain_db = np.clip(self.target_db - level, -self.max_gain_db, self.max_gain_db)
+                output = output * np.float32(10 ** (gain_db / 20))
+        output = self._limit(output, sample_rate)
+
+        self.stats.chunks += 1
+        self.stats.sample_rate = sample_rate
+        self.stats.samples_in += len(audio)
+        self.stats.samples_out += len(output)
+        self.stats.seconds += time.perf_counter() - start
+        return output
+
+    def process_pcm(self, pcm: bytes, sample_rate: int) -> bytes:
+        """Process 16-bit PCM bytes"""
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32767
+        return float_to_int16(self.process(audio, sample_rate)).tobytes()
+
+
+class PostProcessingSynthesizer:
+    """Chunk layer that runs every synthesized or cached chunk through an AudioPostProcessor before it is written"""
+
+    def __init__(self, engine, processor: AudioPostProcessor, inner=None, max_chunk_chars: int = 1000,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        """
+        Args:
+            engine: Loaded CoquiTTS/KokoroTTS instance (identifies the sample rate)
+            processor: Post-processor applied to each chunk
+            inner: Optional CachedSynthesizer/ParallelSynthesizer that produces chunk PCM
+            max_chunk_chars: Upper bound on characters per chunk (the engine may prefer shorter ones, see segment_options)
+            queue_size: Chunks buffered between synthesis and post-processing threads (0 = one thread)
+        """
+        self.engine = engine
+        self.processor = processor
+        self.inner = inner
+        self.max_chunk_chars = max_chunk_chars
+        self.queue_size = queue_size
+
+    @property
+    def settings_id(self) -> str:
+        return self.processor.settings_id
+
+    def iter_pcm(self, chunks: List[str], voice: str, speed: float) -> Iterator[Tuple[int, bytes, float]]:
+        """Yield (sample rate, processed PCM bytes, seconds) per chunk in order"""
+        from models.parallel_tts import iter_pcm
+
+        if self.inner is not None:
+            produced = self.inner.iter_pcm(chunks, voice, speed)
+        else:
+            produced = iter_pcm(self.engine, chunks, voice, speed)
+        def process(item):
+            sr, pcm, seconds = item
+            with span("postprocess"):
+                return sr, self.processor.process_pcm(pcm, sr), seconds
+
+        # Synthesis of the next chunk overlaps post-processing of this one
+        produced = prefetch(produced, self.queue_size, name="synthesis")
+        yield from stage(process, produced, self.queue_size, name="postprocess")
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0,
+                       on_chunk: Optional[Callable] = None):
+        """
+        Generate audio for text chunk by chunk, post-processed, and save it to output_path
+
+        Args:
+            text: Text to convert to speech
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice to use
+            speed: Speech speed multiplier
+            on_chunk: Optional callback(chunks_done, chunks_total, characters, seconds) per finished chunk
+        """
+        chunks = split_into_chunks(text, self.max_chunk_chars, **segment_options(self.engine))
+        with open_audio_writer(output_path, self.engine.sr) as writer:
+            for i, (_, pcm, seconds) in enumerate(self.iter_pcm(chunks, voice, speed)):
+                writer.write_pcm(pcm)
+                if on_chunk is not None:
+                    on_chunk(i + 1, len(chunks), len(chunks[i]), seconds)
+        print(f"✓ Audio saved to {output_path}")
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Listen-while-generating: stream audio segments to stdout, a pipe, a socket or a file
+import os
+import socket
+import sys
+import time
+
+from utils.wav_writer import float_to_int16, wav_header
+
+FORMATS = ("wav", "raw")
+# The process's real stdout, captured at import so contextlib.redirect_stdout cannot send audio elsewhere
+STDOUT = sys.__stdout__.buffer if sys.__stdout__ is not None else None
+
+
+class _SocketSink:
+    """File-like wrapper that closes both the socket and its stream"""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._stream = sock.makefile("wb")
+
+    def write(self, data: bytes):
+        self._stream.write(data)
+
+    def flush(self):
+        self._stream.flush()
+
+    def seekable(self) -> bool:
+        return False
+
+    def close(self):
+        self._stream.close()
+        self._sock.close()
+
+
+def open_sink(target: str):
+    """
+    Open a binary sink for streamed audio
+
+    Args:
+        target: "-" for stdout, "tcp://host:port", "unix:///path/to.sock", or a path
+                (a regular file or a named pipe created with mkfifo)
+    """
+    if target == "-":
+        return STDOUT
+    if target.startswith("tcp://"):
+        host, _, port = target[len("tcp://"):].rpartition(":")
+        return _SocketSink(socket.create_connection((host, int(port))))
+    if target.startswith("unix://"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target[len("unix://"):])
+        return _SocketSink(sock)
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    return open(target, "wb")
+
+
+class AudioStreamer:
+    """Write audio segments to a sink as soon as they are generated"""
+
+    def __init__(self, sink, sample_rate: int, fmt: str = "wav"):
+        """
+        Start a stream
+
+        Args:
+            sink: Binary file-like object (see open_sink)
+            sample_rate: Sample rate of the segments in Hz
+            fmt: "wav" (placeholder header, patched if the sink is seekable) or "raw" (s16le PCM)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown stream format: {fmt}. Use 'wav' or 'raw'")
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.fmt = fmt
+        self.bytes_written = 0
+        self.started = time.perf_counter()
+        self.time_to_first_audio = None
+        if fmt == "wav":
+            self.sink.write(wav_header(sample_rate))
+
+    def write(self, audio):
+        """Convert a float segment to 16-bit PCM and push it out immediately"""
+        pcm = float_to_int16(audio).tobytes()
+        if not pcm:
+            return
+        self.sink.write(pcm)
+        self.sink.flush()
+        self.bytes_written += len(pcm)
+        if self.time_to_first_audio is None:
+            self.time_to_first_audio = time.perf_counter() - self.started
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio streamed so far"""
+        return self.bytes_written / 2 / self.sample_rate
+
+    def close(self):
+        """Finish the stream; file sinks get real sizes patched into the WAV header"""
+        if self.fmt == "wav" and self.sink.seekable():
+            self.sink.seek(0)
+            self.sink.write(wav_header(self.sample_rate, data_size=self.bytes_written))
+        self.sink.flush()
+        if self.sink is not STDOUT:
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def stream_audio(engine, text: str, target, voice: str = "default",
+                 speed: float = 1.0, fmt: str = "wav") -> AudioStreamer:
+    """
+    Stream speech for text to a target while it is being synthesized
+
+    Args:
+        engine: CoquiTTS/KokoroTTS instance (uses its iter_audio generator)
+        text: Text to convert to speech
+        target: Sink specification (see open_sink) or an already opened sink
+        voice: Voice to use
+        speed: Speech speed multiplier
+        fmt: "wav" or "raw"
+    """
+    engine.load()  # settle the sample rate before the header goes out
+    sink = open_sink(target) if isinstance(target, str) else target
+    with AudioStreamer(sink, engine.sr, fmt) as streamer:
+        for audio in engine.iter_audio(text, voice=voice, speed=speed):
+            streamer.write(audio)
+    return streamer
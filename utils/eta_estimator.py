@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Processing-time estimates calibrated on the measured throughput of earlier runs
+import json
+import math
+import os
+import platform
+import time
+from typing import List
+
+HISTORY_FILE = "./temp/run_history.jsonl"
+# Used until a configuration has history of its own
+DEFAULT_SECONDS_PER_CHAR = 0.014
+DEFAULT_RELATIVE_SD = 0.5
+# Relative spread assumed when there is only a single matching run
+SINGLE_RUN_RELATIVE_SD = 0.3
+# z-score of the reported interval (90%)
+Z_SCORE = 1.645
+# Live updates treat the history-based rate as worth this many observed characters
+PRIOR_CHARACTERS = 2000
+
+
+def hardware_id() -> str:
+    """Short description of the CPU this process runs on"""
+    model = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    model = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return f"{model} x{os.cpu_count() or 1}"
+
+
+class Estimate:
+    """Predicted seconds with an interval and what the prediction is based on"""
+
+    def __init__(self, seconds: float, low: float, high: float, runs: int, basis: str):
+        self.seconds = seconds
+        self.low = low
+        self.high = high
+        self.runs = runs
+        self.basis = basis
+
+
+class RunHistory:
+    """Append-only JSONL store of measured synthesis throughput"""
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+
+    def append(self, engine: str, model: str, voice: str, workers: int,
+               characters: int, seconds: float, speed: float = 1.0):
+        """Record one run (only characters that were actually synthesized)"""
+        if characters <= 0 or seconds <= 0:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        record = {
+            "engine": engine, "model": model, "voice": voice, "hardware": hardware_id(),
+            "workers": workers, "speed": speed, "characters": characters,
+            "seconds": round(seconds, 3), "timestamp": time.time(),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def records(self) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+
+class ETAEstimator:
+    """Fit seconds per character for an (engine, model, voice, hardware, workers, speed) configuration"""
+
+    # Progressively looser matches, used when the exact configuration has no history
+    MATCH_LEVELS = [
+        ("engine", "model", "voice", "hardware", "workers", "speed"),
+        ("engine", "model", "hardware", "workers", "speed"),
+        ("engine", "model", "hardware", "speed"),
+        ("engine", "model", "speed"),
+        ("engine", "model"),
+    ]
+
+    def __init__(self, history: RunHistory, engine: str, model: str, voice: str, workers: int = 1,
+                 speed: float = 1.0):
+        self.history = history
+        self.config = {
+            "engine": engine, "model": model, "voice": voice,
+            "hardware": hardware_id(), "workers": workers, "speed": speed,
+        }
+
+    def fit(self):
+        """Return (seconds per char, standard deviation per char, runs, basis)"""
+        records = self.history.records()
+        for fields in self.MATCH_LEVELS:
+            # Runs recorded before speed was stored were at 1.0x
+            matching = [r for r in records
+                        if all(r.get(f, 1.0 if f == "speed" else None) == self.config[f] for f in fields)]
+            if matching:
+                return self._fit_records(matching) + (", ".join(fields),)
+        return DEFAULT_SECONDS_PER_CHAR, DEFAULT_SECONDS_PER_CHAR * DEFAULT_RELATIVE_SD, 0, "default"
+
+    @staticmethod
+    def _fit_records(records: List[dict]):
+        """Character-weighted mean rate and its prediction spread"""
+        weights = [r["characters"] for r in records]
+        rates = [r["seconds"] / r["characters"] for r in records]
+        total = sum(weights)
+        mean = sum(r["seconds"] for r in records) / total
+        if len(records) == 1:
+            return mean, mean * SINGLE_RUN_RELATIVE_SD, 1
+        variance = sum(w * (rate - mean) ** 2 for w, rate in zip(weights, rates)) / total
+        effective_n = total ** 2 / sum(w * w for w in weights)
+        # Spread of a new run = run-to-run variance plus uncertainty of the mean
+        sd = math.sqrt(variance + variance / effective_n)
+        return mean, sd, len(records)
+
+    def estimate(self, characters: int) -> Estimate:
+        """Predict synthesis seconds for a document of this many characters"""
+        rate, sd, runs, basis = self.fit()
+        seconds = rate * characters
+        margin = Z_SCORE * sd * characters
+        return Estimate(seconds, max(0.0, seconds - margin), seconds + margin, runs, basis)
+
+
+class LiveETA:
+    """Refine the estimate while synthesis runs by blending history with observed throughput"""
+
+    def __init__(self, estimator: ETAEstimator, total_characters: int):
+        self.rate, self.sd, _, _ = estimator.fit()
+        self.total_characters = total_characters
+        self.done_characters = 0
+        self.synthesized_characters = 0
+        self.synthesis_seconds = 0.0
+        self.chunks_done = 0
+        self.chunks_total = 0
+        self.started = time.time()
+
+    def update(self, chunks_done: int, chunks_total: int, characters: int, seconds: float):
+        """Callback for each finished chunk; seconds is 0 for chunks reused from a cache"""
+        self.chunks_done = chunks_done
+        self.chunks_total = chunks_total
+        self.done_characters += characters
+        if seconds > 0:
+            self.synthesized_characters += characters
+            self.synthesis_seconds += seconds
+
+    def current_rate(self) -> float:
+        """Seconds per character, weighting observed wall-clock throughput by characters seen"""
+        if not self.synthesized_characters:
+            return self.rate
+        observed = (time.time() - self.started) / self.synthesized_characters
+        weight = self.synthesized_characters / (self.synthesized_characters + PRIOR_CHARACTERS)
+        return weight * observed + (1 - weight) * self.rate
+
+    def chars_per_second(self) -> float:
+        """Observed throughput over the characters synthesized so far"""
+        elapsed = time.time() - self.started
+        return self.synthesized_characters / elapsed if elapsed > 0 else 0.0
+
+    def remaining(self) -> Estimate:
+        remaining_chars = max(0, self.total_characters - self.done_characters)
+        rate = self.current_rate()
+        seconds = rate * remaining_chars
+        # Shrink the history spread as more of the document has been observed
+        weight = self.synthesized_characters / (self.synthesized_characters + PRIOR_CHARACTERS)
+        margin = Z_SCORE * self.sd * (1 - weight) * remaining_chars
+        return Estimate(seconds, max(0.0, seconds - margin), seconds + margin, 0, "live")
+
+    def status(self) -> str:
+        """One-line progress text for the progress reporter"""
+        if not self.chunks_total:
+            return ""
+        percent = self.done_characters / self.total_characters * 100 if self.total_characters else 100.0
+        eta = self.remaining()
+        minutes, seconds = divmod(int(eta.seconds), 60)
+        return (f"{self.chunks_done}/{self.chunks_total} chunks ({percent:.0f}%), "
+                f"{self.chars_per_second():.0f} chars/s, ETA {minutes:02d}:{seconds:02d}")
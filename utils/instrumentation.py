@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Timing spans with Chrome-trace export, and a live progress line for long conversions
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+# Shared no-op context returned by span() while tracing is disabled
+_NULL_SPAN = nullcontext()
+_tracer = None
+
+
+class _Span:
+    """Context manager that records one complete event on exit"""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer.events.append((self.name, self.start, end, threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """Collect nested timing spans from every thread of this process"""
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        # (name, start ns, end ns, thread id, args); list.append is atomic under the GIL
+        self.events = []
+
+    def span(self, name: str, args: dict) -> _Span:
+        return _Span(self, name, args)
+
+    def totals(self) -> Dict[str, float]:
+        """Total seconds per span name, in order of first appearance"""
+        totals = defaultdict(float)
+        for name, start, end, _, _ in sorted(self.events, key=lambda e: e[1]):
+            totals[name] += (end - start) / 1e9
+        return dict(totals)
+
+    def report(self):
+        """Print where the time went, per span name"""
+        totals = self.totals()
+        if not totals:
+            return
+        print("\nTime per stage:")
+        print("-"*40)
+        for name, seconds in totals.items():
+            print(f"{name:<20} | {seconds:>10.3f} s")
+        print("-"*40)
+
+    def export_chrome_trace(self, path: str):
+        """Write the spans as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)"""
+        threads = {}
+        trace = []
+        for name, start, end, tid, args in self.events:
+            threads.setdefault(tid, len(threads))
+            trace.append({
+                "name": name, "ph": "X", "pid": self.pid, "tid": threads[tid],
+                "ts": (start - self.origin) / 1000, "dur": (end - start) / 1000, "args": args,
+            })
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for tid, index in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": index,
+                          "args": {"name": names.get(tid, f"thread-{index}")}})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        print(f"✓ Trace saved to {path}")
+
+
+def enable_tracing() -> Tracer:
+    """Start collecting spans in this process (returns the active tracer)"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop collecting spans and return the tracer that was active, if any"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **args):
+    """
+    Time a block as a named span; a shared no-op while tracing is disabled
+
+    Args:
+        name: Stage name, e.g. "extraction" or "inference"
+        **args: Extra values shown with the span in the trace viewer
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+
+def traced(name: str, func):
+    """Wrap a callable so every call is recorded as a span"""
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ProgressReporter:
+    """Redraw a progress line (chunks, chars/s, ETA) from a LiveETA while synthesis runs"""
+
+    BAR_WIDTH = 20
+    # Interval between redraws on a terminal, and between lines when output is redirected
+    REFRESH_SECONDS = 0.5
+    LOG_SECONDS = 30.0
+
+    def __init__(self, live, message: str = "Generating audio"):
+        """
+        Args:
+            live: LiveETA fed by the synthesizer's on_chunk callback
+            message: Label shown in front of the progress
+        """
+        self.live = live
+        self.message = message
+        self.interactive = sys.stdout.isatty()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._width = 0
+
+    def line(self) -> str:
+        live = self.live
+        if not live.chunks_total:
+            elapsed = int(time.time() - live.started)
+            return f"{self.message}... {elapsed // 60:02d}:{elapsed % 60:02d} elapsed"
+        filled = int(self.BAR_WIDTH * live.chunks_done / live.chunks_total)
+        bar = "█" * filled + "░" * (self.BAR_WIDTH - filled)
+        return f"{self.message} {bar} {live.status()}"
+
+    def _run(self):
+        interval = self.REFRESH_SECONDS if self.interactive else self.LOG_SECONDS
+        while not self._stop.wait(interval):
+            self._draw()
+
+    def _draw(self):
+        line = self.line()
+        if self.interactive:
+            sys.stdout.write(f"\r{line:<{self._width}}")
+            self._width = max(self._width, len(line))
+        else:
+            sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        if self.interactive:
+            sys.stdout.write("\r" + " " * self._width + "\r")
+            sys.stdout.flush()
+        return False
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Resumable conversions: journal finished chunks next to the output file
+import hashlib
+import json
+import os
+import shutil
+from typing import Callable, List, Optional
+
+from utils.audio_cache import AudioCache
+from utils.audio_encoder import open_audio_writer, output_format
+from utils.instrumentation import span
+from utils.staged_pipeline import PIPELINE_QUEUE_SIZE, prefetch
+from utils.text_chunking import segment_options, segment_text
+from utils.wav_assembler import AudioPart, assemble_wav
+
+
+class JobJournal:
+    """Record finished chunks of a conversion so a killed job can resume where it stopped"""
+
+    JOB_FILE = "job.json"
+    DONE_FILE = "done.jsonl"
+
+    def __init__(self, output_path: str, job_id: str, sample_rate: int, total_chunks: int):
+        """
+        Open the journal for a job, resetting it if it belongs to a different job
+
+        Args:
+            output_path: Final audio file; the journal lives in "<output_path>.journal"
+            job_id: Hash identifying the text chunks and synthesis settings
+            sample_rate: Sample rate of the journaled PCM
+            total_chunks: Number of chunks in the job
+        """
+        self.output_path = output_path
+        self.journal_dir = f"{output_path}.journal"
+        self.job_id = job_id
+        self.sample_rate = sample_rate
+        self.total_chunks = total_chunks
+        self.done = []  # PCM file names of the finished prefix of chunks
+
+        job = {"job": job_id, "sample_rate": sample_rate, "chunks": total_chunks}
+        if self._read_job() == job:
+            self.done = self._read_done()
+        else:
+            shutil.rmtree(self.journal_dir, ignore_errors=True)
+            os.makedirs(self.journal_dir)
+            self._write_atomic(self.JOB_FILE, json.dumps(job).encode("utf-8"))
+
+    @staticmethod
+    def make_job_id(chunk_keys: List[str]) -> str:
+        """Build a job id from the per-chunk content keys"""
+        return hashlib.sha256("\n".join(chunk_keys).encode("utf-8")).hexdigest()
+
+    def _read_job(self):
+        try:
+            with open(os.path.join(self.journal_dir, self.JOB_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_done(self) -> List[str]:
+        """Return the contiguous prefix of chunks whose PCM made it to disk intact"""
+        done = []
+        try:
+            with open(os.path.join(self.journal_dir, self.DONE_FILE), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn final line from a crash
+                    path = os.path.join(self.journal_dir, entry["file"])
+                    if entry["index"] != len(done) or not os.path.exists(path) \
+                            or os.path.getsize(path) != entry["bytes"]:
+                        break
+                    done.append(entry["file"])
+        except OSError:
+            pass
+        # Rewrite the log so appends continue from the verified prefix
+        lines = "".join(
+            json.dumps({"index": i, "file": name,
+                        "bytes": os.path.getsize(os.path.join(self.journal_dir, name))}) + "\n"
+            for i, name in enumerate(done)
+        )
+        self._write_atomic(self.DONE_FILE, lines.encode("utf-8"))
+        return done
+
+    def _write_atomic(self, name: str, data: bytes):
+        path = os.path.join(self.journal_dir, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @property
+    def next_index(self) -> int:
+        """Index of the first chunk that still needs to be synthesized"""
+        return len(self.done)
+
+    def record(self, pcm: bytes):
+        """Persist the PCM of the next chunk, then mark it finished in the log"""
+        index = len(self.done)
+        name = f"chunk_{index:06d}.pcm"
+        self._write_atomic(name, pcm)
+        with open(os.path.join(self.journal_dir, self.DONE_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"index": index, "file": name, "bytes": len(pcm)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.append(name)
+
+    def done_paths(self) -> List[str]:
+        """Paths of the journaled chunk PCM files in order"""
+        return [os.path.join(self.journal_dir, name) for name in self.done]
+
+    def iter_done_pcm(self):
+        """Yield the PCM of the journaled chunks in order"""
+        for name in self.done:
+            with open(os.path.join(self.journal_dir, name), "rb") as f:
+                yield f.read()
+
+    def finalize(self):
+        """Remove the journal once the output file is complete"""
+        shutil.rmtree(self.journal_dir, ignore_errors=True)
+
+
+class ResumableSynthesizer:
+    """Checkpoint every finished chunk so re-running a killed job only synthesizes the rest"""
+
+    def __init__(self, engine, inner=None, max_chunk_chars: int = 1000, pause_seconds: float = 0.0,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        """
+        Initialize the resumable synthesizer
+
+        Args:
+            engine: Loaded CoquiTTS/KokoroTTS instance (identifies model and sample rate)
+            inner: Optional CachedSynthesizer/ParallelSynthesizer that produces chunk PCM
+            max_chunk_chars: Upper bound on characters per chunk (the engine may prefer shorter ones, see segment_options)
+            pause_seconds: Silence inserted between paragraphs (not between the chunks of one paragraph)
+            queue_size: Chunks produced ahead of journaling and writing (0 = same thread)
+        """
+        self.engine = engine
+        self.inner = inner
+        self.max_chunk_chars = max_chunk_chars
+        self.pause_seconds = pause_seconds
+        self.queue_size = queue_size
+        # (chunks, start of each chunk in sample frames) of the last generated file
+        self.last_layout = None
+
+    def generate_audio(self, text: str, output_path: str, voice: str = "default", speed: float = 1.0,
+                       on_chunk: Optional[Callable] = None):
+        """
+        Generate audio for text, resuming from the journal next to output_path if present
+
+        Args:
+            text: Text to convert to speech
+            output_path: Output audio file; the extension selects WAV, FLAC, OGG or Opus
+            voice: Voice to use
+            speed: Speech speed multiplier
+            on_chunk: Optional callback(chunks_done, chunks_total, characters, seconds) per finished chunk
+        """
+        from models.parallel_tts import iter_pcm
+
+        paragraphs = segment_text(text, self.max_chunk_chars, **segment_options(self.engine))
+        chunks = [chunk for paragraph in paragraphs for chunk in paragraph]
+        # Silence before each chunk but the first: a pause where a paragraph starts, none inside one
+        pauses = [self.pause_seconds if i == 0 else 0.0 for paragraph in paragraphs for i in range(len(paragraph))][1:]
+        keys = [AudioCache.make_key(chunk, self.engine.name, self.engine.model_id, voice, speed, self.engine.sr)
+                for chunk in chunks]
+        # Layers that change the audio (post-processing) must not mix with chunks journaled under other settings
+        settings = getattr(self.inner, "settings_id", None)
+        job_keys = keys + [settings] if settings else keys
+        journal = JobJournal(output_path, JobJournal.make_job_id(job_keys), self.engine.sr, len(chunks))
+        if journal.next_index:
+            print(f"↻ Resuming after chunk {journal.next_index}/{len(chunks)}")
+            if on_chunk is not None:
+                for i in range(journal.next_index):
+                    on_chunk(i + 1, len(chunks), len(chunks[i]), 0.0)
+
+        remaining = chunks[journal.next_index:]
+        if self.inner is not None:
+            produced = self.inner.iter_pcm(remaining, voice, speed)
+        else:
+            produced = iter_pcm(self.engine, remaining, voice, speed)
+        # Journal fsyncs and output writes overlap production of the next chunks
+        produced = prefetch(produced, self.queue_size, name="chunks")
+        if output_format(output_path) == ".wav":
+            # Every chunk is journaled anyway, so the WAV is assembled from the journal files in the kernel
+            for _, pcm, seconds in produced:
+                journal.record(pcm)
+                if on_chunk is not None:
+                    on_chunk(journal.next_index, len(chunks), len(chunks[journal.next_index - 1]), seconds)
+            with span("assembly", chunks=len(chunks)):
+                parts = [AudioPart(path, self.engine.sr) for path in journal.done_paths()]
+                starts = assemble_wav(parts, output_path, self.engine.sr, pauses)
+        else:
+            # Compressed outputs are re-encoded from the journal on resume, so they are encoded as chunks finish
+            starts = []
+            with open_audio_writer(output_path, self.engine.sr) as writer:
+                def write_chunk(pcm: bytes):
+                    if starts and pauses[len(starts) - 1]:
+                        writer.write_pcm(bytes(2 * int(round(pauses[len(starts) - 1] * self.engine.sr))))
+                    starts.append(writer.frames_written)
+                    writer.write_pcm(pcm)
+
+                with span("assembly", chunks=journal.next_index):
+                    for pcm in journal.iter_done_pcm():
+                        write_chunk(pcm)
+                for _, pcm, seconds in produced:
+                    journal.record(pcm)
+                    write_chunk(pcm)
+                    if on_chunk is not None:
+                        on_chunk(journal.next_index, len(chunks), len(chunks[journal.next_index - 1]), seconds)
+        self.last_layout = (chunks, starts)
+
+        journal.finalize()
+        print(f"✓ Audio saved to {output_path}")
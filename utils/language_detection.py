@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Cheap local language detection for routing paragraphs to a TTS engine (English vs German)
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Frequent function words; a paragraph rarely goes a sentence without several of them
+STOPWORDS: Dict[str, set] = {
+    "en": {"the", "and", "of", "to", "in", "is", "that", "for", "it", "with", "as", "was", "on", "are", "be",
+           "this", "by", "we", "from", "or", "an", "which", "have", "has", "not", "but", "they", "their",
+           "were", "can", "these", "been", "also", "such", "than", "its", "our", "more", "other", "between"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "mit", "sich", "auf", "für", "von", "den", "dem",
+           "des", "ein", "eine", "einer", "eines", "zu", "auch", "wird", "werden", "wurde", "sind", "bei",
+           "oder", "aber", "nach", "wie", "aus", "durch", "zwischen", "diese", "dieser", "kann", "sowie", "über"},
+}
+# Letters that only one of the languages uses, each counted like a function word
+LETTERS: Dict[str, str] = {"de": "äöüß"}
+WORD = re.compile(r"[^\W\d_]+")
+# Evidence needed before a paragraph is assigned a language; below it the caller decides
+MIN_SCORE = 2
+
+
+def language_scores(text: str, languages: Iterable[str] = ("en", "de")) -> Dict[str, int]:
+    """Function words and language-specific letters of each language found in text"""
+    words = WORD.findall(text.lower())
+    scores = {}
+    for language in languages:
+        stopwords = STOPWORDS.get(language, set())
+        letters = LETTERS.get(language, "")
+        scores[language] = sum(word in stopwords for word in words) + sum(text.count(c) for c in letters)
+    return scores
+
+
+def detect_language(text: str, languages: Iterable[str] = ("en", "de")) -> Optional[str]:
+    """
+    Return the most likely language of a paragraph, or None if the text is too short to tell
+
+    Args:
+        text: Paragraph to classify
+        languages: Candidate language codes
+    """
+    scores = language_scores(text, languages)
+    best = max(scores, key=scores.get)
+    others = max((score for language, score in scores.items() if language != best), default=0)
+    return best if scores[best] >= MIN_SCORE and scores[best] > others else None
+
+
+def detect_languages(paragraphs: List[str], languages: Iterable[str] = ("en", "de"),
+                     default: str = "en") -> List[str]:
+    """Detect the language of each paragraph; undecided ones (headings, formulas) follow the one before"""
+    detected, previous = [], default
+    for paragraph in paragraphs:
+        previous = detect_language(paragraph, languages) or previous
+        detected.append(previous)
+    return detected
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Parallel, cached PDF text extraction
+import hashlib
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+import fitz
+
+# Bump when the extraction output changes so stale cache entries are ignored
+EXTRACTION_VERSION = 1
+# Below this many pages, process start-up costs more than it saves
+MIN_PAGES_PER_WORKER = 16
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_range(args: Tuple[str, int, int]) -> List[str]:
+    """Extract the text of pages [start, stop) in a worker process"""
+    pdf_path, start, stop = args
+    with fitz.open(pdf_path) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+def _page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split pages into contiguous ranges, a few per worker so slow pages balance out"""
+    parts = min(page_count, workers * 4)
+    bounds = [page_count * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+
+class ExtractionCache:
+    """Extracted page texts stored on disk, keyed by the PDF's content hash"""
+
+    def __init__(self, cache_dir: str = "./temp/extraction_cache"):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def key_for(self, pdf_path: str) -> str:
+        return f"{hash_file(pdf_path)}-v{EXTRACTION_VERSION}"
+
+    def get(self, key: str) -> Optional[List[str]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, pages: List[str]):
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+
+def iter_pdf_pages(pdf_path: str, workers: int = 1, cache: Optional[ExtractionCache] = None,
+                   start_method: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text of each page in order, as soon as it is extracted
+
+    Args:
+        pdf_path: Path of the PDF
+        workers: Processes to extract disjoint page ranges with (1 = in-process)
+        cache: Optional ExtractionCache; a hit skips extraction entirely
+        start_method: Multiprocessing start method for the workers (default: the platform's);
+                      "spawn" or "forkserver" are safe from a thread other than the main one
+    """
+    key = None
+    if cache is not None:
+        key = cache.key_for(pdf_path)
+        pages = cache.get(key)
+        if pages is not None:
+            yield from pages
+            return
+
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+        if workers <= 1 or page_count < MIN_PAGES_PER_WORKER * 2:
+            for page in doc:
+                pages.append(page.get_text())
+                yield pages[-1]
+    if len(pages) < page_count:
+        workers = min(workers, page_count // MIN_PAGES_PER_WORKER)
+        tasks = [(pdf_path, start, stop) for start, stop in _page_ranges(page_count, workers)]
+        context = mp.get_context(start_method) if start_method else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # map() returns ranges in order, so pages stream out in document order
+            for range_pages in executor.map(_extract_range, tasks):
+                for text in range_pages:
+                    pages.append(text)
+                    yield text
+
+    if cache is not None:
+        cache.put(key, pages)
+
+
+def extract_pdf_pages(pdf_path: str, workers: int = 1, cache: Optional[ExtractionCache] = None,
+                      start_method: Optional[str] = None) -> List[str]:
+    """Return the text of every page of a PDF (see iter_pdf_pages)"""
+    return list(iter_pdf_pages(pdf_path, workers=workers, cache=cache, start_method=start_method))
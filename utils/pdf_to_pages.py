@@ -1,4 +1,7 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
 from PyPDF2 import PdfReader, PdfWriter
 
 def split_pdf_to_pages(pdf_path, output_folder):
@@ -20,7 +23,125 @@ def split_pdf_to_pages(pdf_path, output_folder):
             writer.write(output_pdf)
         print(f"Seite {i+1} gespeichert als {output_path}")
 
+
+def parse_page_ranges(spec: Optional[str], page_count: int) -> List[int]:
+    """
+    Turn a page selection such as "1-3,7,10-" into sorted 0-based page indices
+
+    Args:
+        spec: Comma-separated 1-based pages and inclusive ranges ("-5" and "10-" are open); None selects all
+        page_count: Pages in the document
+    """
+    if not spec:
+        return list(range(page_count))
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        first = int(first) if first else 1
+        last = (int(last) if last else page_count) if "-" in part else first
+        if not 1 <= first <= last <= page_count:
+            raise ValueError(f"Page range {part!r} is outside 1-{page_count}")
+        pages.update(range(first - 1, last))
+    return sorted(pages)
+
+
+def _contiguous_runs(pages: List[int]) -> List[List[int]]:
+    """Split sorted page indices into runs of consecutive pages"""
+    runs = []
+    for page in pages:
+        if runs and page == runs[-1][-1] + 1:
+            runs[-1].append(page)
+        else:
+            runs.append([page])
+    return runs
+
+
+def _chunk_name(pages: Sequence[int]) -> str:
+    first, last = pages[0] + 1, pages[-1] + 1
+    return f"page_{first}.pdf" if first == last else f"pages_{first}-{last}.pdf"
+
+
+def _write_chunks(pdf_path: str, chunks: List[List[int]], output_folder: str, subset_fonts: bool) -> int:
+    """Write each chunk of pages to its own file in a worker process; returns bytes written"""
+    import fitz
+
+    written = 0
+    with fitz.open(pdf_path) as doc:
+        for pages in chunks:
+            with fitz.open() as out:
+                # Chunks are consecutive pages, inserted with one call so their shared objects are copied once
+                out.insert_pdf(doc, from_page=pages[0], to_page=pages[-1])
+                if subset_fonts:
+                    # Keep only the glyphs these pages use instead of every embedded font in full
+                    out.subset_fonts()
+                path = os.path.join(output_folder, _chunk_name(pages))
+                # garbage=3 drops unused objects and merges duplicates; deflate compresses the streams
+                out.save(path, garbage=3, deflate=True)
+            written += os.path.getsize(path)
+    return written
+
+
+def split_pdf(pdf_path: str, output_folder: str, pages_per_file: int = 1, page_range: Optional[str] = None,
+              workers: int = 1, subset_fonts: bool = False) -> List[str]:
+    """
+    Split a PDF into files of N pages each with PyMuPDF, in parallel over disjoint page ranges
+
+    Args:
+        pdf_path: PDF to split
+        output_folder: Folder for the output files ("page_<n>.pdf" or "pages_<first>-<last>.pdf")
+        pages_per_file: Pages per output file (fewer where the selection has a gap)
+        page_range: Pages to keep, e.g. "1-3,7,10-" (default: all)
+        workers: Processes, each writing a contiguous share of the output files
+        subset_fonts: Reduce embedded fonts to the glyphs each file uses (slower; most papers embed subsets already)
+
+    Returns:
+        Paths of the written files in page order
+    """
+    import fitz
+
+    if pages_per_file < 1:
+        raise ValueError(f"pages_per_file must be at least 1, got {pages_per_file}")
+    os.makedirs(output_folder, exist_ok=True)
+    with fitz.open(pdf_path) as doc:
+        pages = parse_page_ranges(page_range, doc.page_count)
+    chunks = []
+    for run in _contiguous_runs(pages):
+        # Files never span a gap in the selection, so "pages_<first>-<last>.pdf" holds exactly that range
+        chunks += [run[i:i + pages_per_file] for i in range(0, len(run), pages_per_file)]
+
+    workers = max(1, min(workers, len(chunks)))
+    if workers == 1:
+        written = _write_chunks(pdf_path, chunks, output_folder, subset_fonts)
+    else:
+        # A few contiguous shares per worker, so a share of image-heavy pages does not hold up the rest
+        parts = min(len(chunks), workers * 4)
+        bounds = [len(chunks) * i // parts for i in range(parts + 1)]
+        shares = [chunks[bounds[i]:bounds[i + 1]] for i in range(parts)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = sum(executor.map(_write_chunks, [pdf_path] * parts, shares,
+                                       [output_folder] * parts, [subset_fonts] * parts))
+    print(f"✓ {len(pages)} pages of {os.path.basename(pdf_path)} written to {len(chunks)} files "
+          f"({written / 1024**2:.1f} MB) in {output_folder}")
+    return [os.path.join(output_folder, _chunk_name(chunk)) for chunk in chunks]
+
+
 if __name__ == "__main__":
-    input_pdf = "./pdf/2025_Wang+.pdf" 
-    output_dir = "pdf_pages"       
-    split_pdf_to_pages(input_pdf, output_dir)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Split a PDF into single pages or N-page files")
+    parser.add_argument("input_pdf", nargs="?", default="./pdf/2025_Wang+.pdf")
+    parser.add_argument("output_dir", nargs="?", default="pdf_pages")
+    parser.add_argument("--pages", help="Page selection, e.g. 1-3,7,10-")
+    parser.add_argument("--chunk", type=int, default=1, help="Pages per output file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--subset-fonts", action="store_true", help="Subset embedded fonts per output file")
+    parser.add_argument("--pypdf2", action="store_true", help="Use the original PyPDF2 splitter (single pages only)")
+    args = parser.parse_args()
+    if args.pypdf2:
+        split_pdf_to_pages(args.input_pdf, args.output_dir)
+    else:
+        split_pdf(args.input_pdf, args.output_dir, pages_per_file=args.chunk, page_range=args.pages,
+                  workers=args.workers, subset_fonts=args.subset_fonts)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Persistent grapheme-to-phoneme cache: per-sentence phonemes on disk (SQLite) behind an in-memory LRU
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Tokens are stored as their phonemes, each followed by one of these separators
+_SPACE, _JOIN = "\x1e", "\x1f"
+_TOKEN = re.compile(f"([^{_SPACE}{_JOIN}]*)([{_SPACE}{_JOIN}])")
+
+PhonemeTokens = List[Tuple[str, bool]]  # (phonemes, followed by whitespace) per G2P token
+
+
+def _g2p_version() -> str:
+    """Version of the G2P library, so upgrades never mix old pronunciations in"""
+    try:
+        from importlib.metadata import version
+        return version("misaki")
+    except Exception:
+        return "unknown"
+
+
+class PhonemeCacheStats:
+    """Hit/miss counters of one process"""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.seconds_phonemized = 0.0
+        self.seconds_saved = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def report(self):
+        """Print a short summary of cache effectiveness"""
+        total = self.hits + self.misses
+        if not total:
+            return
+        print("\nPhoneme Cache:")
+        print("-"*40)
+        print(f"{'Sentences':<20} | {total:>12,}")
+        print(f"{'Hits (memory/disk)':<20} | {f'{self.memory_hits:,} / {self.disk_hits:,}':>12}")
+        print(f"{'Hit rate':<20} | {self.hits / total * 100:>11.1f}%")
+        print(f"{'G2P time (s)':<20} | {self.seconds_phonemized:>12.2f}")
+        print(f"{'Time saved (s)':<20} | {self.seconds_saved:>12.2f}")
+
+
+class PhonemeCache:
+    """
+    Phonemes per sentence and language, kept across runs
+
+    Keys are 16-byte hashes of the G2P version, language code and sentence, and
+    values are the token phonemes as one short string, so an entry costs about
+    as much as the phonemes themselves. Misses are written in batches. Forked
+    worker processes reopen the database instead of sharing the connection.
+    """
+
+    def __init__(self, path: str = "./temp/phoneme_cache.sqlite", memory_entries: int = 100_000,
+                 write_batch: int = 256):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            memory_entries: Sentences kept in the in-memory LRU
+            write_batch: New entries buffered before they are written to disk
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.write_batch = write_batch
+        self.g2p_version = _g2p_version()
+        self.stats = PhonemeCacheStats()
+        self._memory = OrderedDict()  # key -> (encoded tokens, G2P seconds)
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            # A connection inherited through fork must not be used
+            self._pending = {}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS phonemes (key BLOB PRIMARY KEY, tokens TEXT NOT NULL, "
+                "seconds REAL NOT NULL) WITHOUT ROWID")
+            self._pid = os.getpid()
+        return self._connection
+
+    def make_key(self, sentence: str, lang_code: str) -> bytes:
+        payload = f"{self.g2p_version}\0{lang_code}\0{' '.join(sentence.split())}"
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+    @staticmethod
+    def encode(tokens: PhonemeTokens) -> str:
+        return "".join(phonemes + (_SPACE if space else _JOIN) for phonemes, space in tokens)
+
+    @staticmethod
+    def decode(encoded: str) -> PhonemeTokens:
+        return [(phonemes, separator == _SPACE) for phonemes, separator in _TOKEN.findall(encoded)]
+
+    def _remember(self, key: bytes, entry: Tuple[str, float]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, sentence: str, lang_code: str) -> Optional[PhonemeTokens]:
+        """Return the cached tokens of a sentence, or None on a miss"""
+        key = self.make_key(sentence, lang_code)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+            else:
+                entry = self._pending.get(key) or self._db().execute(
+                    "SELECT tokens, seconds FROM phonemes WHERE key = ?", (key,)).fetchone()
+                if entry is None:
+                    self.stats.misses += 1
+                    return None
+                self._remember(key, tuple(entry))
+                self.stats.disk_hits += 1
+            self.stats.seconds_saved += entry[1]
+            return self.decode(entry[0])
+
+    def put(self, sentence: str, lang_code: str, tokens: PhonemeTokens, seconds: float = 0.0):
+        """Store the tokens of a sentence along with the time G2P took"""
+        key = self.make_key(sentence, lang_code)
+        entry = (self.encode(tokens), seconds)
+        with self._lock:
+            self.stats.seconds_phonemized += seconds
+            self._remember(key, entry)
+            self._db()
+            self._pending[key] = entry
+            if len(self._pending) >= self.write_batch:
+                self.flush()
+
+    def flush(self):
+        """Write buffered entries to disk"""
+        with self._lock:
+            if not self._pending:
+                return
+            db = self._db()
+            with db:
+                db.executemany("INSERT OR REPLACE INTO phonemes VALUES (?, ?, ?)",
+                               [(key, tokens, seconds) for key, (tokens, seconds) in self._pending.items()])
+            self._pending = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._db().execute("SELECT COUNT(*) FROM phonemes").fetchone()[0]
+
+    def close(self):
+        """Flush and close the database (it is reopened on next use)"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self.flush()
+                self._connection.close()
+            self._connection = None
+
+
+_CACHES: Dict[str, PhonemeCache] = {}
+
+
+def open_phoneme_cache(path: str) -> PhonemeCache:
+    """Return the cache for a database file, shared by every engine in this process"""
+    path = os.path.abspath(path)
+    if path not in _CACHES:
+        _CACHES[path] = PhonemeCache(path)
+        atexit.register(_CACHES[path].close)
+    return _CACHES[path]
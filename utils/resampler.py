@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Streaming polyphase resampling, so audio written block by block has no seams at block boundaries
+from math import gcd
+
+import numpy as np
+
+# Filter half-length in zero crossings of the sinc; longer filters have a steeper cutoff
+ZERO_CROSSINGS = 16
+KAISER_BETA = 8.6
+# Cutoff as a fraction of the lower Nyquist frequency (leaves room for the transition band)
+ROLLOFF = 0.95
+# Output samples computed per vectorized step (bounds the gathered window matrix)
+BLOCK_FRAMES = 16384
+
+
+class StreamingResampler:
+    """Rational-ratio resampler that carries its filter history and phase from one process() call to the next"""
+
+    def __init__(self, source_rate: int, target_rate: int, channels: int = 1):
+        """
+        Design the anti-aliasing filter for source_rate -> target_rate
+
+        Args:
+            source_rate: Sample rate of the input in Hz
+            target_rate: Sample rate of the output in Hz
+            channels: Number of interleaved channels
+        """
+        from scipy.signal import firwin
+
+        divisor = gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.channels = channels
+        half = ZERO_CROSSINGS * max(self.up, self.down)
+        cutoff = ROLLOFF / max(self.up, self.down)
+        taps = firwin(2 * half + 1, cutoff, window=("kaiser", KAISER_BETA)) * self.up
+        # Polyphase bank: phase p uses taps p, p + up, p + 2*up, ...
+        self.width = -(-len(taps) // self.up)
+        padded = np.zeros(self.width * self.up)
+        padded[:len(taps)] = taps
+        self.phases = padded.reshape(self.width, self.up).T.astype(np.float32)
+        self.delay = half  # group delay in upsampled samples, compensated so output is aligned with input
+        # Input history; starts with zeros standing in for the samples before the first one
+        self._buffer = np.zeros((self.width - 1, channels), dtype=np.float32)
+        self._buffer_start = -(self.width - 1)  # input index of _buffer[0]
+        self._received = 0
+        self._emitted = 0
+
+    def _emit_until(self, end: int) -> np.ndarray:
+        """Compute output samples _emitted..end-1 from the buffered input"""
+        blocks = []
+        for start in range(self._emitted, end, BLOCK_FRAMES):
+            n = np.arange(start, min(start + BLOCK_FRAMES, end))
+            position = n * self.down + self.delay
+            newest = position // self.up - self._buffer_start
+            window = self._buffer[newest[:, None] - np.arange(self.width)[None, :]]
+            blocks.append(np.einsum("ok,okc->oc", self.phases[position % self.up], window))
+        self._emitted = max(self._emitted, end)
+        # Drop input no later output sample reaches back to
+        oldest = (self._emitted * self.down + self.delay) // self.up - (self.width - 1)
+        drop = max(0, min(oldest - self._buffer_start, len(self._buffer)))
+        self._buffer = self._buffer[drop:]
+        self._buffer_start += drop
+        if not blocks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(blocks).astype(np.float32)
+
+    def _shape(self, audio: np.ndarray) -> np.ndarray:
+        return audio.reshape(-1, self.channels) if self.channels > 1 else audio[:, 0]
+
+    def process(self, audio) -> np.ndarray:
+        """
+        Resample the next block of a stream; returns every output sample its input already determines
+
+        Args:
+            audio: Float samples, interleaved if there are several channels
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1, self.channels)
+        if self.up == self.down:
+            return self._shape(audio)
+        self._buffer = np.concatenate([self._buffer, audio])
+        self._received += len(audio)
+        # Output n needs input up to (n * down + delay) // up
+        ready = max(self._emitted, -(-(self._received * self.up - self.delay) // self.down))
+        return self._shape(self._emit_until(ready))
+
+    def flush(self) -> np.ndarray:
+        """Return the tail of the stream, as if the input were followed by silence"""
+        if self.up == self.down:
+            return self._shape(np.zeros((0, self.channels), dtype=np.float32))
+        total = -(-self._received * self.up // self.down)
+        self._buffer = np.concatenate([self._buffer, np.zeros((self.width, self.channels), dtype=np.float32)])
+        return self._shape(self._emit_until(total))
+
+
+def resample(audio, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resample a complete mono segment (same filter as StreamingResampler)
+
+    Args:
+        audio: Float samples
+        source_rate: Sample rate of audio in Hz
+        target_rate: Sample rate to convert to in Hz
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if source_rate == target_rate or not len(audio):
+        return audio
+    resampler = StreamingResampler(source_rate, target_rate)
+    return np.concatenate([resampler.process(audio), resampler.flush()])
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Bounded producer/consumer stages: each stage runs on its own thread, connected by bounded queues
+import queue
+import threading
+from typing import Callable, Iterable, Iterator
+
+PIPELINE_QUEUE_SIZE = 2  # Items buffered between two stages; producers block beyond it
+_DONE = object()
+
+
+class _Failure:
+    """An exception raised on a stage thread, re-raised where its items are consumed"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(items: Iterable, maxsize: int = PIPELINE_QUEUE_SIZE, name: str = "stage") -> Iterator:
+    """
+    Produce items on a background thread and yield them in order
+
+    The producer runs at most maxsize items ahead of the consumer, so memory stays
+    flat however long the input is. Exceptions (including SystemExit from an engine)
+    are re-raised in the consumer. A consumer that stops early stops the producer
+    after its current item.
+
+    Args:
+        items: Iterable that is iterated on the stage thread
+        maxsize: Items buffered ahead of the consumer (0 iterates in the caller's thread)
+        name: Thread name (shown in traces)
+    """
+    if maxsize <= 0:
+        yield from items
+        return
+
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+        if hasattr(items, "close"):
+            items.close()
+
+
+def stage(func: Callable, items: Iterable, maxsize: int = PIPELINE_QUEUE_SIZE, name: str = "stage") -> Iterator:
+    """Apply func to every item on a background thread, yielding results in order (see prefetch)"""
+    return prefetch((func(item) for item in items), maxsize, name)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Split cleaned text into synthesis-sized chunks: sentences packed to a per-engine target length
+import bisect
+import itertools
+import re
+from typing import Callable, Dict, List, Optional
+
+# A candidate sentence end: terminal punctuation (plus closing quotes/brackets), whitespace, then a capital,
+# digit or opening quote/bracket. Candidates after abbreviations, initials and ordinals are skipped.
+SENTENCE_END = re.compile(r"(?<=[.!?…])([\"')\]”’»]*)\s+(?=[A-ZÄÖÜ0-9\"'(\[“‘„«])")
+CLAUSE_END = re.compile(r"(?<=[,;:—–])\s+")
+INNER_PERIODS = re.compile(r"^[a-zäöü](?:\.[a-zäöü])+$")  # e.g, i.e, u.s, z.b, d.h
+
+# Words that are followed by a period but never end a sentence
+ABBREVIATIONS = {
+    "en": {"mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "etc", "al", "cf", "ca", "approx", "resp",
+           "dept", "univ", "inc", "ltd", "co", "corp", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+           "sept", "oct", "nov", "dec", "ph.d"},
+    "de": {"dr", "prof", "hr", "fr", "bzw", "usw", "vgl", "ggf", "evtl", "ca", "inkl", "exkl", "zzgl", "bspw",
+           "sog", "dt", "engl", "jh", "jhd", "mio", "mrd", "etc", "al", "abs", "str", "geb", "gest"},
+}
+# Words that are abbreviations only when a number follows ("Fig. 3", "No. 5", "S. 12", "Abb. 2")
+NUMBER_ABBREVIATIONS = {
+    "en": {"fig", "figs", "eq", "eqs", "no", "nos", "p", "pp", "vol", "ch", "sec", "tab", "ref", "refs", "art"},
+    "de": {"abb", "tab", "nr", "s", "bd", "kap", "gl", "art", "abs"},
+}
+
+
+def estimate_phonemes(text: str) -> int:
+    """Rough phoneme count without running G2P (a digit is read as about three phonemes)"""
+    return len(text) + 2 * sum(c.isdigit() for c in text)
+
+
+# Length measures a chunk target can be given in
+UNITS: Dict[str, Callable[[str], int]] = {
+    "characters": len,
+    "words": lambda text: len(text.split()),
+    "phonemes": estimate_phonemes,
+}
+
+
+def _ends_sentence(before: str, after: str, language: str) -> bool:
+    """Whether the period-terminated text before a candidate boundary really ends a sentence"""
+    words = before.split()
+    if not words or not words[-1].endswith("."):
+        return True
+    word = words[-1].lstrip("([\"'“„").rstrip(".").lower()
+    if len(word) == 1 and word.isalpha():
+        return False  # initials ("J. Smith") and spaced abbreviations ("z. B.")
+    if INNER_PERIODS.match(word):
+        return False
+    if word in ABBREVIATIONS.get(language, set()) | ABBREVIATIONS["en"]:
+        return False
+    number_abbreviations = NUMBER_ABBREVIATIONS.get(language, set()) | NUMBER_ABBREVIATIONS["en"]
+    if after[:1].isdigit() and word in number_abbreviations:
+        return False
+    # German ordinals ("am 3. Oktober", "im 19. Jahrhundert"); years ("2020.") and references ("Abb. 2.") end sentences
+    if language == "de" and word.isdigit() and len(word) <= 3:
+        previous = words[-2].rstrip(".").lower() if len(words) > 1 else ""
+        return previous in number_abbreviations
+    return True
+
+
+def split_into_sentences(text: str, language: str = "en") -> List[str]:
+    """
+    Split text into sentences, never joining across paragraph boundaries
+
+    Args:
+        text: Text with paragraphs separated by blank lines
+        language: "en" or "de"; selects the abbreviations that do not end a sentence
+    """
+    sentences = []
+    for paragraph in text.split("\n\n"):
+        paragraph = " ".join(paragraph.split())
+        start = 0
+        for match in SENTENCE_END.finditer(paragraph):
+            end = match.start() + len(match.group(1))
+            if _ends_sentence(paragraph[start:end], paragraph[match.end():], language):
+                sentences.append(paragraph[start:end])
+                start = match.end()
+        sentences.append(paragraph[start:])
+    return [sentence for sentence in sentences if sentence]
+
+
+def _fill(pieces: List[str], fits: Callable[[str], bool]) -> List[str]:
+    """Greedily join pieces into chunks that fit"""
+    chunks, current = [], ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if current and not fits(candidate):
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long(sentence: str, fits: Callable[[str], bool]) -> List[str]:
+    """Break a sentence that alone exceeds the limit at clause punctuation, then between words"""
+    if fits(sentence):
+        return [sentence]
+    clauses = CLAUSE_END.split(sentence)
+    if len(clauses) > 1:
+        return _fill([part for clause in clauses for part in _split_long(clause, fits)], fits)
+    return _fill(sentence.split(), fits)
+
+
+def _balance(sentences: List[str], sizes: List[int], target: int, fits: Callable[[str], bool]) -> List[str]:
+    """Cut a paragraph at the sentence ends closest to equal shares of about target each"""
+    prefix = list(itertools.accumulate(sizes, initial=0))
+    count = min(max(1, round(prefix[-1] / target)), len(sentences))
+    while count <= len(sentences):
+        bounds = [0]
+        for k in range(1, count):
+            ideal = prefix[-1] * k / count
+            j = bisect.bisect_left(prefix, ideal)
+            if ideal - prefix[j - 1] < prefix[j] - ideal:
+                j -= 1
+            j = max(j, bounds[-1] + 1)
+            if j < len(sentences):
+                bounds.append(j)
+        bounds.append(len(sentences))
+        chunks = [" ".join(sentences[a:b]) for a, b in zip(bounds, bounds[1:])]
+        # A share over the limit means one more, smaller share each
+        if all(fits(chunk) for chunk in chunks):
+            return chunks
+        count += 1
+    # Uneven sentence lengths can defeat every equal split; greedy packing always fits (single sentences do)
+    return _fill(sentences, fits)
+
+
+def _segment_paragraph(paragraph: str, max_chars: int, target: Optional[int], unit: str,
+                       limit: Optional[int], language: str) -> List[str]:
+    """Chunks of one paragraph (see segment_text)"""
+    measure = UNITS[unit]
+    if target is None:
+        target, measure = max_chars, len
+
+    def fits(chunk: str) -> bool:
+        return len(chunk) <= max_chars and (limit is None or measure(chunk) <= limit)
+
+    sentences = [piece for sentence in split_into_sentences(paragraph, language)
+                 for piece in _split_long(sentence, fits)]
+    if not sentences:
+        return []
+    # Sentences are joined by one space, which counts towards the length
+    sizes = [measure(sentence) + 1 for sentence in sentences]
+    return _balance(sentences, sizes, target, fits)
+
+
+def segment_text(text: str, max_chars: int = 1000, target: Optional[int] = None, unit: str = "characters",
+                 limit: Optional[int] = None, language: str = "en",
+                 per_paragraph: Optional[Callable[[List[str]], List[dict]]] = None) -> List[List[str]]:
+    """
+    Split text into paragraphs, and each paragraph into chunks of whole sentences of about equal length
+
+    A paragraph is cut into round(length / target) chunks at the sentence ends nearest
+    to equal shares, so chunks stay close to the target instead of a full chunk
+    followed by a short remainder. Sentences longer than the limit are broken at
+    clause punctuation, then between words.
+
+    Args:
+        text: Cleaned text with paragraphs separated by blank lines
+        max_chars: Upper bound on the characters of a chunk (also the target if none is given)
+        target: Preferred chunk length in unit
+        unit: "characters", "words" or "phonemes" (estimated)
+        limit: Upper bound on a chunk's length in unit, e.g. the model's input limit
+        language: "en" or "de" (sentence boundaries)
+        per_paragraph: Optional callable that returns target/unit/limit/language overrides for each paragraph
+                       (used by engines that route paragraphs to different models)
+
+    Returns:
+        The chunks of each non-empty paragraph, in order
+    """
+    options = {"target": target, "unit": unit, "limit": limit, "language": language}
+    paragraphs = text.split("\n\n")
+    overrides = per_paragraph(paragraphs) if per_paragraph else [{}] * len(paragraphs)
+    segmented = []
+    for paragraph, override in zip(paragraphs, overrides):
+        chunks = _segment_paragraph(paragraph, max_chars, **{**options, **override})
+        if chunks:
+            segmented.append(chunks)
+    return segmented
+
+
+def split_into_chunks(text: str, max_chars: int = 1000, **options) -> List[str]:
+    """
+    Split text into chunks that never span a paragraph boundary (options: see segment_text)
+
+    Args:
+        text: Cleaned text with paragraphs separated by blank lines
+        max_chars: Upper bound on the length of a single chunk
+    """
+    return [chunk for paragraph in segment_text(text, max_chars, **options) for chunk in paragraph]
+
+
+def segment_options(engine) -> dict:
+    """Chunk target, unit and limit an engine declares (segment_target/_unit/_limit), plus its language
+
+    Engines with a segment_paragraphs(paragraphs) method choose these per paragraph instead.
+    """
+    options = {"language": getattr(engine, "language", "en")}
+    if getattr(engine, "segment_target", None):
+        options.update(target=engine.segment_target, unit=getattr(engine, "segment_unit", "characters"),
+                       limit=getattr(engine, "segment_limit", None))
+    if hasattr(engine, "segment_paragraphs"):
+        options["per_paragraph"] = engine.segment_paragraphs
+    return options
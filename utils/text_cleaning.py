@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Boilerplate stripping for extracted PDF pages
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Lines this close to the top/bottom of a page are header/footer candidates
+EDGE_LINES = 3
+# A header/footer line must repeat on at least this share of pages (and at least MIN_REPEATS)
+REPEAT_RATIO = 0.4
+MIN_REPEATS = 3
+
+DIGITS = re.compile(r"\d+")
+WHITESPACE = re.compile(r"\s+")
+PAGE_NUMBER = re.compile(
+    r"^\s*(?:(?:page|seite|p\.|s\.)\s*)?[-–]?\s*\d{1,4}\s*[-–]?\s*(?:(?:of|von|/)\s*\d{1,4})?\s*$",
+    re.IGNORECASE,
+)
+# A hyphen (or soft hyphen) at a line end followed by a lowercase word on the next line (never across a blank line)
+HYPHENATED_BREAK = re.compile(r"(\w+)([-\u00ad])\n[ \t]*([a-zäöüß]\w*)")
+WORD = re.compile(r"\w+")
+COMPOUND = re.compile(r"\w+(?:-\w+)+")
+# First parts that form hyphenated compounds but are rarely the start of a broken word
+COMPOUND_PREFIXES = {"well", "self", "cross", "half"}
+MIN_COMPOUND_PART = 3
+REFERENCES_HEADING = re.compile(
+    r"^\s*(?:\d+\.?\s*)?(?:references|bibliography|works cited|literatur(?:verzeichnis)?|quellen(?:verzeichnis)?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+APPENDIX_HEADING = re.compile(
+    r"^\s*(?:appendix|anhang|supplementary material)\b.{0,80}$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def _line_signature(line: str) -> str:
+    """Normalize a line so running headers match across pages (page numbers differ)"""
+    return WHITESPACE.sub(" ", DIGITS.sub("#", line.strip().lower()))
+
+
+def _is_edge(index: int, line_count: int) -> bool:
+    """Whether a line is near enough to the top or bottom of its page to be a header/footer"""
+    return index < EDGE_LINES or index >= line_count - EDGE_LINES
+
+
+def find_repeated_lines(pages: List[List[str]]) -> set:
+    """Index header/footer candidate lines across pages and return the signatures that repeat"""
+    counts = Counter()
+    for lines in pages:
+        # A set per page so a line repeated within one page counts once
+        counts.update({
+            _line_signature(line)
+            for i, line in enumerate(lines)
+            if line.strip() and _is_edge(i, len(lines))
+        })
+    threshold = max(MIN_REPEATS, int(len(pages) * REPEAT_RATIO))
+    return {signature for signature, count in counts.items() if count >= threshold}
+
+
+def join_hyphenated_breaks(text: str, lexicon: Optional[Iterable[str]] = None):
+    """
+    Undo hyphenation at line ends, keeping the hyphen of real compounds ("well-known", "state-of-the-art")
+
+    A break is joined unless it looks like a compound: the hyphenated form occurs
+    elsewhere in the text (or in lexicon), the first part continues a hyphenated
+    chain, starts with a compound prefix, or both parts are words of at least
+    MIN_COMPOUND_PART letters found on their own elsewhere. A joined word that
+    occurs unbroken elsewhere always wins. Soft hyphens are always dropped.
+
+    Args:
+        text: Text with line breaks
+        lexicon: Optional known words and hyphenated compounds (lowercase)
+
+    Returns:
+        The text and the number of words joined
+    """
+    lexicon = {entry.lower() for entry in lexicon or ()}
+    # Words standing on their own, not counting the fragments of the breaks themselves
+    words = set(WORD.findall(HYPHENATED_BREAK.sub(" ", text).lower())) | lexicon
+    compounds = {entry for entry in lexicon if "-" in entry}
+    for compound in COMPOUND.findall(text.lower()):
+        parts = compound.split("-")
+        compounds.update(f"{a}-{b}" for a, b in zip(parts, parts[1:]))
+    joined = 0
+
+    def is_compound(match: re.Match) -> bool:
+        first, second = match.group(1).lower(), match.group(3).lower()
+        if first + second in words and f"{first}-{second}" not in compounds:
+            return False
+        return (f"{first}-{second}" in compounds
+                or text[match.start() - 1:match.start()] == "-"
+                or first in COMPOUND_PREFIXES
+                or all(len(part) >= MIN_COMPOUND_PART and part in words for part in (first, second)))
+
+    def join(match: re.Match) -> str:
+        nonlocal joined
+        first, hyphen, second = match.groups()
+        if hyphen == "\u00ad" or not is_compound(match):
+            joined += 1
+            return first + second
+        return f"{first}-{second}"
+
+    return HYPHENATED_BREAK.sub(join, text), joined
+
+
+def strip_references(text: str) -> str:
+    """Drop the last references/bibliography section (up to an appendix, if one follows)"""
+    matches = [m for m in REFERENCES_HEADING.finditer(text) if m.start() > len(text) // 3]
+    if not matches:
+        return text
+    start = matches[-1].start()
+    appendix = APPENDIX_HEADING.search(text, matches[-1].end())
+    return text[:start] + (text[appendix.start():] if appendix else "")
+
+
+def strip_boilerplate(pages: List[str], drop_references: bool = True,
+                      lexicon: Optional[Iterable[str]] = None) -> Dict[str, object]:
+    """
+    Remove running headers/footers, page numbers, hyphenated line breaks and references
+
+    Args:
+        pages: Text of each PDF page, in order
+        drop_references: Also drop the references/bibliography section
+        lexicon: Optional known words for joining hyphenated line breaks (see join_hyphenated_breaks)
+
+    Returns:
+        Dict with the stripped "text", the kept text of each page ("pages") and counts of what was removed
+    """
+    split_pages = [page.split("\n") for page in pages]
+    repeated = find_repeated_lines(split_pages) if len(pages) >= MIN_REPEATS else set()
+
+    kept_pages = []
+    removed_headers = removed_page_numbers = 0
+    for lines in split_pages:
+        kept = []
+        for i, line in enumerate(lines):
+            if _is_edge(i, len(lines)) and line.strip():
+                if PAGE_NUMBER.match(line):
+                    removed_page_numbers += 1
+                    continue
+                if _line_signature(line) in repeated:
+                    removed_headers += 1
+                    continue
+            kept.append(line)
+        kept_pages.append("\n".join(kept))
+
+    text = "\n".join(kept_pages)
+    text, joined_hyphens = join_hyphenated_breaks(text, lexicon)
+    references_chars = 0
+    if drop_references:
+        stripped = strip_references(text)
+        references_chars = len(text) - len(stripped)
+        text = stripped
+
+    return {
+        "text": text,
+        "pages": kept_pages,
+        "headers_footers": removed_headers,
+        "page_numbers": removed_page_numbers,
+        "hyphenations": joined_hyphens,
+        "reference_chars": references_chars,
+    }
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Scripted text fixes that replace the manual edit pauses in batch mode
+import json
+import re
+from typing import Dict, List, Pattern, Tuple
+
+STAGES = ("raw", "cleaned")
+
+
+def load_text_fix_rules(path: str) -> Dict[str, List[Tuple[Pattern, str]]]:
+    """
+    Load regex replacement rules from a JSON file
+
+    The file maps a stage ("raw" before cleaning, "cleaned" after cleaning) to a
+    list of [pattern, replacement] pairs, e.g.
+    {"raw": [["(?m)^Page \\\\d+$", ""]], "cleaned": [["e\\\\.g\\\\.", "for example"]]}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    unknown = set(data) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown text fix stage(s): {', '.join(sorted(unknown))}. Use 'raw' or 'cleaned'")
+    return {
+        stage: [(re.compile(pattern), replacement) for pattern, replacement in data.get(stage, [])]
+        for stage in STAGES
+    }
+
+
+def apply_text_fixes(text: str, rules: List[Tuple[Pattern, str]]) -> str:
+    """Apply compiled (pattern, replacement) rules to text in order"""
+    for pattern, replacement in rules:
+        text = pattern.sub(replacement, text)
+    return text
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# Zero-copy WAV assembly from per-chunk audio files, plus a page cue index
+import bisect
+import errno
+import json
+import os
+import struct
+from typing import List, Optional, Sequence, Tuple, Union
+
+from utils.wav_writer import wav_header
+
+MAX_DATA_SIZE = 0xFFFFFFFF - 36
+# Words that anchor a page in the synthesized text; the first is skipped as it may be a joined hyphenation
+ANCHOR_WORDS = slice(1, 7)
+
+
+class AudioPart:
+    """One piece of the final file: a 16-bit PCM WAV file, or raw PCM (journal and cache entries)"""
+
+    def __init__(self, path: str, sample_rate: Optional[int] = None, label: Optional[str] = None):
+        """
+        Args:
+            path: WAV file, or raw 16-bit little-endian PCM (any other extension)
+            sample_rate: Sample rate of raw PCM (read from the header for WAV files)
+            label: Optional name of the part
+        """
+        self.path = path
+        self.label = label
+        self.sample_rate = sample_rate
+        self.channels = 1
+        self.offset = 0
+        self.size = os.path.getsize(path)
+        if path.lower().endswith(".wav"):
+            self._read_wav_header()
+
+    def _read_wav_header(self):
+        """Locate the fmt and data chunks (not necessarily at byte 44)"""
+        with open(self.path, "rb") as f:
+            riff = f.read(12)
+            if riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                raise ValueError(f"Not a WAV file: {self.path}")
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    raise ValueError(f"No data chunk in {self.path}")
+                chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+                if chunk_id == b"fmt ":
+                    fmt, self.channels, self.sample_rate, _, _, bits = struct.unpack("<HHIIHH", f.read(16))
+                    if fmt != 1 or bits != 16:
+                        raise ValueError(f"Only 16-bit PCM WAV can be assembled: {self.path}")
+                    f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+                elif chunk_id == b"data":
+                    self.offset = f.tell()
+                    # Streamed headers carry a placeholder size
+                    self.size = min(chunk_size, self.size - self.offset)
+                    return
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def _copy_range(src_fd: int, dst_fd: int, src_offset: int, count: int, dst_offset: int) -> str:
+    """
+    Copy bytes between files inside the kernel, falling back as far as pread/pwrite
+
+    Returns:
+        The method that was used
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            while count:
+                copied = os.copy_file_range(src_fd, dst_fd, count, src_offset, dst_offset)
+                if copied == 0:
+                    raise OSError(errno.EIO, "Unexpected end of file")
+                src_offset, dst_offset, count = src_offset + copied, dst_offset + copied, count - copied
+            return "copy_file_range"
+        except OSError as e:
+            # Cross-device copies, old kernels and some file systems don't support it
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            os.lseek(dst_fd, dst_offset, os.SEEK_SET)
+            while count:
+                sent = os.sendfile(dst_fd, src_fd, src_offset, count)
+                if sent == 0:
+                    raise OSError(errno.EIO, "Unexpected end of file")
+                src_offset, dst_offset, count = src_offset + sent, dst_offset + sent, count - sent
+            return "sendfile"
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    while count:
+        block = os.pread(src_fd, min(count, 1024 * 1024), src_offset)
+        if not block:
+            raise OSError(errno.EIO, "Unexpected end of file")
+        os.pwrite(dst_fd, block, dst_offset)
+        src_offset, dst_offset, count = src_offset + len(block), dst_offset + len(block), count - len(block)
+    return "read/write"
+
+
+def assemble_wav(parts: Sequence[AudioPart], output_path: str, sample_rate: Optional[int] = None,
+                 silence_seconds: Union[float, Sequence[float]] = 0.0) -> List[int]:
+    """
+    Build a WAV file from the PCM payloads of parts without decoding them
+
+    The header is written once with the final sizes, payloads are copied with
+    copy_file_range/sendfile, and silence between parts is left as a file hole,
+    which reads back as zeros without ever being allocated or written.
+
+    Args:
+        parts: Audio pieces in playback order (same sample rate and channel count)
+        output_path: WAV file to create
+        sample_rate: Sample rate of the output (default: that of the first part)
+        silence_seconds: Silence inserted between consecutive parts, or one value per gap
+
+    Returns:
+        Start of each part in sample frames
+    """
+    sample_rate = sample_rate or (parts[0].sample_rate if parts else None)
+    if sample_rate is None:
+        raise ValueError("sample_rate is required for raw PCM parts")
+    channels = parts[0].channels if parts else 1
+    frame_bytes = 2 * channels
+    for part in parts:
+        if (part.sample_rate or sample_rate) != sample_rate or part.channels != channels:
+            raise ValueError(f"{part.path} does not match {sample_rate} Hz, {channels} channel(s)")
+    if isinstance(silence_seconds, (int, float)):
+        silence_seconds = [silence_seconds] * max(len(parts) - 1, 0)
+    gaps = [int(round(seconds * sample_rate)) * frame_bytes for seconds in silence_seconds]
+
+    # Lay out every payload before writing, so the header is final from the start
+    offsets, position = [], 0
+    for i, part in enumerate(parts):
+        if i:
+            position += gaps[i - 1]
+        offsets.append(position)
+        position += part.size - part.size % frame_bytes
+    data_size = position
+    if data_size > MAX_DATA_SIZE:
+        raise ValueError(f"Assembled audio exceeds the 4 GB WAV limit ({data_size:,} bytes)")
+
+    header = wav_header(sample_rate, channels, data_size)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.pwrite(fd, header, 0)
+        for part, offset in zip(parts, offsets):
+            src_fd = os.open(part.path, os.O_RDONLY)
+            try:
+                _copy_range(src_fd, fd, part.offset, part.size - part.size % frame_bytes, len(header) + offset)
+            finally:
+                os.close(src_fd)
+        # Covers any silence that is not followed by a payload
+        os.ftruncate(fd, len(header) + data_size)
+    finally:
+        os.close(fd)
+    return [offset // frame_bytes for offset in offsets]
+
+
+def page_cues(pages: Sequence[str], text: str, chunks: Sequence[str],
+              chunk_starts: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Map PDF pages to the sample offset of the chunk where each page's text begins
+
+    Pages are found by a few of their first words in the synthesized text, so pages
+    whose opening was removed or edited get no cue.
+
+    Args:
+        pages: Text of each PDF page (after boilerplate stripping)
+        text: Text that was synthesized
+        chunks: Chunks the text was synthesized in, in order
+        chunk_starts: Start of each chunk in sample frames
+
+    Returns:
+        (page number starting at 1, sample frame) pairs
+    """
+    normalized = " ".join(text.split())
+    starts, position = [], 0
+    for chunk in chunks:
+        found = normalized.find(" ".join(chunk.split())[:60], position)
+        position = found if found >= 0 else position
+        starts.append(position)
+
+    cues, position = [], 0
+    for number, page in enumerate(pages, start=1):
+        words = page.split()[ANCHOR_WORDS]
+        if len(words) < 4:
+            continue
+        found = normalized.find(" ".join(words), position)
+        if found < 0:
+            continue
+        position = found
+        chunk = max(bisect.bisect_right(starts, found) - 1, 0)
+        cues.append((number, chunk_starts[chunk]))
+    return cues
+
+
+def write_cue_index(wav_path: str, cues: Sequence[Tuple[int, int]], sample_rate: int,
+                    label_format: str = "Page {}") -> str:
+    """
+    Embed cues in a WAV file (cue and LIST/adtl chunks) and write them as "<wav_path>.cues.json"
+
+    Args:
+        wav_path: WAV file whose data chunk is last (as written by WavWriter or assemble_wav)
+        cues: (page number, sample frame) pairs
+        sample_rate: Sample rate of the file
+        label_format: Label of a cue, formatted with its page number
+
+    Returns:
+        Path of the JSON index
+    """
+    entries = [{"label": label_format.format(page), "page": page, "sample": sample,
+                "seconds": round(sample / sample_rate, 3)} for page, sample in cues]
+    cue_chunk = struct.pack("<I", len(entries)) + b"".join(
+        struct.pack("<II4sIII", i + 1, entry["sample"], b"data", 0, 0, entry["sample"])
+        for i, entry in enumerate(entries)
+    )
+    labels = b""
+    for i, entry in enumerate(entries):
+        name = entry["label"].encode("utf-8") + b"\0"
+        labels += struct.pack("<4sII", b"labl", 4 + len(name), i + 1) + name + b"\0" * (len(name) & 1)
+    extra = struct.pack("<4sI", b"cue ", len(cue_chunk)) + cue_chunk
+    extra += struct.pack("<4sI4s", b"LIST", 4 + len(labels), b"adtl") + labels
+
+    with open(wav_path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        if end & 1:
+            f.write(b"\0")
+            end += 1
+        f.write(extra)
+        f.seek(4)
+        f.write(struct.pack("<I", end + len(extra) - 8))
+
+    index_path = f"{wav_path}.cues.json"
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"sample_rate": sample_rate, "cues": entries}, f, indent=2, ensure_ascii=False)
+    return index_path
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Incremental WAV writer
+import os
+import struct
+import wave
+import numpy as np
+
+from utils.instrumentation import span
+
+# Data size used in streamed WAV headers whose final length is not known yet
+STREAMING_DATA_SIZE = 0xFFFFFFFF - 36
+
+
+def float_to_int16(audio) -> np.ndarray:
+    """Convert float audio samples in [-1, 1] to 16-bit PCM, clipping (not wrapping) anything outside"""
+    return np.clip(np.asarray(audio, dtype=np.float32) * 32767, -32768, 32767).astype(np.int16)
+
+
+def wav_header(sample_rate: int, channels: int = 1, data_size: int = STREAMING_DATA_SIZE) -> bytes:
+    """Build a 44-byte 16-bit PCM WAV header (placeholder sizes by default, for streaming)"""
+    byte_rate = sample_rate * channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, channels * 2, 16,
+        b"data", data_size,
+    )
+
+
+def parse_wav_header(header: bytes):
+    """Return (sample rate, channels) from a 44-byte PCM WAV header"""
+    channels, sample_rate = struct.unpack("<HI", header[22:28])
+    return sample_rate, channels
+
+
+class WavWriter:
+    """16-bit PCM WAV writer that appends chunks and patches the header on close"""
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int = 1):
+        """
+        Open a WAV file for incremental writing
+
+        Args:
+            output_path: Path of the WAV file to create
+            sample_rate: Sample rate of the audio in Hz
+            channels: Number of interleaved channels (default: 1)
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self.output_path = output_path
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames_written = 0
+        self._wav = wave.open(output_path, "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, audio):
+        """Convert a float audio chunk to int16 and append it to the file"""
+        with span("encoding"):
+            pcm = float_to_int16(audio).tobytes()
+        self.write_pcm(pcm)
+
+    def write_pcm(self, pcm: bytes):
+        """Append raw 16-bit little-endian PCM bytes to the file"""
+        # writeframesraw skips the per-call header rewrite; close() patches it once
+        self._wav.writeframesraw(pcm)
+        self.frames_written += len(pcm) // (2 * self.channels)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio written so far in seconds"""
+        return self.frames_written / self.sample_rate
+
+    def close(self):
+        """Patch the RIFF/data sizes in the header and close the file"""
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()